@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS
+from giotto.envs.generic import GenericEnv
+
+
+class ArrayTree:
+    """Structure-of-arrays storage of an AlphaZero search tree.
+
+    Node statistics live in preallocated numpy arrays indexed by node id. The children of a node
+    are stored in a contiguous block [first_child, first_child + n_children), so that PUCT
+    selection is a vectorized argmax over a slice. Arrays grow by doubling when full.
+
+    The two visit dependent terms of PUCT, -avg_value and prob / (n_visits + 1), are kept up to date
+    in `neg_value` and `explore` whenever visits change, so selection only combines two slices.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """Instantiates an empty tree.
+
+        Args:
+            capacity: number of nodes preallocated.
+        """
+        self.capacity = capacity
+        self.size = 0
+        self.n_visits = np.zeros(capacity, dtype=np.int32)
+        self.total_score = np.zeros(capacity, dtype=np.float64)
+        self.prob = np.zeros(capacity, dtype=np.float64)
+        self.parent = np.full(capacity, fill_value=-1, dtype=np.int32)
+        self.action = np.zeros(capacity, dtype=np.int16)
+        self.to_play = np.full(capacity, fill_value=-1, dtype=np.int8)
+        self.first_child = np.full(capacity, fill_value=-1, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.int16)
+        self.neg_value = np.zeros(capacity, dtype=np.float64)
+        self.explore = np.zeros(capacity, dtype=np.float64)
+
+    _FIELDS = (
+        "n_visits",
+        "total_score",
+        "prob",
+        "parent",
+        "action",
+        "to_play",
+        "first_child",
+        "n_children",
+        "neg_value",
+        "explore",
+    )
+    _DEFAULTS = {"parent": -1, "to_play": -1, "first_child": -1}
+
+    def _grow(self, needed: int):
+        """Enlarges the arrays to hold at least `needed` nodes."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for field in self._FIELDS:
+            old = getattr(self, field)
+            new = np.full(capacity, fill_value=self._DEFAULTS.get(field, 0), dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    def clear(self) -> None:
+        """Removes all the nodes."""
+        for field in self._FIELDS:
+            getattr(self, field)[: self.size] = self._DEFAULTS.get(field, 0)
+        self.size = 0
+
+    def add_root(self) -> int:
+        """Adds a parentless node and returns its id."""
+        if self.size + 1 > self.capacity:
+            self._grow(self.size + 1)
+        node = self.size
+        self.size += 1
+        return node
+
+    def is_leaf(self, node: int) -> bool:
+        """Check if the node has not been expanded yet."""
+        return self.first_child[node] < 0
+
+    def children(self, node: int) -> range:
+        """Ids of the children of node."""
+        start = int(self.first_child[node])
+        if start < 0:
+            return range(0)
+        return range(start, start + int(self.n_children[node]))
+
+    def expand(self, node: int, to_play: int, valid_actions: list[int], policy: np.ndarray) -> None:
+        """Create child nodes for all valid actions, with priors renormalized over them.
+
+        Args:
+            node: id of the node to expand.
+            to_play: player to move at this node.
+            valid_actions: valid actions at this node (1-based).
+            policy: network policy over all actions.
+        """
+        self.to_play[node] = to_play
+        actions = np.asarray(valid_actions, dtype=np.int16)
+        priors = np.asarray(policy, dtype=np.float32)[actions - 1]
+        priors /= priors.sum()
+
+        start = int(self.first_child[node])
+        if start >= 0:
+            # already expanded by another leaf of the same batch: only refresh priors
+            self.set_priors(node, priors)
+            return
+
+        start = self.size
+        end = start + len(actions)
+        if end > self.capacity:
+            self._grow(end)
+        self.size = end
+        self.first_child[node] = start
+        self.n_children[node] = len(actions)
+        self.parent[start:end] = node
+        self.action[start:end] = actions
+        self.set_priors(node, priors)
+
+    def set_priors(self, node: int, priors: np.ndarray) -> None:
+        """Overwrites the priors of the children of node."""
+        children = self.children(node)
+        self.prob[children.start : children.stop] = priors
+        self._refresh(np.arange(children.start, children.stop))
+
+    def _refresh(self, nodes: np.ndarray) -> None:
+        """Recomputes the PUCT terms of the given nodes after their visits or priors changed."""
+        visits = self.n_visits[nodes]
+        self.neg_value[nodes] = -self.total_score[nodes] / np.maximum(visits, 1)
+        self.explore[nodes] = self.prob[nodes] / (visits + 1)
+
+    def select_child(self, node: int, cpuct: float) -> int:
+        """Select the child with the highest PUCT score (first one on ties)."""
+        start = int(self.first_child[node])
+        end = start + int(self.n_children[node])
+        cpuct_sqrt = cpuct * math.sqrt(self.n_visits[node] + 1)
+        return start + int((self.neg_value[start:end] + cpuct_sqrt * self.explore[start:end]).argmax())
+
+    def backpropagate(self, path: list[int], value: float) -> None:
+        """Update the nodes of a root to leaf path, value is from the point of view of the leaf."""
+        path = np.asarray(path)
+        # the leaf gets value, its parent -value, and so on up to the root
+        signs = np.full(len(path), fill_value=value)
+        signs[-2::-2] = -value
+        self.total_score[path] += signs
+        self.n_visits[path] += 1
+        self._refresh(path)
+
+    def backpropagate_many(self, paths: list[list[int]], values: list[float]) -> None:
+        """Same as calling backpropagate for each path in order, with a single scatter-add."""
+        nodes = np.concatenate(paths)
+        signs = np.concatenate([np.full(len(path), fill_value=value) for path, value in zip(paths, values)])
+        ends = np.cumsum([len(path) for path in paths])
+        # alternate the signs inside each path, starting from its leaf
+        distance_to_leaf = np.repeat(ends, [len(path) for path in paths]) - 1 - np.arange(len(nodes))
+        signs[distance_to_leaf % 2 == 1] *= -1
+        np.add.at(self.total_score, nodes, signs)
+        np.add.at(self.n_visits, nodes, 1)
+        self._refresh(np.unique(nodes))
+
+    def add_virtual_loss(self, path: list[int], amount: int) -> None:
+        """Increment (or with a negative amount, revert) the visit counts along a path."""
+        path = np.asarray(path)
+        self.n_visits[path] += amount
+        self._refresh(path)
+
+    def revert_virtual_losses(self, paths: list[list[int]]) -> None:
+        """Reverts the virtual loss added to each of the paths."""
+        nodes = np.concatenate(paths)
+        np.subtract.at(self.n_visits, nodes, 1)
+        self._refresh(np.unique(nodes))
+
+    def compact(self, new_root: int) -> None:
+        """Keeps only the subtree of new_root, renumbering it from 0 level by level.
+
+        Children blocks stay contiguous because the children of consecutive expanded nodes of a level
+        are appended one block after the other.
+        """
+        levels = [np.array([new_root], dtype=np.int64)]
+        frontier = levels[0]
+        while True:
+            expanded = frontier[self.first_child[frontier] >= 0]
+            if expanded.size == 0:
+                break
+            counts = self.n_children[expanded].astype(np.int64)
+            starts = self.first_child[expanded].astype(np.int64)
+            offsets = np.cumsum(counts) - counts
+            frontier = np.arange(counts.sum()) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+            levels.append(frontier)
+        order = np.concatenate(levels)
+
+        new_ids = np.full(self.size, fill_value=-1, dtype=np.int32)
+        new_ids[order] = np.arange(len(order), dtype=np.int32)
+
+        size = len(order)
+        for field in self._FIELDS:
+            array = getattr(self, field)
+            array[:size] = array[order]
+            array[size : self.size] = self._DEFAULTS.get(field, 0)
+        # remap links, the new root has no parent
+        self.parent[1:size] = new_ids[self.parent[1:size]]
+        self.parent[0] = -1
+        expanded = self.first_child[:size] >= 0
+        self.first_child[:size][expanded] = new_ids[self.first_child[:size][expanded]]
+        self.size = size
+
+
+class ArrayNodeView:
+    """Read-only node facade over an ArrayTree, with the AZNode attributes used outside the search."""
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: ArrayTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def n_visits(self) -> int:
+        """Visit count of the node."""
+        return int(self.tree.n_visits[self.index])
+
+    @property
+    def total_score(self) -> float:
+        """Sum of the values backpropagated through the node."""
+        return float(self.tree.total_score[self.index])
+
+    @property
+    def prob(self) -> float:
+        """Prior probability of the node."""
+        return float(self.tree.prob[self.index])
+
+    @property
+    def to_play(self) -> int | None:
+        """Player to move at the node, None if not expanded."""
+        to_play = int(self.tree.to_play[self.index])
+        return None if to_play < 0 else to_play
+
+    @property
+    def parent_action(self) -> int | None:
+        """Action leading to the node, None for the root."""
+        return None if self.tree.parent[self.index] < 0 else int(self.tree.action[self.index])
+
+    @property
+    def avg_value(self) -> float:
+        """Average value of the node."""
+        n_visits = self.n_visits
+        return 0.0 if n_visits == 0 else self.total_score / n_visits
+
+    @property
+    def children(self) -> dict[int, ArrayNodeView]:
+        """Children views by action."""
+        tree = self.tree
+        return {int(tree.action[child]): ArrayNodeView(tree, child) for child in tree.children(self.index)}
+
+    def is_leaf(self) -> bool:
+        """Check if the node is a leaf (no children)."""
+        return self.tree.is_leaf(self.index)
+
+
+class ArrayAlphaZeroMCTS(AlphaZeroMCTS):
+    """AlphaZeroMCTS storing the tree in an ArrayTree instead of one AZNode object per node.
+
+    Same search, parameters and results as AlphaZeroMCTS. run() and run_batched() return an
+    ArrayNodeView of the root, whose children map actions to views exposing n_visits.
+    advance_root() compacts the reused subtree to the front of the arrays.
+    """
+
+    def __init__(self, *args, capacity: int = 4096, **kwargs):
+        """Instantiates search, see AlphaZeroMCTS. capacity is the initial number of tree nodes."""
+        super().__init__(*args, **kwargs)
+        self.tree = ArrayTree(capacity)
+        self._root_index: int | None = None
+
+    # ------------------------------------------------------------------
+    # Root helpers
+    # ------------------------------------------------------------------
+
+    def _build_root(self, env: GenericEnv) -> int:
+        """Create root node, expand immediately, and inject Dirichlet noise."""
+        tree = self.tree
+        tree.clear()
+        root = tree.add_root()
+        valid_actions = env.get_valid_actions()
+        policy, _ = self._predict(env)
+        tree.expand(root, env.current_player, valid_actions, policy)
+        if not self.skip_dirichlet:
+            # noise is mixed into the raw policy, before normalization
+            raw = np.asarray(policy, dtype=np.float32)[np.asarray(valid_actions) - 1]
+            noise = np.random.dirichlet([self.dirichlet_alpha] * len(valid_actions))
+            raw = (1.0 - self.dirichlet_eps) * raw + self.dirichlet_eps * noise
+            raw /= raw.sum()
+            tree.set_priors(root, raw)
+        return root
+
+    def _apply_dirichlet(self, root: int) -> None:
+        """Re-apply Dirichlet noise to root's children after tree reuse."""
+        children = self.tree.children(root)
+        if self.skip_dirichlet or len(children) == 0:
+            return
+        noise = np.random.dirichlet([self.dirichlet_alpha] * len(children))
+        priors = self.tree.prob[children.start : children.stop]
+        self.tree.set_priors(root, (1.0 - self.dirichlet_eps) * priors + self.dirichlet_eps * noise)
+
+    # ------------------------------------------------------------------
+    # Tree reuse
+    # ------------------------------------------------------------------
+
+    def advance_root(self, action: int) -> None:
+        """Move the cached root to the subtree for *action* (tree reuse), compacting the tree."""
+        if self._root_index is None:
+            return
+        tree = self.tree
+        children = tree.children(self._root_index)
+        matches = [child for child in children if tree.action[child] == action]
+        if not matches:
+            self._root_index = None
+            return
+        tree.compact(matches[0])
+        self._root_index = 0
+        self._apply_dirichlet(self._root_index)
+
+    def reset(self) -> None:
+        """Discard the cached root. Call between independent games."""
+        self._root_index = None
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _terminal_value(self, env: GenericEnv) -> float:
+        """Value of a finished game for the player to move."""
+        winner = env.info["winner"]
+        if winner == -1:
+            return 0.0
+        return 1.0 if winner == env.current_player else -1.0
+
+    def run(self, env: GenericEnv, temperature: float = 0.0) -> tuple[int, ArrayNodeView]:
+        """Run MCTS simulations and return (chosen_action, root view).
+
+        Args:
+            env: Current game environment (not mutated).
+            temperature: Action selection temperature. 0.0 = greedy.
+        """
+        self.net.eval()
+
+        tree = self.tree
+        sim_env = env.clone()
+        root = self._root_index if self._root_index is not None else self._build_root(sim_env)
+
+        for _ in range(self.n_simulations):
+            node = root
+            path = [root]
+
+            # SELECTION
+            while not sim_env.done and tree.first_child[node] >= 0:
+                node = tree.select_child(node, self.cpuct)
+                sim_env.step(int(tree.action[node]))
+                path.append(node)
+
+            # EXPANSION + EVALUATION
+            if not sim_env.done:
+                policy, value = self._predict(sim_env)
+                tree.expand(node, sim_env.current_player, sim_env.get_valid_actions(), policy)
+                value = float(value)
+            else:
+                value = self._terminal_value(sim_env)
+
+            # BACKPROPAGATION
+            tree.backpropagate(path, value)
+
+            # back to the root position
+            for _ in range(len(path) - 1):
+                sim_env.undo()
+
+        self._root_index = root
+        root_view = ArrayNodeView(tree, root)
+        return self.select_action(root_view, temperature), root_view
+
+    def run_batched(self, env: GenericEnv, temperature: float = 0.0) -> tuple[int, ArrayNodeView]:
+        """Run MCTS simulations with leaf parallelism (batched NN calls), see AlphaZeroMCTS.run_batched.
+
+        Args:
+            env: Current game environment (not mutated).
+            temperature: Action selection temperature. 0.0 = greedy.
+        """
+        self.net.eval()
+
+        tree = self.tree
+        sim_env = env.clone()
+        root = self._root_index if self._root_index is not None else self._build_root(sim_env)
+
+        sims_done = 0
+        while sims_done < self.n_simulations:
+            to_collect = min(self.batch_size, self.n_simulations - sims_done)
+            paths: list[list[int]] = []
+            # per leaf: (to_play, valid_actions, state, cache key) or the terminal value
+            leaf_infos: list = []
+
+            # SELECTION: collect up to batch_size leaves with virtual loss
+            for _ in range(to_collect):
+                node = root
+                path = [root]
+                while not sim_env.done and tree.first_child[node] >= 0:
+                    node = tree.select_child(node, self.cpuct)
+                    sim_env.step(int(tree.action[node]))
+                    path.append(node)
+                tree.add_virtual_loss(path, 1)
+                paths.append(path)
+                if sim_env.done:
+                    leaf_infos.append(self._terminal_value(sim_env))
+                else:
+                    leaf_infos.append(self._leaf_info(sim_env))
+                for _ in range(len(path) - 1):
+                    sim_env.undo()
+
+            # Revert all virtual losses before backpropagation
+            tree.revert_virtual_losses(paths)
+
+            # EXPANSION + EVALUATION
+            terminal_paths = [path for path, info in zip(paths, leaf_infos) if isinstance(info, float)]
+            backup_paths = terminal_paths
+            backup_values = [info for info in leaf_infos if isinstance(info, float)]
+            pending = [(path, info) for path, info in zip(paths, leaf_infos) if not isinstance(info, float)]
+
+            if pending:
+                predictions = self._predict_leaves([info for _, info in pending])
+                for (path, (to_play, valid_actions, _, _)), (policy, value) in zip(pending, predictions):
+                    tree.expand(path[-1], to_play, valid_actions, policy)
+                    backup_paths.append(path)
+                    backup_values.append(float(value))
+
+            # BACKPROPAGATION of the whole batch at once, terminal leaves first like AlphaZeroMCTS
+            tree.backpropagate_many(backup_paths, backup_values)
+
+            sims_done += len(paths)
+
+        self._root_index = root
+        root_view = ArrayNodeView(tree, root)
+        return self.select_action(root_view, temperature), root_view
+
+    def select_action(self, root: ArrayNodeView, temperature: float = 0.0) -> int:
+        """Select an action from the root based on visit counts and temperature.
+
+        Args:
+            root: Root view after simulations.
+            temperature: 0.0 = greedy (max visits), inf = uniform random.
+        """
+        children = root.tree.children(root.index)
+        actions = root.tree.action[children.start : children.stop].astype(int).tolist()
+        counts = root.tree.n_visits[children.start : children.stop].astype(np.float32)
+        if temperature is None or temperature == 0.0:
+            return actions[int(np.argmax(counts))]
+        elif temperature == np.inf:
+            return np.random.choice(actions)
+        else:
+            counts = counts ** (1.0 / temperature)
+            counts /= counts.sum()
+            return np.random.choice(actions, p=counts)
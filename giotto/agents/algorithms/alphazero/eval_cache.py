@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import numpy as np
+
+from giotto.envs.generic import GenericEnv
+from giotto.utils.simmetries import EquivalentBoards
+
+
+def policy_permutations(simmetries: EquivalentBoards | None, rows: int, cols: int, n_actions: int) -> np.ndarray:
+    """Action-index permutation of each symmetry transform, identity first, see EquivalentBoards.
+
+    Args:
+        simmetries: symmetries of the game. If None only the identity is used.
+        rows: number of rows of the board.
+        cols: number of columns of the board.
+        n_actions: size of the policy.
+
+    Returns:
+        array of shape (n_transforms, n_actions).
+    """
+    if simmetries is None:
+        return np.arange(n_actions)[None]
+    return simmetries.policy_permutations(rows, cols, n_actions)
+
+
+class EvaluationCache:
+    """Bounded LRU cache of network evaluations (policy, value), keyed by position.
+
+    Positions are looked up by their canonical (symmetry invariant) Zobrist key, so symmetric positions
+    share one entry. Policies are stored in the canonical frame and mapped back to the frame of the
+    queried position. The network weights must not change while the cache is in use.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        """Instantiates cache.
+
+        Args:
+            max_size: maximum number of positions kept, least recently used are dropped first.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[np.ndarray, float]] = OrderedDict()
+        # (simmetries, rows, cols) of the game, the policy permutations are derived on the first put
+        self._board = None
+        self._perms = None
+        self._inverse_perms = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, env: GenericEnv) -> tuple[int, int]:
+        """Returns the lookup key of env: (canonical position key, transform to the canonical frame)."""
+        if self._board is None:
+            self._board = (getattr(env, "simmetries", None), env.rows, env.cols)
+        return env.canonical_hash_key, env.canonical_transform
+
+    def get(self, key: tuple[int, int]) -> tuple[np.ndarray, float] | None:
+        """Returns the cached (policy, value) of a position, or None.
+
+        Args:
+            key: key of the position as returned by key().
+        """
+        position_key, transform = key
+        entry = self._entries.get(position_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(position_key)
+        canonical_policy, value = entry
+        return canonical_policy[self._inverse_perms[transform]], value
+
+    def put(self, key: tuple[int, int], policy: np.ndarray, value: float) -> None:
+        """Stores the evaluation of a position.
+
+        Args:
+            key: key of the position as returned by key().
+            policy: network policy of the position, in its own frame.
+            value: network value of the position.
+        """
+        position_key, transform = key
+        if self._perms is None:
+            self._perms = policy_permutations(*self._board, len(policy))
+            self._inverse_perms = np.argsort(self._perms, axis=1)
+        self._entries[position_key] = (np.asarray(policy)[self._perms[transform]], value)
+        self._entries.move_to_end(position_key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all entries, e.g. after the network weights changed. Counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns hits, misses, hit rate and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,310 @@
+"""Batched network inference shared by the self-play worker processes.
+
+Workers do not hold a network: an InferenceClient writes the encoded leaf states of its search into a
+shared-memory slot and puts a small (client id, n states, timestamp) request on a queue. The server
+process coalesces the requests of all workers into one forward pass, waiting at most max_wait_ms for
+more requests after the first one arrives, writes policies and values back into the slots and wakes
+the workers up. Only metadata goes through the queues, states and results stay in shared memory.
+"""
+
+from __future__ import annotations
+
+import queue
+import time
+import traceback
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn.functional as F
+
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+
+
+class InferenceClient:
+    """Network stand-in for AlphaZeroMCTS in a worker process, backed by an InferenceServer.
+
+    Exposes predict, batch_predict, eval and policy_output_size like AlphaZeroNet.
+    """
+
+    def __init__(
+        self,
+        client_id: int,
+        inputs: torch.Tensor,
+        policies: torch.Tensor,
+        values: torch.Tensor,
+        *,
+        requests: mp.Queue,
+        response: mp.SimpleQueue,
+    ):
+        """Instantiates client, see InferenceServer.client()."""
+        self.client_id = client_id
+        self.inputs = inputs
+        self.policies = policies
+        self.values = values
+        self.requests = requests
+        self.response = response
+        self.slot_size = inputs.shape[0]
+        self.policy_output_size = policies.shape[-1]
+        # numpy views of the shared slot, created in the process using them
+        self._views = None
+
+    def eval(self):
+        """No-op, the server network is always in eval mode."""
+        return self
+
+    def predict(self, state: list[np.ndarray, int]):
+        """Predict (policy_probs, value) as numpy."""
+        policies, values = self.batch_predict([state])
+        return policies[0], values[0]
+
+    def batch_predict(self, states: list[list[np.ndarray, int]]) -> tuple[np.ndarray, np.ndarray]:
+        """Predict (policy_probs, values) for a batch of states as numpy arrays, through the server.
+
+        Args:
+            states: List of [board, player_id] states.
+
+        Returns:
+            Tuple of (policies, values) with shapes (B, A) and (B,).
+        """
+        if self._views is None:
+            self._views = (self.inputs.numpy(), self.policies.numpy(), self.values.numpy())
+        inputs, policies, values = self._views
+
+        all_policies = []
+        all_values = []
+        for start in range(0, len(states), self.slot_size):
+            chunk = states[start : start + self.slot_size]
+            for i, (board, player_id) in enumerate(chunk):
+                inputs[i, 0] = board == player_id
+                inputs[i, 1] = board == (1 - player_id)
+            self.requests.put((self.client_id, len(chunk), time.monotonic()))
+            reply = self.response.get()
+            if reply is not True:
+                raise RuntimeError(f"Inference server failed:\n{reply}")
+            all_policies.append(policies[: len(chunk)].copy())
+            all_values.append(values[: len(chunk)].copy())
+        return np.concatenate(all_policies), np.concatenate(all_values)
+
+
+class InferenceServer:
+    """Process evaluating the network for many InferenceClients with coalesced batches."""
+
+    def __init__(
+        self,
+        network_config: dict,
+        net_state_dict: dict,
+        n_clients: int,
+        *,
+        slot_size: int,
+        max_wait_ms: float = 1.0,
+        max_batch_size: int | None = None,
+        device: str = "cpu",
+    ):
+        """Instantiates server, allocating the shared-memory slots of the clients.
+
+        Args:
+            network_config: network section of the training config.
+            net_state_dict: weights of the network.
+            n_clients: number of clients.
+            slot_size: maximum number of states a client sends in one request (larger batches are split).
+            max_wait_ms: how long to wait for more requests once one arrived, before running the batch.
+            max_batch_size: run the batch as soon as it holds this many states. Defaults to all the slots.
+            device: device of the network.
+        """
+        self.network_config = network_config
+        self.net_state_dict = net_state_dict
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size if max_batch_size is not None else n_clients * slot_size
+        self.device = device
+
+        input_size = tuple(network_config["input_size"])
+        n_actions = network_config["policy_output_size"]
+        self.inputs = torch.zeros((n_clients, slot_size, *input_size), dtype=torch.float32).share_memory_()
+        self.policies = torch.zeros((n_clients, slot_size, n_actions), dtype=torch.float32).share_memory_()
+        self.values = torch.zeros((n_clients, slot_size), dtype=torch.float32).share_memory_()
+        self.requests = mp.Queue()
+        self.responses = [mp.SimpleQueue() for _ in range(n_clients)]
+        self._stats_queue = mp.SimpleQueue()
+        self._process = None
+
+    def client(self, client_id: int) -> InferenceClient:
+        """Returns the client using slot client_id, to be passed to a worker process."""
+        return InferenceClient(
+            client_id,
+            self.inputs[client_id],
+            self.policies[client_id],
+            self.values[client_id],
+            requests=self.requests,
+            response=self.responses[client_id],
+        )
+
+    def start(self) -> None:
+        """Starts the server process."""
+        self._process = mp.Process(
+            target=_serve,
+            kwargs={
+                "network_config": self.network_config,
+                "net_state_dict": self.net_state_dict,
+                "device": self.device,
+                "inputs": self.inputs,
+                "policies": self.policies,
+                "values": self.values,
+                "requests": self.requests,
+                "responses": self.responses,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "stats_queue": self._stats_queue,
+            },
+        )
+        self._process.daemon = True
+        self._process.start()
+
+    def stop(self) -> dict:
+        """Stops the server once the pending requests are served and returns its statistics.
+
+        Returns:
+            dict with number of batches and requests, average batch size (in states) and average time
+            in ms a request waited in the queue before its batch started.
+
+        Raises:
+            RuntimeError: if the server failed, or exited without sending its statistics.
+        """
+        self.requests.put(None)
+        process, self._process = self._process, None
+        while self._stats_queue.empty():
+            if not process.is_alive() and self._stats_queue.empty():
+                raise RuntimeError(f"Inference server exited with code {process.exitcode} without its statistics.")
+            process.join(timeout=0.1)
+        stats = self._stats_queue.get()
+        process.join()
+        if "error" in stats:
+            raise RuntimeError(f"Inference server failed:\n{stats['error']}")
+        return stats
+
+    def terminate(self) -> None:
+        """Kills the server process, e.g. after a worker failed."""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        self._process = None
+
+
+def _serve(
+    *,
+    network_config: dict,
+    net_state_dict: dict,
+    device: str,
+    inputs: torch.Tensor,
+    policies: torch.Tensor,
+    values: torch.Tensor,
+    requests: mp.Queue,
+    responses: list[mp.SimpleQueue],
+    max_batch_size: int,
+    max_wait_ms: float,
+    stats_queue: mp.SimpleQueue,
+) -> None:
+    """Server process, see InferenceServer.
+
+    A failure is sent to every client and to stats_queue, so that no one waits forever for a dead server.
+    """
+    try:
+        stats = _serve_requests(
+            network_config=network_config,
+            net_state_dict=net_state_dict,
+            device=device,
+            inputs=inputs,
+            policies=policies,
+            values=values,
+            requests=requests,
+            responses=responses,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+        )
+    except Exception as e:
+        error = f"{e}\n{traceback.format_exc()}"
+        for response in responses:
+            response.put(error)
+        stats_queue.put({"error": error})
+        return
+    stats_queue.put(stats)
+
+
+def _serve_requests(
+    *,
+    network_config: dict,
+    net_state_dict: dict,
+    device: str,
+    inputs: torch.Tensor,
+    policies: torch.Tensor,
+    values: torch.Tensor,
+    requests: mp.Queue,
+    responses: list[mp.SimpleQueue],
+    max_batch_size: int,
+    max_wait_ms: float,
+) -> dict:
+    """Server loop, serving requests until the None sentinel. Returns the statistics of InferenceServer.stop()."""
+    net = AlphaZeroNet(
+        input_size=network_config["input_size"],
+        value_output_size=network_config["value_output_size"],
+        policy_output_size=network_config["policy_output_size"],
+        channels=network_config["channels"],
+        residual_blocks=network_config["residual_blocks"],
+    )
+    net.load_state_dict(net_state_dict, strict=True)
+    net = net.to(device)
+    net.eval()
+
+    n_batches = 0
+    n_requests = 0
+    n_states = 0
+    total_wait = 0.0
+    stopping = False
+    while not stopping:
+        request = requests.get()
+        if request is None:
+            break
+        pending = [request]
+        batch_size = request[1]
+
+        # coalesce the requests arriving within max_wait_ms
+        deadline = time.monotonic() + max_wait_ms / 1000
+        while batch_size < max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                stopping = True
+                break
+            pending.append(request)
+            batch_size += request[1]
+
+        started = time.monotonic()
+        batch = torch.cat([inputs[client_id, :n] for client_id, n, _ in pending]).to(device)
+        with torch.inference_mode():
+            policy_logits, value_tensor = net(batch)
+            policy_probs = F.softmax(policy_logits, dim=1).cpu()
+            value_tensor = value_tensor.cpu().squeeze(-1)
+
+        offset = 0
+        for client_id, n, sent in pending:
+            policies[client_id, :n] = policy_probs[offset : offset + n]
+            values[client_id, :n] = value_tensor[offset : offset + n]
+            offset += n
+            responses[client_id].put(True)
+            total_wait += started - sent
+
+        n_batches += 1
+        n_requests += len(pending)
+        n_states += batch_size
+
+    return {
+        "batches": n_batches,
+        "requests": n_requests,
+        "avg_batch_size": n_states / n_batches if n_batches else 0.0,
+        "avg_queue_wait_ms": 1000 * total_wait / n_requests if n_requests else 0.0,
+    }
@@ -4,6 +4,7 @@ import math
 
 import numpy as np
 
+from giotto.agents.algorithms.alphazero.eval_cache import EvaluationCache
 from giotto.envs.generic import GenericEnv
 
 # try except block to make it work in browser mode
@@ -18,16 +19,13 @@ except ImportError:
 class AZNode:
     """Node in AlphaZero MCTS tree.
 
-    Environments are materialized lazily: child nodes only clone the parent env
-    when first accessed, reducing redundant clones for unexplored branches.
+    Nodes only hold search statistics: the search walks a single env down the tree with
+    step() and back up with undo(), so no environment is stored or cloned per node.
     """
 
     __slots__ = (
         "parent",
         "parent_action",
-        "_env",
-        "_source_env",
-        "_source_action",
         "to_play",
         "prob",
         "children",
@@ -37,36 +35,17 @@ class AZNode:
 
     def __init__(
         self,
-        env: GenericEnv | None = None,
         parent: AZNode | None = None,
         parent_action: int | None = None,
-        *,
-        _source_env: GenericEnv | None = None,
-        _source_action: int | None = None,
     ):
         self.parent = parent
         self.parent_action = parent_action
-        self._env = env
-        self._source_env = _source_env
-        self._source_action = _source_action
-        self.to_play = env.current_player if env is not None else None
+        self.to_play = None
         self.prob = 0.0
         self.children: dict[int, AZNode] = {}
         self.n_visits = 0
         self.total_score = 0.0
 
-    @property
-    def env(self) -> GenericEnv:
-        """Return the environment, cloning from the parent lazily on first access."""
-        if self._env is None:
-            env = self._source_env.clone()
-            env.step(self._source_action)
-            self._env = env
-            self.to_play = env.current_player
-            self._source_env = None
-            self._source_action = None
-        return self._env
-
     @property
     def avg_value(self) -> float:
         """Average value of the node."""
@@ -81,21 +60,26 @@ class AZNode:
             return 0.0
         return 1.0 if winner == player else -1.0
 
-    def expand(self) -> None:
-        """Create lazy child stubs for all valid actions (no env cloning yet).
+    def expand(self, to_play: int, valid_actions: list[int], policy: np.ndarray) -> None:
+        """Create child nodes for all valid actions, with priors renormalized over them.
 
-        Children are stored as unevaluated stubs that materialize their env only
-        when selected during tree traversal.
+        Args:
+            to_play: player to move at this node.
+            valid_actions: valid actions at this node (1-based).
+            policy: network policy over all actions.
         """
-        if self.children or self.env.done:
+        self.to_play = to_play
+        raw = np.array([policy[a - 1] for a in valid_actions], dtype=np.float32)
+        raw /= raw.sum()
+        if self.children:
+            # already expanded by another leaf of the same batch: only refresh priors
+            for action, prob in zip(valid_actions, raw):
+                self.children[action].prob = float(prob)
             return
-        for action in self.env.get_valid_actions():
-            self.children[action] = AZNode(
-                parent=self,
-                parent_action=action,
-                _source_env=self._env,
-                _source_action=action,
-            )
+        for action, prob in zip(valid_actions, raw):
+            child = AZNode(parent=self, parent_action=action)
+            child.prob = float(prob)
+            self.children[action] = child
 
     def select_child(self, cpuct: float) -> AZNode:
         """Select the child node with the highest PUCT score."""
@@ -133,10 +117,6 @@ class AZNode:
         """Check if the node is a leaf (no children)."""
         return len(self.children) == 0
 
-    def is_terminal(self) -> bool:
-        """Check if the node represents a terminal state."""
-        return self.env.done
-
     def __str__(self) -> str:
         return (
             f"Prob: {self.prob}\nTo play: {self.to_play}"
@@ -149,11 +129,13 @@ class AlphaZeroMCTS:
     """AlphaZero MCTS with lazy expansion and tree reuse between moves.
 
     Key optimizations vs a naive implementation:
-    - Lazy env cloning: child environments are cloned only when first visited,
-      reducing O(branching_factor x n_sims) clones to O(n_sims).
+    - Make/unmake search: one env clone per search, walked down the tree with step()
+      and restored with undo() after each simulation instead of cloning envs per node.
     - Tree reuse: call advance_root(action) after each move so subsequent
       searches start from a warm subtree rather than a fresh root.
     - Vectorized PUCT: child scores computed with numpy instead of a Python loop.
+    - Evaluation cache: with an EvaluationCache, network outputs of positions already
+      evaluated (or symmetric to one) are reused instead of recomputed.
     """
 
     def __init__(
@@ -164,6 +146,8 @@ class AlphaZeroMCTS:
         dirichlet_alpha: float = 1.0,
         dirichlet_eps: float | None = None,
         batch_size: int = 1,
+        *,
+        cache: EvaluationCache | None = None,
     ):
         self.net = net
         self.n_simulations = n_simulations
@@ -172,25 +156,61 @@ class AlphaZeroMCTS:
         self.dirichlet_alpha = dirichlet_alpha
         self.dirichlet_eps = dirichlet_eps
         self.batch_size = batch_size
+        self.cache = cache
         self._root: AZNode | None = None
 
+    # ------------------------------------------------------------------
+    # Network evaluation
+    # ------------------------------------------------------------------
+
+    def _predict(self, env: GenericEnv) -> tuple[np.ndarray, float]:
+        """Network (policy, value) of env, through the cache if any."""
+        if self.cache is None:
+            return self.net.predict(env.get_state())
+        key = self.cache.key(env)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        policy, value = self.net.predict(env.get_state())
+        self.cache.put(key, policy, value)
+        return policy, value
+
+    def _leaf_info(self, env: GenericEnv) -> tuple:
+        """What is needed to evaluate and expand a non terminal leaf later: (to_play, valid_actions, state, key)."""
+        key = self.cache.key(env) if self.cache is not None else None
+        return env.current_player, env.get_valid_actions(), env.get_state(), key
+
+    def _predict_leaves(self, leaf_infos: list[tuple]) -> list[tuple[np.ndarray, float]]:
+        """Network (policy, value) of each leaf built by _leaf_info, with one batched call for the cache misses."""
+        results = [None] * len(leaf_infos)
+        if self.cache is not None:
+            results = [self.cache.get(info[3]) for info in leaf_infos]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            policies, values = self.net.batch_predict([leaf_infos[i][2] for i in missing])
+            for i, policy, value in zip(missing, policies, values):
+                results[i] = (policy, value)
+                if self.cache is not None:
+                    self.cache.put(leaf_infos[i][3], policy, value)
+        return results
+
     # ------------------------------------------------------------------
     # Root helpers
     # ------------------------------------------------------------------
 
     def _build_root(self, env: GenericEnv) -> AZNode:
         """Create root node, expand immediately, and inject Dirichlet noise."""
-        root_env = env.clone()
-        root = AZNode(env=root_env)
-        valid_actions = root_env.get_valid_actions()
-        policy, _ = self.net.predict(root_env.get_state())
+        root = AZNode()
+        root.to_play = env.current_player
+        valid_actions = env.get_valid_actions()
+        policy, _ = self._predict(env)
         raw = np.array([policy[a - 1] for a in valid_actions], dtype=np.float32)
         if not self.skip_dirichlet:
             noise = np.random.dirichlet([self.dirichlet_alpha] * len(valid_actions))
             raw = (1.0 - self.dirichlet_eps) * raw + self.dirichlet_eps * noise
         raw /= raw.sum()
         for action, prob in zip(valid_actions, raw):
-            child = AZNode(parent=root, parent_action=action, _source_env=root_env, _source_action=action)
+            child = AZNode(parent=root, parent_action=action)
             child.prob = float(prob)
             root.children[action] = child
         return root
@@ -221,7 +241,6 @@ class AlphaZeroMCTS:
         new_root = self._root.children[action]
         new_root.parent = None
         new_root.parent_action = None
-        _ = new_root.env  # materialize if still lazy
         self._root = new_root
         self._apply_dirichlet(self._root)
 
@@ -245,31 +264,34 @@ class AlphaZeroMCTS:
         """
         self.net.eval()
 
-        root = self._root if self._root is not None else self._build_root(env)
+        sim_env = env.clone()
+        root = self._root if self._root is not None else self._build_root(sim_env)
 
         for _ in range(self.n_simulations):
             node = root
+            depth = 0
 
             # SELECTION
-            while not node.is_terminal() and not node.is_leaf():
+            while not sim_env.done and not node.is_leaf():
                 node = node.select_child(self.cpuct)
+                sim_env.step(node.parent_action)
+                depth += 1
 
             # EXPANSION + EVALUATION
-            if not node.is_terminal():
-                node.expand()
-                policy, value = self.net.predict(node.env.get_state())
-                valid_actions = node.env.get_valid_actions()
-                raw = np.array([policy[a - 1] for a in valid_actions], dtype=np.float32)
-                raw /= raw.sum()
-                for action, prob in zip(valid_actions, raw):
-                    node.children[action].prob = float(prob)
+            if not sim_env.done:
+                policy, value = self._predict(sim_env)
+                node.expand(sim_env.current_player, sim_env.get_valid_actions(), policy)
                 value = float(value)
             else:
-                value = node.terminal_node_eval(node.env, node.to_play)
+                value = node.terminal_node_eval(sim_env, sim_env.current_player)
 
             # BACKPROPAGATION
             node.backpropagate(value)
 
+            # back to the root position
+            for _ in range(depth):
+                sim_env.undo()
+
         self._root = root
         return self.select_action(root, temperature), root
 
@@ -289,20 +311,32 @@ class AlphaZeroMCTS:
         """
         self.net.eval()
 
-        root = self._root if self._root is not None else self._build_root(env)
+        sim_env = env.clone()
+        root = self._root if self._root is not None else self._build_root(sim_env)
 
         sims_done = 0
         while sims_done < self.n_simulations:
             to_collect = min(self.batch_size, self.n_simulations - sims_done)
             batch_leaves: list[AZNode] = []
+            # per leaf: (to_play, valid_actions, state, cache key) or the terminal value
+            leaf_infos: list = []
 
             # SELECTION: collect up to batch_size leaves with virtual loss
             for _ in range(to_collect):
                 node = root
-                while not node.is_terminal() and not node.is_leaf():
+                depth = 0
+                while not sim_env.done and not node.is_leaf():
                     node = node.select_child(self.cpuct)
+                    sim_env.step(node.parent_action)
+                    depth += 1
                 node.apply_virtual_loss()
                 batch_leaves.append(node)
+                if sim_env.done:
+                    leaf_infos.append(node.terminal_node_eval(sim_env, sim_env.current_player))
+                else:
+                    leaf_infos.append(self._leaf_info(sim_env))
+                for _ in range(depth):
+                    sim_env.undo()
 
             # Revert all virtual losses before backpropagation
             for node in batch_leaves:
@@ -310,24 +344,20 @@ class AlphaZeroMCTS:
 
             # EXPANSION + EVALUATION
             non_terminal: list[AZNode] = []
-            non_terminal_states: list = []
-            for node in batch_leaves:
-                if node.is_terminal():
-                    value = node.terminal_node_eval(node.env, node.to_play)
-                    node.backpropagate(value)
+            non_terminal_infos: list = []
+            for node, info in zip(batch_leaves, leaf_infos):
+                if isinstance(info, float):
+                    node.backpropagate(info)
                 else:
-                    node.expand()
                     non_terminal.append(node)
-                    non_terminal_states.append(node.env.get_state())
+                    non_terminal_infos.append(info)
 
             if non_terminal:
-                policies, values = self.net.batch_predict(non_terminal_states)
-                for node, policy, value in zip(non_terminal, policies, values):
-                    valid_actions = node.env.get_valid_actions()
-                    raw = np.array([policy[a - 1] for a in valid_actions], dtype=np.float32)
-                    raw /= raw.sum()
-                    for action, prob in zip(valid_actions, raw):
-                        node.children[action].prob = float(prob)
+                predictions = self._predict_leaves(non_terminal_infos)
+                for node, (to_play, valid_actions, _, _), (policy, value) in zip(
+                    non_terminal, non_terminal_infos, predictions
+                ):
+                    node.expand(to_play, valid_actions, policy)
                     node.backpropagate(float(value))
 
             sims_done += len(batch_leaves)
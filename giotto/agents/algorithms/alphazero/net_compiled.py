@@ -0,0 +1,116 @@
+"""Inference-optimized torch AlphaZeroNet, for the small batches evaluated during the searches."""
+
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch import nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+
+COMPILE_MODES = ("none", "trace", "script", "inductor")
+
+
+def fuse_conv_bn(net: AlphaZeroNet) -> AlphaZeroNet:
+    """Eval-mode copy of net with every BatchNorm folded into the convolution before it."""
+    fused = copy.deepcopy(net).eval()
+    pairs = [(fused, "conv", "bn"), (fused, "policy_conv", "policy_bn"), (fused, "value_conv", "value_bn")]
+    for block in fused.res_blocks:
+        pairs += [(block, "conv1", "bn1"), (block, "conv2", "bn2")]
+    for owner, conv, bn in pairs:
+        setattr(owner, conv, fuse_conv_bn_eval(getattr(owner, conv), getattr(owner, bn)))
+        setattr(owner, bn, nn.Identity())
+    return fused
+
+
+class CompiledAlphaZeroNet:
+    """Inference-only AlphaZeroNet with the per-call overhead of eager PyTorch cut down.
+
+    Built from the weights of a torch AlphaZeroNet: BatchNorms are folded into the convolutions, the
+    module is optionally stored in channels-last memory format and bfloat16, then compiled with mode:
+    - none: fused eager module.
+    - trace / script: TorchScript module, frozen (weights inlined as constants) for inference.
+    - inductor: torch.compile with dynamic batch sizes. Compiles on the first calls, needs a C compiler on CPU.
+
+    Exposes predict, batch_predict, eval, input_size and policy_output_size like AlphaZeroNet, and runs them
+    under torch.inference_mode. Weights are copied: build a new instance after the source net changes.
+    """
+
+    def __init__(self, net: AlphaZeroNet, *, mode: str = "trace", channels_last: bool = False, bf16: bool = False):
+        """Instantiates network, compiling a copy of net.
+
+        Args:
+            net: torch AlphaZeroNet with the weights to use.
+            mode: compilation, one of COMPILE_MODES.
+            channels_last: store weights and inputs in channels-last (NHWC) memory format.
+            bf16: run in bfloat16, fast on CPUs with native bf16 instructions. Outputs are float32.
+        """
+        if mode not in COMPILE_MODES:
+            raise ValueError(f"Unknown compile mode {mode}, expected one of {COMPILE_MODES}.")
+        self.input_size = net.input_size
+        self.policy_output_size = net.policy_output_size
+        self.mode = mode
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.dtype = torch.bfloat16 if bf16 else torch.float32
+        self.device = next(net.parameters()).device
+        self._batch_buf = np.zeros((0, *self.input_size), dtype=np.float32)
+
+        module = fuse_conv_bn(net).to(dtype=self.dtype, memory_format=self.memory_format)
+        if mode == "trace":
+            example = self._to_input(np.zeros((1, *self.input_size), dtype=np.float32))
+            with torch.no_grad():
+                module = torch.jit.freeze(torch.jit.trace(module, example))
+        elif mode == "script":
+            module = torch.jit.freeze(torch.jit.script(module))
+        elif mode == "inductor":
+            module = torch.compile(module, dynamic=True)
+        self.module = module
+
+    def _to_input(self, buf: np.ndarray) -> torch.Tensor:
+        """Network input tensor of the float32 planes buf (B, C, H, W)."""
+        return torch.from_numpy(buf).to(self.device, self.dtype).contiguous(memory_format=self.memory_format)
+
+    def eval(self):
+        """No-op, the module is always in eval mode."""
+        return self
+
+    def forward(self, x: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """Policy logits (B, A) and values (B, 1), float32, of the input planes x (B, C, H, W)."""
+        x = x.to(self.device, self.dtype).contiguous(memory_format=self.memory_format)
+        with torch.inference_mode():
+            policy_logits, value = self.module(x)
+        return policy_logits.float(), value.float()
+
+    def predict(self, state: list[np.ndarray, int]):
+        """Predict (policy_probs, value) as numpy."""
+        policies, values = self.batch_predict([state])
+        return policies[0], values[0]
+
+    def batch_predict(self, states: list[list[np.ndarray, int]]) -> tuple[np.ndarray, np.ndarray]:
+        """Predict (policy_probs, values) for a batch of states as numpy arrays.
+
+        Args:
+            states: List of [board, player_id] states.
+
+        Returns:
+            Tuple of (policies, values) with shapes (B, A) and (B,).
+        """
+        B = len(states)
+        if len(self._batch_buf) < B:
+            self._batch_buf = np.zeros((B, *self.input_size), dtype=np.float32)
+        buf = self._batch_buf[:B]
+        for i, (board, player_id) in enumerate(states):
+            buf[i, 0] = board == player_id
+            buf[i, 1] = board == (1 - player_id)
+
+        with torch.inference_mode():
+            policy_logits, value_tensor = self.module(self._to_input(buf))
+            policy_probs = F.softmax(policy_logits.float(), dim=1)
+
+        policies = policy_probs.cpu().numpy()
+        values = value_tensor.float().cpu().numpy().squeeze(-1)
+        return policies, values
@@ -1,4 +1,7 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+QUANTIZE_MODES = ("int8", "float16")
 
 
 class AlphaZeroNetNumpy:
@@ -10,6 +13,20 @@ class AlphaZeroNetNumpy:
     - process_state(state) -> x with shape [1,2,H,W]
     - predict(state) -> (policy_probs, value_scalar)
     - eval(), load_state_dict(), parameters()
+
+    load_state_dict() compiles the weights once for inference: every BatchNorm is folded into the
+    weights and bias of the convolution before it, and conv weights are stored in GEMM layout.
+    Activations flow in NHWC layout, so each convolution is a single matmul of the im2col windows,
+    followed by the optional residual and relu. 3x3 weights carry the bias as an extra row, matched by a
+    constant column of ones in the im2col columns.
+
+    forward() works in preallocated buffers, created on the first call for each batch size: zero-padded
+    inputs whose borders are never written, im2col columns filled from cached strided window views, and
+    activation, head and fc outputs. After warm-up a forward pass only allocates the two arrays it returns.
+    The buffers make a net instance not safe to share between threads.
+
+    Weights quantized by quantize_state_dict() (int8 per output channel or float16, for smaller .npz files)
+    are restored to float32 when loaded.
     """
 
     def __init__(
@@ -29,6 +46,12 @@ class AlphaZeroNetNumpy:
         self._bn_eps = 1e-5
 
         self._sd = {}
+        # compiled layers: name -> (weight, bias), see compile()
+        self._convs = {}
+        # fully connected layers: name -> (weight (in, out), bias (out,))
+        self._fcs = {}
+        # batch size -> forward buffers, see _workspace()
+        self._workspaces = {}
         self._device = "cpu"  # compatibility only
 
     # -------------------------
@@ -60,63 +83,36 @@ class AlphaZeroNetNumpy:
         policy_logits: [B, policy_output_size]
         value: [B, value_output_size].
         """
-        x = x.astype(np.float32, copy=False)
+        if not self._convs:
+            raise RuntimeError("No weights loaded: call load_state_dict() or load_numpy_weights() first.")
+        batch = x.shape[0]
+        ws = self._workspace(batch)
+        # the input goes straight into the padded buffer of the first convolution, in NHWC
+        ws["input"]["interior"][...] = x.transpose(0, 2, 3, 1)
 
         # trunk: conv + bn + relu
-        x = self._conv2d(x, self._sd["conv.weight"], bias=None, padding=1, stride=1)
-        x = self._bn2d_eval(
-            x,
-            self._sd["bn.weight"],
-            self._sd["bn.bias"],
-            self._sd["bn.running_mean"],
-            self._sd["bn.running_var"],
-        )
-        x = self._relu(x)
+        x, spare, out = ws["acts"]
+        self._conv("conv", ws["input"], x)
 
         # residual tower
         for i in range(self.residual_blocks):
-            x = self._res_block(x, i)
-
-        # policy head
-        p = self._conv2d(
-            x,
-            self._sd["policy_conv.weight"],
-            bias=self._sd["policy_conv.bias"],
-            padding=0,
-            stride=1,
-        )
-        p = self._bn2d_eval(
-            p,
-            self._sd["policy_bn.weight"],
-            self._sd["policy_bn.bias"],
-            self._sd["policy_bn.running_mean"],
-            self._sd["policy_bn.running_var"],
-        )
-        p = self._relu(p)
-        p = p.reshape(p.shape[0], -1)
-        p = self._linear(p, self._sd["policy_fc.weight"], self._sd["policy_fc.bias"])
-
-        # value head
-        v = self._conv2d(
-            x,
-            self._sd["value_conv.weight"],
-            bias=self._sd["value_conv.bias"],
-            padding=0,
-            stride=1,
-        )
-        v = self._bn2d_eval(
-            v,
-            self._sd["value_bn.weight"],
-            self._sd["value_bn.bias"],
-            self._sd["value_bn.running_mean"],
-            self._sd["value_bn.running_var"],
-        )
-        v = self._relu(v)
-        v = v.reshape(v.shape[0], -1)
-        v = self._relu(self._linear(v, self._sd["value_fc1.weight"], self._sd["value_fc1.bias"]))
-        v = np.tanh(self._linear(v, self._sd["value_fc2.weight"], self._sd["value_fc2.bias"]))
-
-        return p.astype(np.float32), v.astype(np.float32)
+            self._conv(f"res_blocks.{i}.conv1", self._im2col_input(ws, x), spare)
+            self._conv(f"res_blocks.{i}.conv2", self._im2col_input(ws, spare), out, residual=x)
+            x, out = out, x
+
+        # heads, flattened in the channel-major order of the torch fc layers
+        self._conv("policy_conv", x, ws["policy_head"], bias=ws["bias"]["policy_conv"])
+        np.copyto(ws["policy_flat_nchw"], ws["policy_head"].transpose(0, 3, 1, 2))
+        p = self._fc("policy_fc", ws, ws["policy_flat"], ws["policy_logits"])
+
+        self._conv("value_conv", x, ws["value_head"], bias=ws["bias"]["value_conv"])
+        np.copyto(ws["value_flat_nchw"], ws["value_head"].transpose(0, 3, 1, 2))
+        v = self._fc("value_fc1", ws, ws["value_flat"], ws["value_hidden"])
+        np.maximum(v, 0.0, out=v)
+        v = self._fc("value_fc2", ws, v, ws["value"])
+        np.tanh(v, out=v)
+
+        return p.copy(), v.copy()
 
     # -------------------------
     # Same helpers as Torch version
@@ -180,16 +176,12 @@ class AlphaZeroNetNumpy:
         You can pass:
         - actual torch tensors (will be converted via .detach().cpu().numpy())
         - numpy arrays already
+        - quantized weights from quantize_state_dict(), restored to float32
         """
+        state_dict = dequantize_state_dict(state_dict)
 
         def to_np(a):
-            if hasattr(a, "detach"):
-                a = a.detach()
-            if hasattr(a, "cpu"):
-                a = a.cpu()
-            if hasattr(a, "numpy"):
-                a = a.numpy()
-            return np.asarray(a, dtype=np.float32)
+            return np.asarray(_to_numpy(a), dtype=np.float32)
 
         required = [
             "conv.weight",
@@ -242,87 +234,201 @@ class AlphaZeroNetNumpy:
                     raise KeyError(f"Missing key in state_dict: {kk}")
                 self._sd[kk] = to_np(state_dict[kk])
 
+        return self.compile()
+
+    def compile(self):
+        """Folds the BatchNorms into the convolutions and lays the conv weights out for GEMM.
+
+        BatchNorm in eval mode is the affine map ``gamma * (y - mean) / sqrt(var + eps) + beta``: with
+        ``scale = gamma / sqrt(var + eps)`` it becomes conv weights scaled by ``scale`` per output channel and
+        bias ``scale * (conv_bias - mean) + beta``. Called by load_state_dict.
+        """
+        layers = {"conv": "bn", "policy_conv": "policy_bn", "value_conv": "value_bn"}
+        for i in range(self.residual_blocks):
+            layers[f"res_blocks.{i}.conv1"] = f"res_blocks.{i}.bn1"
+            layers[f"res_blocks.{i}.conv2"] = f"res_blocks.{i}.bn2"
+
+        self._convs = {}
+        for conv, bn in layers.items():
+            w = self._sd[f"{conv}.weight"].astype(np.float64)
+            b = self._sd.get(f"{conv}.bias", np.zeros(w.shape[0], dtype=np.float32)).astype(np.float64)
+            scale = self._sd[f"{bn}.weight"] / np.sqrt(self._sd[f"{bn}.running_var"].astype(np.float64) + self._bn_eps)
+            w = w * scale[:, None, None, None]
+            b = (b - self._sd[f"{bn}.running_mean"]) * scale + self._sd[f"{bn}.bias"]
+            cout, cin, kh, kw = w.shape
+            # (cout, cin, kh, kw) -> (kh * kw * cin, cout), the order of the NHWC im2col columns
+            w_gemm = w.transpose(2, 3, 1, 0).reshape(kh * kw * cin, cout)
+            if kh == 1:
+                self._convs[conv] = (np.ascontiguousarray(w_gemm, dtype=np.float32), b.astype(np.float32))
+            else:
+                # bias as an extra weight row, matched by a column of ones in the im2col buffers
+                self._convs[conv] = (np.vstack([w_gemm, b[None]]).astype(np.float32), None)
+
+        self._fcs = {
+            fc: (np.ascontiguousarray(self._sd[f"{fc}.weight"].T), self._sd[f"{fc}.bias"])
+            for fc in ("policy_fc", "value_fc1", "value_fc2")
+        }
+        self._workspaces = {}
         return self
 
     # -------------------------
     # Internal ops
     # -------------------------
-    def _res_block(self, x, i: int):
-        residual = x
-
-        y = self._conv2d(x, self._sd[f"res_blocks.{i}.conv1.weight"], bias=None, padding=1, stride=1)
-        y = self._bn2d_eval(
-            y,
-            self._sd[f"res_blocks.{i}.bn1.weight"],
-            self._sd[f"res_blocks.{i}.bn1.bias"],
-            self._sd[f"res_blocks.{i}.bn1.running_mean"],
-            self._sd[f"res_blocks.{i}.bn1.running_var"],
-        )
-        y = self._relu(y)
-
-        y = self._conv2d(y, self._sd[f"res_blocks.{i}.conv2.weight"], bias=None, padding=1, stride=1)
-        y = self._bn2d_eval(
-            y,
-            self._sd[f"res_blocks.{i}.bn2.weight"],
-            self._sd[f"res_blocks.{i}.bn2.bias"],
-            self._sd[f"res_blocks.{i}.bn2.running_mean"],
-            self._sd[f"res_blocks.{i}.bn2.running_var"],
-        )
-
-        y = y + residual
-        return self._relu(y)
-
-    def _relu(self, x):
-        return np.maximum(x, 0.0)
-
     def _softmax(self, x, axis=-1):
         x = x - np.max(x, axis=axis, keepdims=True)
         e = np.exp(x)
         return e / np.sum(e, axis=axis, keepdims=True)
 
-    def _linear(self, x, w, b):
-        return x @ w.T + b
-
-    def _bn2d_eval(self, x, gamma, beta, running_mean, running_var):
-        mean = running_mean[None, :, None, None]
-        var = running_var[None, :, None, None]
-        gamma = gamma[None, :, None, None]
-        beta = beta[None, :, None, None]
-        return (x - mean) / np.sqrt(var + self._bn_eps) * gamma + beta
-
-    def _conv2d(self, x, w, bias=None, padding=1, stride=1):
-        """PyTorch-like Conv2d (actually cross-correlation). [web:52]."""
-        batch, cin, hin, win = x.shape
-        cout, cin_w, kh, kw = w.shape
-        if cin != cin_w:
-            raise ValueError(f"Conv cin mismatch: x has {cin}, w expects {cin_w}")
-
-        hout = (hin + 2 * padding - kh) // stride + 1
-        wout = (win + 2 * padding - kw) // stride + 1
-
-        x_pad = np.pad(
-            x,
-            ((0, 0), (0, 0), (padding, padding), (padding, padding)),
-            mode="constant",
-        ).astype(np.float32, copy=False)
-
-        # im2col
-        cols = np.zeros((batch, cin, kh, kw, hout, wout), dtype=np.float32)
-        for di in range(kh):
-            for dj in range(kw):
-                cols[:, :, di, dj, :, :] = x_pad[
-                    :,
-                    :,
-                    di : di + stride * hout : stride,
-                    dj : dj + stride * wout : stride,
-                ]
-
-        cols = cols.transpose(0, 4, 5, 1, 2, 3).reshape(batch * hout * wout, -1)
-        w_col = w.reshape(cout, -1).astype(np.float32, copy=False)
-
-        out = cols @ w_col.T  # [B*hout*wout, cout]
-        if bias is not None:
-            out += bias.astype(np.float32, copy=False)[None, :]
-
-        out = out.reshape(batch, hout, wout, cout).transpose(0, 3, 1, 2)
-        return out.astype(np.float32, copy=False)
+    def _im2col_buffers(self, batch: int, cin: int) -> dict:
+        """Zero-padded input, its 3x3 windows and the im2col columns they are copied into."""
+        _, h, w = self.input_size
+        padded = np.zeros((batch, h + 2, w + 2, cin), dtype=np.float32)
+        # the last column stays 1, for the bias row of the weights
+        cols = np.ones((batch * h * w, 9 * cin + 1), dtype=np.float32)
+        return {
+            "interior": padded[:, 1 : h + 1, 1 : w + 1, :],
+            # (B, H, W, cin, 3, 3) -> (B, H, W, 3, 3, cin), the order of the GEMM weight rows
+            "windows": sliding_window_view(padded, (3, 3), axis=(1, 2)).transpose(0, 1, 2, 4, 5, 3),
+            "cols": cols,
+            "cols_view": cols[:, : 9 * cin].reshape(batch, h, w, 3, 3, cin),
+        }
+
+    def _workspace(self, batch: int) -> dict:
+        """Buffers of a forward pass of batch inputs, allocated on the first call for each batch size."""
+        ws = self._workspaces.get(batch)
+        if ws is None:
+            cin, h, w = self.input_size
+            ws = {
+                "input": self._im2col_buffers(batch, cin),
+                "trunk": self._im2col_buffers(batch, self.channels),
+                "acts": [np.empty((batch, h, w, self.channels), dtype=np.float32) for _ in range(3)],
+                # biases broadcast to their output shape: in-place adds of equal shapes need no temporaries
+                "bias": {},
+            }
+            for head in ("policy", "value"):
+                weight, bias = self._convs[f"{head}_conv"]
+                c_head = weight.shape[1]
+                ws[f"{head}_head"] = np.empty((batch, h, w, c_head), dtype=np.float32)
+                ws["bias"][f"{head}_conv"] = np.tile(bias, (batch * h * w, 1))
+                ws[f"{head}_flat"] = np.empty((batch, c_head * h * w), dtype=np.float32)
+                ws[f"{head}_flat_nchw"] = ws[f"{head}_flat"].reshape(batch, c_head, h, w)
+            for name, key in (("policy_fc", "policy_logits"), ("value_fc1", "value_hidden"), ("value_fc2", "value")):
+                weight, bias = self._fcs[name]
+                ws[key] = np.empty((batch, weight.shape[1]), dtype=np.float32)
+                ws["bias"][name] = np.tile(bias, (batch, 1))
+            self._workspaces[batch] = ws
+        return ws
+
+    @staticmethod
+    def _im2col_input(ws: dict, x: np.ndarray) -> dict:
+        """Copies the activations x into the interior of the padded trunk buffer."""
+        ws["trunk"]["interior"][...] = x
+        return ws["trunk"]
+
+    def _fc(self, name: str, ws: dict, x: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Fully connected layer written into out."""
+        np.matmul(x, self._fcs[name][0], out=out)
+        out += ws["bias"][name]
+        return out
+
+    def _conv(self, name: str, x, out: np.ndarray, *, bias: np.ndarray | None = None, residual=None) -> np.ndarray:
+        """Compiled stride-1 'same' convolution + folded BN (+ residual) + relu, written into out (NHWC).
+
+        Args:
+            name: compiled layer.
+            x: im2col buffers holding the input of a 3x3 convolution, or the NHWC input of a 1x1 one.
+            out: output buffer (B, H, W, cout).
+            bias: bias of a 1x1 convolution broadcast to (B * H * W, cout). 3x3 ones carry it in the weights.
+            residual: optional tensor added before relu.
+        """
+        weight, _ = self._convs[name]
+        out_2d = out.reshape(-1, out.shape[-1])
+        if isinstance(x, dict):
+            np.copyto(x["cols_view"], x["windows"])
+            np.matmul(x["cols"], weight, out=out_2d)
+        else:
+            np.matmul(x.reshape(-1, x.shape[-1]), weight, out=out_2d)
+            out_2d += bias
+        if residual is not None:
+            out += residual
+        return np.maximum(out, 0.0, out=out)
+
+
+def _to_numpy(a) -> np.ndarray:
+    """Numpy array of a torch tensor or array-like."""
+    if hasattr(a, "detach"):
+        a = a.detach()
+    if hasattr(a, "cpu"):
+        a = a.cpu()
+    if hasattr(a, "numpy"):
+        a = a.numpy()
+    return np.asarray(a)
+
+
+def quantize_state_dict(state_dict: dict, mode: str) -> dict:
+    """Post-training quantization of the conv and fc weights of an AlphaZeroNet state_dict.
+
+    int8 stores each output channel as round(w / scale) with scale = max|w| / 127, the float32 scales in an
+    extra ``<name>_scale`` entry. float16 stores the weights in half precision. Biases and BatchNorm parameters
+    stay float32. Per-channel scales survive the BatchNorm folding of compile(), which rescales whole output
+    channels. load_state_dict() restores float32 weights, so inference still accumulates in float32.
+
+    Args:
+        state_dict: torch or numpy state_dict.
+        mode: one of QUANTIZE_MODES.
+
+    Returns:
+        numpy state_dict, to be saved with np.savez_compressed.
+    """
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(f"Unknown quantization mode {mode}, expected one of {QUANTIZE_MODES}.")
+    quantized = {}
+    for key, tensor in state_dict.items():
+        value = _to_numpy(tensor)
+        if not key.endswith(".weight") or value.ndim < 2:
+            quantized[key] = value
+        elif mode == "float16":
+            quantized[key] = value.astype(np.float16)
+        else:
+            max_abs = np.abs(value).reshape(len(value), -1).max(axis=1)
+            scale = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+            scale_shape = (-1,) + (1,) * (value.ndim - 1)
+            quantized[key] = np.clip(np.rint(value / scale.reshape(scale_shape)), -127, 127).astype(np.int8)
+            quantized[f"{key}_scale"] = scale
+    return quantized
+
+
+def dequantize_state_dict(state_dict: dict) -> dict:
+    """state_dict with the weights of quantize_state_dict() back in float32. Other entries are unchanged."""
+    weights = {}
+    for key, value in state_dict.items():
+        if key.endswith("_scale"):
+            continue
+        scale = state_dict.get(f"{key}_scale")
+        if scale is not None:
+            quantized = _to_numpy(value).astype(np.float32)
+            weights[key] = quantized * np.asarray(scale, dtype=np.float32).reshape((-1,) + (1,) * (quantized.ndim - 1))
+        elif getattr(value, "dtype", None) == np.float16:
+            weights[key] = value.astype(np.float32)
+        else:
+            weights[key] = value
+    return weights
+
+
+def compare_nets(reference, other, states: list, batch_size: int = 256) -> dict:
+    """Agreement of two nets exposing batch_predict on a list of [board, player_id] states.
+
+    Returns:
+        dict with number of positions, fraction of positions where both policies pick the same top-1 move
+        and mean absolute difference of the values.
+    """
+    agree = 0
+    value_error = 0.0
+    for start in range(0, len(states), batch_size):
+        chunk = states[start : start + batch_size]
+        ref_policies, ref_values = reference.batch_predict(chunk)
+        policies, values = other.batch_predict(chunk)
+        agree += int((ref_policies.argmax(axis=1) == policies.argmax(axis=1)).sum())
+        value_error += float(np.abs(ref_values - values).sum())
+    n = max(len(states), 1)
+    return {"positions": len(states), "top1_agreement": agree / n, "value_mae": value_error / n}
@@ -0,0 +1,112 @@
+"""ONNX Runtime inference backend for the AlphaZero network.
+
+onnxruntime is an optional dependency (poetry install --with onnx), only imported by this module.
+"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+GRAPH_OPTIMIZATIONS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+class OnnxAlphaZeroNet:
+    """Inference-only AlphaZeroNet running an ONNX model with onnxruntime.
+
+    Exposes predict, batch_predict, eval, input_size and policy_output_size like AlphaZeroNet, so it can
+    back AlphaZeroMCTS and AlphaZeroAgent. The model is a file written by giotto/utils/export_onnx.py
+    (input "input" with a dynamic batch axis, outputs "policy" logits and "value"), or the ONNX bytes of
+    from_net().
+    """
+
+    def __init__(
+        self,
+        model: str | Path | bytes,
+        *,
+        intra_op_threads: int | None = None,
+        graph_optimization: str = "all",
+        providers: list[str] | None = None,
+    ):
+        """Instantiates network, creating the onnxruntime session.
+
+        Args:
+            model: path of the .onnx file, or the serialized model.
+            intra_op_threads: threads used inside each operator. None for the onnxruntime default (all cores).
+            graph_optimization: graph optimization level, one of GRAPH_OPTIMIZATIONS.
+            providers: execution providers in order of preference. Defaults to the CPU one.
+        """
+        if graph_optimization not in GRAPH_OPTIMIZATIONS:
+            raise ValueError(
+                f"Unknown graph optimization {graph_optimization}, expected one of {tuple(GRAPH_OPTIMIZATIONS)}."
+            )
+        options = ort.SessionOptions()
+        options.graph_optimization_level = GRAPH_OPTIMIZATIONS[graph_optimization]
+        if intra_op_threads is not None:
+            options.intra_op_num_threads = intra_op_threads
+        model = model if isinstance(model, bytes) else str(model)
+        self.session = ort.InferenceSession(model, options, providers=providers or ["CPUExecutionProvider"])
+
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_size = list(self.session.get_inputs()[0].shape[1:])
+        self.policy_output_size = self.session.get_outputs()[0].shape[1]
+        self._batch_buf = np.zeros((0, *self.input_size), dtype=np.float32)
+
+    @classmethod
+    def from_net(cls, net, **session_options) -> OnnxAlphaZeroNet:
+        """Exports the torch AlphaZeroNet net in memory and runs it with onnxruntime.
+
+        Args:
+            net: torch AlphaZeroNet.
+            **session_options: see __init__.
+        """
+        from giotto.utils.export_onnx import export_net  # noqa: PLC0415 torch is only needed to export, not to run
+
+        buffer = io.BytesIO()
+        export_net(net, buffer)
+        return cls(buffer.getvalue(), **session_options)
+
+    def eval(self):
+        """No-op, kept for compatibility."""
+        return self
+
+    def forward(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Policy logits (B, A) and values (B, 1) of the float32 planes x (B, C, H, W)."""
+        policy_logits, value = self.session.run(None, {self.input_name: x})
+        return policy_logits, value
+
+    def predict(self, state: list[np.ndarray, int]):
+        """Predict (policy_probs, value) as numpy."""
+        policies, values = self.batch_predict([state])
+        return policies[0], values[0]
+
+    def batch_predict(self, states: list[list[np.ndarray, int]]) -> tuple[np.ndarray, np.ndarray]:
+        """Predict (policy_probs, values) for a batch of states as numpy arrays.
+
+        Args:
+            states: List of [board, player_id] states.
+
+        Returns:
+            Tuple of (policies, values) with shapes (B, A) and (B,).
+        """
+        B = len(states)
+        if len(self._batch_buf) < B:
+            self._batch_buf = np.zeros((B, *self.input_size), dtype=np.float32)
+        buf = self._batch_buf[:B]
+        for i, (board, player_id) in enumerate(states):
+            buf[i, 0] = board == player_id
+            buf[i, 1] = board == (1 - player_id)
+
+        policy_logits, value = self.forward(buf)
+        policy_logits = policy_logits - policy_logits.max(axis=1, keepdims=True)
+        policies = np.exp(policy_logits)
+        policies /= policies.sum(axis=1, keepdims=True)
+        return policies, value[:, 0]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+import torch
+
+from giotto.agents.algorithms.alphazero.replay_buffer import ReplayBuffer
+
+
+class BatchPrefetcher:
+    """Prepares training batches from a ReplayBuffer in a background thread.
+
+    The thread samples (optionally with random symmetry augmentation), encodes the planes and converts them
+    to tensors, pinned if requested for faster host to GPU copies, keeping up to queue_size batches ready.
+    With queue_size 0 batches are prepared on the calling thread instead. wait_time accumulates the time the
+    learner spent waiting for a batch.
+
+    Use as a context manager, so the thread is stopped when training ends.
+    """
+
+    def __init__(
+        self,
+        buffer: ReplayBuffer,
+        batch_size: int,
+        n_batches: int | None = None,
+        *,
+        queue_size: int = 4,
+        augment: bool = False,
+        pin_memory: bool = False,
+    ):
+        """Instantiates prefetcher.
+
+        Args:
+            buffer: replay buffer to sample from.
+            batch_size: positions per batch.
+            n_batches: number of batches to produce. None for an endless stream.
+            queue_size: batches prepared ahead. 0 to prepare them on demand on the calling thread.
+            augment: apply a random symmetry to each sampled position.
+            pin_memory: pin the batch tensors in page-locked memory.
+        """
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.n_batches = n_batches
+        self.queue_size = queue_size
+        self.augment = augment
+        self.pin_memory = pin_memory
+        self.wait_time = 0.0
+        self.produced = 0
+        self.consumed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> BatchPrefetcher:
+        if self.queue_size > 0:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        while self.n_batches is None or self.consumed < self.n_batches:
+            yield self.get()
+
+    def _make_batch(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Samples and converts one batch."""
+        arrays = self.buffer.sample(self.batch_size, augment=self.augment)
+        tensors = tuple(torch.from_numpy(array) for array in arrays)
+        if self.pin_memory:
+            tensors = tuple(tensor.pin_memory() for tensor in tensors)
+        return tensors
+
+    def _run(self) -> None:
+        """Producer loop of the background thread."""
+        while not self._stop.is_set() and (self.n_batches is None or self.produced < self.n_batches):
+            try:
+                item = self._make_batch()
+            except Exception as e:
+                item = e
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            self.produced += 1
+            if isinstance(item, Exception):
+                return
+
+    def get(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Next batch (planes, policy targets, value targets), waiting for it if not ready yet."""
+        started = time.perf_counter()
+        item = self._queue.get() if self._thread is not None else self._make_batch()
+        self.wait_time += time.perf_counter() - started
+        if isinstance(item, Exception):
+            raise item
+        self.consumed += 1
+        return item
+
+    def close(self) -> None:
+        """Stops the background thread, dropping the batches not consumed."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
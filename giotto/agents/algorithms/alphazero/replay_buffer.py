@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from giotto.utils.simmetries import EquivalentBoards
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of self-play positions, stored in contiguous typed arrays.
+
+    Boards are kept as int8 (-1 empty, 0 and 1 players), the player to move as int8, policy targets and
+    value targets as float32. Once full, new positions overwrite the oldest ones. Sampling draws indices
+    and gathers the batch with fancy indexing, returning arrays ready for torch.from_numpy.
+
+    With a directory the arrays are memory-mapped .npy files, so the buffer can be larger than RAM and
+    survives restarts: flush() writes the pending changes and the fill state, and a buffer opened on the
+    same directory starts with the positions flushed last. It must be opened with the canonical and dedup
+    settings it was written with.
+
+    With the symmetries of the game, sample(augment=True) applies a random symmetry to each position of
+    the batch, as precomputed index permutations of the boards and policies. With canonical=True positions
+    are stored in their canonical orientation, so each one takes a single slot instead of one per equivalent
+    board, and sampling with augment=True restores the variety. Inserts and samples hold `lock`, so a
+    background thread can sample while positions are added.
+
+    With dedup=True a position already in the buffer (same canonical board and player to move) is not
+    inserted again: its policy and value targets become the running average of all its occurrences, and its
+    weight, the number of occurrences, makes it proportionally more likely to be sampled.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        board_shape: tuple[int, int],
+        n_actions: int,
+        *,
+        seed: int | None = None,
+        directory: str | Path | None = None,
+        simmetries: EquivalentBoards | None = None,
+        canonical: bool = False,
+        dedup: bool = False,
+    ):
+        """Instantiates buffer, empty or with the content flushed in directory.
+
+        Args:
+            capacity: maximum number of positions.
+            board_shape: (rows, cols) of the boards.
+            n_actions: size of the policy targets.
+            seed: optional seed of the sampling generator.
+            directory: optional directory of the memory-mapped files. None to keep the buffer in memory.
+            simmetries: optional symmetries of the game, for augmented sampling.
+            canonical: store positions in their canonical orientation. Requires simmetries.
+            dedup: merge repeated positions into one entry. Implies canonical storage if simmetries are given.
+        """
+        if canonical and simmetries is None:
+            raise ValueError("Canonical storage needs the simmetries of the game.")
+        self.capacity = int(capacity)
+        self.directory = Path(directory) if directory is not None else None
+        self.simmetries = simmetries
+        self.canonical = canonical or (dedup and simmetries is not None)
+        self.dedup = dedup
+        meta = {}
+        if self.directory is not None and self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            # the stored entries are only valid with the storage mode they were written with
+            stored_mode = (meta.get("dedup", False), meta.get("canonical", False))
+            if stored_mode != (self.dedup, self.canonical):
+                raise ValueError(
+                    f"{self.directory} holds a buffer with dedup={stored_mode[0]} and canonical={stored_mode[1]}, "
+                    f"expected dedup={self.dedup} and canonical={self.canonical}."
+                )
+        specs = {
+            "boards": ((self.capacity, *board_shape), np.int8),
+            "players": ((self.capacity,), np.int8),
+            "policies": ((self.capacity, n_actions), np.float32),
+            "values": ((self.capacity,), np.float32),
+        }
+        if dedup:
+            specs["weights"] = ((self.capacity,), np.float32)
+        self._array_names = tuple(specs)
+        for name, (shape, dtype) in specs.items():
+            if self.directory is None:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = self._open_array(self.directory / f"{name}.npy", shape, dtype)
+            setattr(self, name, array)
+        self.size = meta.get("size", 0)
+        # index of the next write
+        self.position = meta.get("position", 0)
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+        # number of positions merged into an existing entry
+        self.merged = 0
+        # position key -> slot, for dedup
+        self._slots = {}
+        if dedup:
+            self._slots = {self._position_key(self.boards[i], self.players[i]): i for i in range(self.size)}
+
+    @staticmethod
+    def _open_array(path: Path, shape: tuple, dtype: type) -> np.ndarray:
+        """Opens (or creates) the memory-mapped array at path, checking its layout."""
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        array = np.lib.format.open_memmap(path, mode="r+")
+        if array.shape != shape or array.dtype != dtype:
+            raise ValueError(f"{path} holds a {array.shape} {array.dtype} array, expected {shape} {np.dtype(dtype)}.")
+        return array
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "meta.json"
+
+    def flush(self) -> None:
+        """Writes the changes since the last flush to disk. No-op for in-memory buffers."""
+        if self.directory is None:
+            return
+        for name in self._array_names:
+            getattr(self, name).flush()
+        # fill state last and atomically: after a crash the buffer reopens with the previous size and position,
+        # slots written since then hold newer, still valid, positions
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"size": self.size, "position": self.position, "dedup": self.dedup, "canonical": self.canonical})
+        )
+        tmp_path.replace(self._meta_path)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add_arrays(self, boards: np.ndarray, players: np.ndarray, policies: np.ndarray, values: np.ndarray) -> None:
+        """Inserts a batch of positions given as arrays with a leading batch dimension."""
+        n = len(boards)
+        if n == 0:
+            return
+        if self.dedup:
+            self._add_merged(boards, players, policies, values)
+            return
+        if n > self.capacity:
+            # only the newest positions would survive anyway
+            newest = slice(n - self.capacity, n)
+            boards, players, policies, values = boards[newest], players[newest], policies[newest], values[newest]
+            n = self.capacity
+        if self.canonical:
+            boards, policies = self.simmetries.transform(
+                boards, self.simmetries.canonical_transforms(boards), np.asarray(policies)
+            )
+        indices = (self.position + np.arange(n)) % self.capacity
+        with self.lock:
+            self.boards[indices] = boards
+            self.players[indices] = players
+            self.policies[indices] = policies
+            self.values[indices] = values
+            self.position = (self.position + n) % self.capacity
+            self.size = min(self.size + n, self.capacity)
+
+    @staticmethod
+    def _position_key(board: np.ndarray, player: int) -> tuple[bytes, int]:
+        return board.tobytes(), int(player)
+
+    def _add_merged(self, boards: np.ndarray, players: np.ndarray, policies: np.ndarray, values: np.ndarray) -> None:
+        """Inserts positions one at a time, merging those already in the buffer."""
+        boards = np.asarray(boards, dtype=np.int8)
+        policies = np.asarray(policies, dtype=np.float32)
+        if self.canonical:
+            boards, policies = self.simmetries.transform(boards, self.simmetries.canonical_transforms(boards), policies)
+        with self.lock:
+            for board, player, policy, value in zip(boards, players, policies, values, strict=True):
+                key = self._position_key(board, player)
+                slot = self._slots.get(key)
+                if slot is not None:
+                    weight = self.weights[slot]
+                    self.policies[slot] = (self.policies[slot] * weight + policy) / (weight + 1)
+                    self.values[slot] = (self.values[slot] * weight + value) / (weight + 1)
+                    self.weights[slot] = weight + 1
+                    self.merged += 1
+                    continue
+                slot = self.position
+                if slot < self.size:
+                    # overwriting the oldest entry
+                    del self._slots[self._position_key(self.boards[slot], self.players[slot])]
+                self.boards[slot] = board
+                self.players[slot] = player
+                self.policies[slot] = policy
+                self.values[slot] = value
+                self.weights[slot] = 1.0
+                self._slots[key] = slot
+                self.position = (slot + 1) % self.capacity
+                self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, records: list[dict]) -> None:
+        """Inserts self-play records {state: [board, player], policy_target, value_target}."""
+        if not records:
+            return
+        self.add_arrays(
+            np.stack([r["state"][0] for r in records]),
+            np.array([r["state"][1] for r in records]),
+            np.stack([r["policy_target"] for r in records]),
+            np.array([r["value_target"] for r in records]),
+        )
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Draws batch_size distinct positions, uniformly or, with dedup, proportionally to their weight."""
+        if self.dedup:
+            weights = self.weights[: self.size]
+            return self.rng.choice(self.size, size=batch_size, replace=False, p=weights / weights.sum())
+        return self.rng.choice(self.size, size=batch_size, replace=False)
+
+    def get_batch(
+        self, indices: np.ndarray, transforms: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Network inputs and targets of the given positions.
+
+        Args:
+            indices: positions of the batch.
+            transforms: optional symmetry transform id (index in simmetries.transforms()) of each position.
+
+        Returns:
+            planes (B, 2, rows, cols) float32 with the pieces of the player to move first,
+            policy targets (B, n_actions) float32 and value targets (B, 1) float32.
+        """
+        boards = self.boards[indices]
+        policies = self.policies[indices]
+        if transforms is not None:
+            boards, policies = self.simmetries.transform(boards, transforms, policies)
+        players = self.players[indices][:, None, None]
+        planes = np.stack([boards == players, boards == 1 - players], axis=1).astype(np.float32)
+        return planes, policies, self.values[indices][:, None]
+
+    def sample(self, batch_size: int, augment: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Random batch of network inputs and targets, see get_batch.
+
+        Args:
+            batch_size: number of positions.
+            augment: apply a random symmetry to each position. Requires the simmetries of the game.
+        """
+        with self.lock:
+            indices = self.sample_indices(batch_size)
+            transforms = None
+            if augment:
+                if self.simmetries is None:
+                    raise ValueError("Augmented sampling needs the simmetries of the game.")
+                transforms = self.rng.integers(len(self.simmetries.transforms()), size=batch_size)
+            return self.get_batch(indices, transforms)
@@ -6,8 +6,8 @@ import logging
 import math
 import os
 import random
+import time
 import traceback
-from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -22,12 +22,19 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import torch.multiprocessing as mp
 
+from giotto.agents.algorithms.alphazero.array_mcts import ArrayAlphaZeroMCTS
+from giotto.agents.algorithms.alphazero.eval_cache import EvaluationCache
+from giotto.agents.algorithms.alphazero.inference_server import InferenceClient, InferenceServer
 from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS, AZNode
 from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+from giotto.agents.algorithms.alphazero.net_compiled import CompiledAlphaZeroNet
+from giotto.agents.algorithms.alphazero.net_numpy import AlphaZeroNetNumpy
+from giotto.agents.algorithms.alphazero.prefetch import BatchPrefetcher
+from giotto.agents.algorithms.alphazero.replay_buffer import ReplayBuffer
 from giotto.agents.alphazero import AlphaZeroAgent
 from giotto.agents.mcts import MCTSAgent
 from giotto.envs.generic import GenericEnv
-from giotto.utils.text_play import play_n_games
+from giotto.utils.text_play import play_game, play_n_games
 
 logging.basicConfig(
     level=logging.INFO,
@@ -50,13 +57,73 @@ def _set_worker_threads(num_processes: int) -> None:
         pass
 
 
+def _inference_net(net: AlphaZeroNet, config: dict):
+    """Network running the searches of a worker: net itself, or a copy of it on the backend of the config.
+
+    network.backend is torch (net), compiled (CompiledAlphaZeroNet, see network.compile_mode, channels_last
+    and bf16), onnx (onnxruntime, optional dependency) or numpy (AlphaZeroNetNumpy).
+    """
+    network = config["network"]
+    backend = network.get("backend", "torch")
+    if backend == "torch":
+        return net
+    if backend == "compiled":
+        return CompiledAlphaZeroNet(
+            net,
+            mode=network.get("compile_mode", "trace"),
+            channels_last=network.get("channels_last", False),
+            bf16=network.get("bf16", False),
+        )
+    if backend == "onnx":
+        from giotto.agents.algorithms.alphazero.net_onnx import OnnxAlphaZeroNet  # noqa: PLC0415 optional onnxruntime
+
+        return OnnxAlphaZeroNet.from_net(
+            net,
+            # default to the threads of the worker, see _set_worker_threads
+            intra_op_threads=network.get("onnx_threads") or torch.get_num_threads(),
+            graph_optimization=network.get("onnx_optimization", "all"),
+        )
+    if backend == "numpy":
+        return AlphaZeroNetNumpy(
+            input_size=network["input_size"],
+            value_output_size=network["value_output_size"],
+            policy_output_size=network["policy_output_size"],
+            channels=network["channels"],
+            residual_blocks=network["residual_blocks"],
+        ).load_state_dict(net.state_dict())
+    raise ValueError(f"Unknown network backend {backend}, expected torch, compiled, onnx or numpy.")
+
+
+def _check_inference_server(config: dict) -> None:
+    """Raises if training.inference_server is combined with a network.backend: the server runs the torch net."""
+    backend = config["network"].get("backend", "torch")
+    if config["training"].get("inference_server", False) and backend != "torch":
+        raise ValueError(
+            f"training.inference_server evaluates the leaves with the torch network and does not support "
+            f"network.backend {backend}: disable one of the two."
+        )
+
+
+def _make_eval_cache(config: dict) -> EvaluationCache | None:
+    """Network evaluation cache configured by mcts.cache_size, None if disabled."""
+    cache_size = config["mcts"].get("cache_size", 0)
+    return EvaluationCache(cache_size) if cache_size > 0 else None
+
+
 def _run_self_play_game(
     net: AlphaZeroNet,
     base_env: GenericEnv,
     config: dict,
+    cache: EvaluationCache | None = None,
 ) -> list[dict]:
     """Generate one self-play game with MCTS tree reuse between moves.
 
+    Args:
+        net: network used by the search, in eval mode.
+        base_env: env of the game, cloned and reset.
+        config: training configuration.
+        cache: optional evaluation cache shared by the searches of the game (and possibly other games).
+
     Returns a list of {state, policy_target, value_target} records.
     """
     env = base_env.clone()
@@ -65,13 +132,15 @@ def _run_self_play_game(
     episode_records = []
 
     mcts_batch_size = config["mcts"].get("batch_size", 1)
-    mcts = AlphaZeroMCTS(
+    mcts_cls = ArrayAlphaZeroMCTS if config["mcts"].get("tree", "object") == "array" else AlphaZeroMCTS
+    mcts = mcts_cls(
         net,
         n_simulations=config["mcts"]["n_sims"],
         cpuct=config["mcts"]["cpuct"],
         dirichlet_alpha=config["mcts"]["dirichlet_alpha"],
         dirichlet_eps=config["mcts"]["dirichlet_epsilon"],
         batch_size=mcts_batch_size,
+        cache=cache,
     )
 
     while not env.done:
@@ -114,8 +183,13 @@ def _self_play_worker(
     out_queue: mp.SimpleQueue,
     num_processes: int,
     seed: int | None = None,
+    *,
+    inference_client: InferenceClient | None = None,
 ) -> None:
-    """Worker that generates self-play data and pushes it to out_queue."""
+    """Worker that generates self-play data and pushes it to out_queue.
+
+    With an inference_client the network is evaluated by the inference server and net_state_dict is unused.
+    """
     try:
         _set_worker_threads(num_processes)
 
@@ -124,20 +198,29 @@ def _self_play_worker(
             np.random.seed(seed + worker_id)
             torch.manual_seed(seed + worker_id)
 
-        net = AlphaZeroNet(
-            input_size=config["network"]["input_size"],
-            value_output_size=config["network"]["value_output_size"],
-            policy_output_size=config["network"]["policy_output_size"],
-            channels=config["network"]["channels"],
-            residual_blocks=config["network"]["residual_blocks"],
-        )
-        net.load_state_dict(net_state_dict, strict=True)
-        net = net.to(device)
-        net.eval()
+        if inference_client is not None:
+            net = inference_client
+        else:
+            net = AlphaZeroNet(
+                input_size=config["network"]["input_size"],
+                value_output_size=config["network"]["value_output_size"],
+                policy_output_size=config["network"]["policy_output_size"],
+                channels=config["network"]["channels"],
+                residual_blocks=config["network"]["residual_blocks"],
+            )
+            net.load_state_dict(net_state_dict, strict=True)
+            net = net.to(device)
+            net.eval()
+            net = _inference_net(net, config)
 
         local_data = []
+        cache = _make_eval_cache(config)
         for _ in range(int(n_games)):
-            local_data.extend(_run_self_play_game(net, base_env, config))
+            if cache is not None and not config["mcts"].get("share_cache", False):
+                cache.clear()
+            local_data.extend(_run_self_play_game(net, base_env, config, cache=cache))
+        if cache is not None:
+            logger.info("Worker %d evaluation cache: %s", worker_id, cache.stats())
 
         out_queue.put(("ok", worker_id, local_data))
 
@@ -176,6 +259,7 @@ def _eval_worker(
         net.load_state_dict(net_state_dict, strict=True)
         net = net.to(device)
         net.eval()
+        net = _inference_net(net, config)
 
         az_agent = AlphaZeroAgent(
             game=config["game"],
@@ -197,6 +281,197 @@ def _eval_worker(
         out_queue.put(("err", worker_id, f"{e}\n{tb}"))
 
 
+class SharedWeights:
+    """Network weights in shared memory, published by the trainer and pulled by long-lived workers.
+
+    A version counter is bumped on every publish, so workers only copy the weights when they changed.
+    """
+
+    def __init__(self, state_dict: dict):
+        """Instantiates shared copy of state_dict (version 0)."""
+        self.tensors = {k: v.detach().cpu().clone().share_memory_() for k, v in state_dict.items()}
+        self.version = mp.Value("i", 0)
+
+    def publish(self, state_dict: dict) -> None:
+        """Overwrites the shared weights and bumps the version."""
+        with self.version.get_lock():
+            for k, v in state_dict.items():
+                self.tensors[k].copy_(v.detach())
+            self.version.value += 1
+
+    def pull(self, net: AlphaZeroNet, known_version: int) -> int:
+        """Loads the shared weights into net if they are newer than known_version.
+
+        Returns:
+            version of the weights now in net.
+        """
+        if self.version.value == known_version:
+            return known_version
+        with self.version.get_lock():
+            net.load_state_dict(self.tensors, strict=True)
+            return self.version.value
+
+
+def _pool_worker(
+    *,
+    worker_id: int,
+    base_env: GenericEnv,
+    config: dict,
+    weights: SharedWeights,
+    task_queue: mp.SimpleQueue,
+    out_queue: mp.SimpleQueue,
+    num_processes: int,
+    seed: int | None = None,
+) -> None:
+    """Long-lived worker of SelfPlayPool. Runs one game per task until it gets None, streaming each result back."""
+    try:
+        _set_worker_threads(num_processes)
+
+        if seed is not None:
+            random.seed(seed + worker_id)
+            np.random.seed(seed + worker_id)
+            torch.manual_seed(seed + worker_id)
+
+        net = AlphaZeroNet(
+            input_size=config["network"]["input_size"],
+            value_output_size=config["network"]["value_output_size"],
+            policy_output_size=config["network"]["policy_output_size"],
+            channels=config["network"]["channels"],
+            residual_blocks=config["network"]["residual_blocks"],
+        )
+        net.eval()
+        version = -1
+        cache = _make_eval_cache(config)
+
+        while (task := task_queue.get()) is not None:
+            kind, starter = task
+            new_version = weights.pull(net, version)
+            if new_version != version:
+                search_net = _inference_net(net, config)
+            if cache is not None and (new_version != version or not config["mcts"].get("share_cache", False)):
+                cache.clear()
+            version = new_version
+
+            if kind == "self_play":
+                out_queue.put(("game", worker_id, _run_self_play_game(search_net, base_env, config, cache=cache)))
+            else:
+                agents = [
+                    AlphaZeroAgent(simulations=config["mcts"]["n_sims"], cpuct=config["mcts"]["cpuct"], net=search_net),
+                    MCTSAgent(simulations=config["mcts"]["n_sims"], cpuct=config["mcts"]["cpuct"]),
+                ]
+                _, _, winner = play_game(base_env.clone(), agents, starter=starter, render=False)
+                out_queue.put(("match", worker_id, winner))
+
+    except Exception as e:
+        tb = traceback.format_exc()
+        out_queue.put(("err", worker_id, f"{e}\n{tb}"))
+
+
+class SelfPlayPool:
+    """Self-play and evaluation worker processes kept alive across training iterations.
+
+    Workers build their network once and pull new weights from a SharedWeights block when its version
+    changes, instead of being spawned with a pickled state dict every iteration. Games are queued one
+    per task, so workers balance the load, and each finished game is sent back as soon as it ends.
+    """
+
+    def __init__(
+        self, base_env: GenericEnv, config: dict, net: AlphaZeroNet, num_workers: int, seed: int | None = None
+    ):
+        """Starts the workers with the current weights of net.
+
+        Args:
+            base_env: env of the game.
+            config: training configuration.
+            net: network whose weights are published to the workers.
+            num_workers: number of worker processes.
+            seed: optional base seed, worker i uses seed + i.
+        """
+        self.weights = SharedWeights(net.state_dict())
+        self.tasks: mp.SimpleQueue = mp.SimpleQueue()
+        self.results: mp.SimpleQueue = mp.SimpleQueue()
+        self.procs: list[mp.Process] = []
+        for wid in range(num_workers):
+            p = mp.Process(
+                target=_pool_worker,
+                kwargs={
+                    "worker_id": wid,
+                    "base_env": base_env,
+                    "config": config,
+                    "weights": self.weights,
+                    "task_queue": self.tasks,
+                    "out_queue": self.results,
+                    "num_processes": num_workers,
+                    "seed": seed,
+                },
+            )
+            # daemon: the workers never outlive the trainer, even if training stops with an error
+            p.daemon = True
+            p.start()
+            self.procs.append(p)
+
+    def publish(self, net: AlphaZeroNet) -> None:
+        """Makes the current weights of net the ones used for the next games."""
+        self.weights.publish(net.state_dict())
+
+    def _get(self, expected: str):
+        """Next result from the workers, raising if a worker failed."""
+        status, wid, payload = self.results.get()
+        if status != expected:
+            self.close(force=True)
+            raise RuntimeError(f"Pool worker {wid} failed:\n{payload}")
+        return payload
+
+    def submit_self_play(self, n_games: int) -> None:
+        """Queues n_games self-play games, collect them with poll_self_play."""
+        for _ in range(n_games):
+            self.tasks.put(("self_play", None))
+
+    def poll_self_play(self, block: bool = False) -> list[list[dict]]:
+        """Records of each self-play game finished so far, waiting for at least one if block."""
+        finished = []
+        if block:
+            finished.append(self._get("game"))
+        while not self.results.empty():
+            finished.append(self._get("game"))
+        return finished
+
+    def iter_self_play(self, n_games: int):
+        """Queues n_games self-play games and yields the records of each game as soon as it ends."""
+        self.submit_self_play(n_games)
+        for _ in range(n_games):
+            yield self._get("game")
+
+    def self_play(self, n_games: int) -> list[dict]:
+        """Generates n_games self-play games, see iter_self_play."""
+        collected = []
+        for records in tqdm(self.iter_self_play(int(n_games)), total=int(n_games), desc="Self-play (pool)"):
+            collected.extend(records)
+        return collected
+
+    def play_vs_mcts(self, n_games: int) -> dict:
+        """Plays evaluation matches vs MCTS, alternating the starting player, and returns the rates."""
+        n_games = int(n_games)
+        for i in range(n_games):
+            self.tasks.put(("match", i % 2))
+        totals = {"AlphaZeroAgent": 0, "MCTSAgent": 0, "Draw": 0}
+        for _ in tqdm(range(n_games), desc="Eval vs MCTS (pool)"):
+            winner = self._get("match")
+            totals[winner] += 1
+        return {k: v / float(n_games) for k, v in totals.items()}
+
+    def close(self, force: bool = False) -> None:
+        """Stops the workers once the queued games are played, or right away if force."""
+        for p in self.procs:
+            if force:
+                p.terminate()
+            else:
+                self.tasks.put(None)
+        for p in self.procs:
+            p.join(timeout=None if not force else 1.0)
+        self.procs = []
+
+
 class AlphaZeroTrainer:
     """Full AlphaZero training pipeline.
 
@@ -370,18 +645,29 @@ class AlphaZeroTrainer:
             visit_counts[action_index_1based - 1] = float(child_node.n_visits)
         return visit_counts / visit_counts.sum()
 
-    def self_play_game(self) -> list:
-        """Generate one self-play game with MCTS tree reuse between moves."""
+    def self_play_game(self, cache: EvaluationCache | None = None, *, net=None) -> list:
+        """Generate one self-play game with MCTS tree reuse between moves.
+
+        Args:
+            cache: optional evaluation cache of the searches.
+            net: optional network running the searches, e.g. a copy on another backend. Defaults to self.net.
+        """
         self.net.eval()
-        records = _run_self_play_game(self.net, self.base_env, self.config)
+        records = _run_self_play_game(net if net is not None else self.net, self.base_env, self.config, cache=cache)
         self.net.train()
         return records
 
     def self_play(self, n_games: int) -> list[dict]:
         """Generate dataset via self-play (single process)."""
         data = []
+        cache = _make_eval_cache(self.config)
+        search_net = _inference_net(self.net.eval(), self.config)
         for _ in tqdm(range(n_games), desc="Self-play"):
-            data.extend(self.self_play_game())
+            if cache is not None and not self.config["mcts"].get("share_cache", False):
+                cache.clear()
+            data.extend(self.self_play_game(cache, net=search_net))
+        if cache is not None:
+            logger.info("Evaluation cache: %s", cache.stats())
         return data
 
     def augment_data(self, data: list[dict]) -> list:
@@ -491,7 +777,7 @@ class AlphaZeroTrainer:
             game=self.config["game"],
             simulations=self.config["mcts"]["n_sims"],
             cpuct=self.config["mcts"]["cpuct"],
-            net=net,
+            net=_inference_net(net, self.config),
         )
         mcts_agent = MCTSAgent(
             simulations=self.config["mcts"]["n_sims"],
@@ -513,8 +799,6 @@ class AlphaZeroTrainer:
 
     def train_step(self, batch_records: list[dict]) -> dict:
         """One optimizer step on a batch of replay records (vectorized state processing)."""
-        self.net.train()
-
         # Vectorized state → tensor conversion
         boards = np.stack([r["state"][0] for r in batch_records])  # (B, H, W)
         players = np.array([r["state"][1] for r in batch_records])  # (B,)
@@ -522,11 +806,30 @@ class AlphaZeroTrainer:
         opponent = (boards == (1 - players)[:, None, None]).astype(np.float32)
         x = np.stack([current, opponent], axis=1)  # (B, 2, H, W)
 
-        states = torch.from_numpy(x).to(self.device)
-        policy_targets_tensor = torch.from_numpy(np.stack([r["policy_target"] for r in batch_records])).to(self.device)
-        value_targets_tensor = torch.tensor(
-            [r["value_target"] for r in batch_records], dtype=torch.float32, device=self.device
-        ).unsqueeze(1)
+        policy_targets = np.stack([r["policy_target"] for r in batch_records]).astype(np.float32)
+        value_targets = np.array([r["value_target"] for r in batch_records], dtype=np.float32)[:, None]
+        return self.train_step_arrays(x, policy_targets, value_targets)
+
+    def train_step_arrays(self, x: np.ndarray, policy_targets: np.ndarray, value_targets: np.ndarray) -> dict:
+        """One optimizer step on a batch given as arrays, as returned by ReplayBuffer.sample.
+
+        Args:
+            x: network input planes (B, 2, H, W) float32.
+            policy_targets: (B, n_actions) float32.
+            value_targets: (B, 1) float32.
+        """
+        return self.train_step_tensors(
+            torch.from_numpy(x), torch.from_numpy(policy_targets), torch.from_numpy(value_targets)
+        )
+
+    def train_step_tensors(self, x: torch.Tensor, policy_targets: torch.Tensor, value_targets: torch.Tensor) -> dict:
+        """One optimizer step on a batch of CPU tensors, as produced by BatchPrefetcher. See train_step_arrays."""
+        self.net.train()
+
+        # pinned tensors are copied asynchronously to the GPU
+        states = x.to(self.device, non_blocking=True)
+        policy_targets_tensor = policy_targets.to(self.device, non_blocking=True)
+        value_targets_tensor = value_targets.to(self.device, non_blocking=True)
 
         policy_logits, value_predictions = self.net(states)
 
@@ -546,7 +849,11 @@ class AlphaZeroTrainer:
         }
 
     def self_play_parallel(self, n_games: int, num_workers: int, seed: int | None = None) -> list[dict]:
-        """Generate dataset via self-play using multiprocessing (CPU)."""
+        """Generate dataset via self-play using multiprocessing (CPU).
+
+        With training.inference_server the workers only run the searches: their leaves are evaluated in
+        large coalesced batches by a single InferenceServer process, on the trainer device.
+        """
         n_games = int(n_games)
         num_workers = max(1, int(num_workers))
         if n_games <= 0:
@@ -562,6 +869,19 @@ class AlphaZeroTrainer:
         worker_games = [g for g in worker_games if g > 0]
         num_workers = len(worker_games)
 
+        server = None
+        if self.config["training"].get("inference_server", False):
+            _check_inference_server(self.config)
+            server = InferenceServer(
+                self.config["network"],
+                net_state_dict,
+                n_clients=num_workers,
+                slot_size=max(1, int(self.config["mcts"].get("batch_size", 1))),
+                max_wait_ms=float(self.config["training"].get("inference_max_wait_ms", 1.0)),
+                device=self.device,
+            )
+            server.start()
+
         out_q: mp.SimpleQueue = mp.SimpleQueue()
         procs: list[mp.Process] = []
 
@@ -569,6 +889,7 @@ class AlphaZeroTrainer:
             p = mp.Process(
                 target=_self_play_worker,
                 args=(wid, ng, self.base_env, self.config, "cpu", net_state_dict, out_q, num_workers, seed),
+                kwargs={"inference_client": server.client(wid) if server is not None else None},
             )
             p.daemon = False
             p.start()
@@ -583,12 +904,23 @@ class AlphaZeroTrainer:
                         p.terminate()
                 for p in procs:
                     p.join(timeout=1.0)
+                if server is not None:
+                    server.terminate()
                 raise RuntimeError(f"Self-play worker {wid} failed:\n{payload}")
             collected.extend(payload)
 
         for p in procs:
             p.join()
 
+        if server is not None:
+            stats = server.stop()
+            logger.info(
+                "Inference server: %d batches, avg batch size %.1f, avg queue wait %.2f ms",
+                stats["batches"],
+                stats["avg_batch_size"],
+                stats["avg_queue_wait_ms"],
+            )
+
         return collected
 
     def test_vs_mcts_parallel(self, n_games: int, num_workers: int = 4, seed: int | None = 5678):
@@ -642,6 +974,52 @@ class AlphaZeroTrainer:
 
         return {k: v / float(n_games) for k, v in totals.items()}
 
+    @property
+    def _augment_on_sample(self) -> bool:
+        """Whether the replay buffer stores canonical positions, augmented when sampled.
+
+        Set by training.augment_on_sample, and implied by training.dedup_positions for games with symmetries.
+        """
+        training = self.config["training"]
+        dedup = training.get("dedup_positions", False) and getattr(self.base_env, "simmetries", None) is not None
+        return training.get("augment_on_sample", False) or dedup
+
+    def _make_replay_buffer(self, buffer_size: int) -> ReplayBuffer:
+        """Replay buffer sized for the network of the config.
+
+        With training.persistent_buffer it is memory-mapped in save_dir/replay_buffer, and reopened with its
+        content when training is resumed from the same directory. With training.dedup_positions repeated
+        positions are merged into one entry with averaged targets.
+        """
+        network = self.config["network"]
+        directory = self.save_dir / "replay_buffer" if self.config["training"].get("persistent_buffer", False) else None
+        return ReplayBuffer(
+            buffer_size,
+            tuple(network["input_size"][1:]),
+            network["policy_output_size"],
+            directory=directory,
+            simmetries=getattr(self.base_env, "simmetries", None),
+            canonical=self._augment_on_sample,
+            dedup=self.config["training"].get("dedup_positions", False),
+        )
+
+    def _batch_prefetcher(
+        self, replay_buffer: ReplayBuffer, batch_size: int, n_batches: int | None = None
+    ) -> BatchPrefetcher:
+        """Training batches of the replay buffer, prepared ahead by a background thread.
+
+        training.prefetch_batches sets how many batches are kept ready (0 to sample on the training thread),
+        with sample-time augmentation each sampled position gets a random symmetry.
+        """
+        return BatchPrefetcher(
+            replay_buffer,
+            batch_size,
+            n_batches,
+            queue_size=int(self.config["training"].get("prefetch_batches", 0)),
+            augment=self._augment_on_sample,
+            pin_memory=str(self.device).startswith("cuda"),
+        )
+
     def train(self, start_iteration: int = 0):
         """Full AlphaZero training loop.
 
@@ -649,19 +1027,33 @@ class AlphaZeroTrainer:
             start_iteration: Iteration index to resume from (0-based). Iterations before
                 this value are skipped; their metrics are expected to already be in self.metrics.
         """
+        _check_inference_server(self.config)
+        if self.config["training"].get("async_mode", False):
+            self.train_async(start_iteration=start_iteration)
+            return
+
         iterations = int(self.config["training"]["iterations"])
         buffer_size = int(self.config["training"]["buffer_size"])
         games_per_iteration = int(self.config["training"]["games_per_iteration"])
         batch_size = int(self.config["training"]["batch_size"])
         training_steps_per_iteration = int(self.config["training"].get("training_steps_per_iteration", 0))
+        augment_on_sample = self._augment_on_sample
 
-        replay_buffer: deque[dict] = deque(maxlen=buffer_size)
+        replay_buffer = self._make_replay_buffer(buffer_size)
 
         num_self_play_workers = int(self.config["training"].get("n_play_workers", max(1, (os.cpu_count() or 2) // 2)))
         num_eval_workers = int(self.config["eval"].get("n_workers", max(1, (os.cpu_count() or 2) // 2)))
 
         if start_iteration > 0:
-            logger.info("Resuming from iteration %d (replay buffer starts empty).", start_iteration + 1)
+            logger.info(
+                "Resuming from iteration %d (replay buffer starts with %d positions).",
+                start_iteration + 1,
+                len(replay_buffer),
+            )
+
+        pool = None
+        if self.config["training"].get("persistent_workers", False) and num_self_play_workers > 1:
+            pool = SelfPlayPool(self.base_env, self.config, self.net, num_self_play_workers)
 
         for iteration_index in range(start_iteration, iterations):
             logger.info("========== Iteration %d/%d ==========", iteration_index + 1, iterations)
@@ -669,15 +1061,21 @@ class AlphaZeroTrainer:
             # -------------------
             # Self-play collection
             # -------------------
-            if num_self_play_workers > 1 and games_per_iteration > 1:
+            if pool is not None:
+                new_records = pool.self_play(games_per_iteration)
+            elif num_self_play_workers > 1 and games_per_iteration > 1:
                 new_records = self.self_play_parallel(games_per_iteration, num_workers=num_self_play_workers)
             else:
-                new_records = []
-                for _ in tqdm(range(games_per_iteration), desc="Self-play"):
-                    new_records.extend(self.self_play_game())
+                new_records = self.self_play(games_per_iteration)
 
-            new_records = self.augment_data(new_records)
+            if not augment_on_sample:
+                new_records = self.augment_data(new_records)
             replay_buffer.extend(new_records)
+            replay_buffer.flush()
+            if replay_buffer.dedup:
+                logger.info(
+                    "Replay buffer: %d distinct positions, %d merged so far.", len(replay_buffer), replay_buffer.merged
+                )
 
             if len(replay_buffer) < batch_size:
                 logger.info("Not enough samples to train yet (need %d).", batch_size)
@@ -692,19 +1090,17 @@ class AlphaZeroTrainer:
                 else max(1, len(replay_buffer) // batch_size)
             )
 
-            # Snapshot buffer once to avoid repeated O(N) deque→list conversion
-            buffer_list = list(replay_buffer)
-
             losses_total = []
             losses_policy = []
             losses_value = []
 
-            for _ in tqdm(range(steps), desc="Training"):
-                batch_records = random.sample(buffer_list, batch_size)
-                loss_dict = self.train_step(batch_records)
-                losses_total.append(loss_dict["total_loss"])
-                losses_policy.append(loss_dict["policy_loss"])
-                losses_value.append(loss_dict["value_loss"])
+            with self._batch_prefetcher(replay_buffer, batch_size, n_batches=steps) as batches:
+                for batch in tqdm(batches, total=steps, desc="Training"):
+                    loss_dict = self.train_step_tensors(*batch)
+                    losses_total.append(loss_dict["total_loss"])
+                    losses_policy.append(loss_dict["policy_loss"])
+                    losses_value.append(loss_dict["value_loss"])
+            logger.info("Waited %.2f s for training batches over %d steps.", batches.wait_time, steps)
 
             avg_total = float(np.mean(losses_total))
             avg_policy = float(np.mean(losses_policy))
@@ -712,6 +1108,9 @@ class AlphaZeroTrainer:
 
             logger.info("Avg loss: total=%.4f policy=%.4f value=%.4f", avg_total, avg_policy, avg_value)
 
+            if pool is not None:
+                pool.publish(self.net)
+
             # -------------------
             # Checkpoint
             # -------------------
@@ -727,7 +1126,9 @@ class AlphaZeroTrainer:
                 )
 
             if self.config["eval"]["play_vs_mcts"]:
-                if num_eval_workers > 1 and int(self.config["eval"]["n_matches"]) > 1:
+                if pool is not None:
+                    match_metrics = pool.play_vs_mcts(self.config["eval"]["n_matches"])
+                elif num_eval_workers > 1 and int(self.config["eval"]["n_matches"]) > 1:
                     match_metrics = self.test_vs_mcts_parallel(
                         self.config["eval"]["n_matches"], num_workers=num_eval_workers
                     )
@@ -748,11 +1149,190 @@ class AlphaZeroTrainer:
                     "avg_value_loss": float(avg_value),
                     "match_metrics": match_metrics,
                     "validation_metrics": valid_metrics,
+                    "data_wait_s": batches.wait_time,
                 }
             )
             self.save_metrics()
             self.save_plot_metrics()
 
+        if pool is not None:
+            pool.close()
+
+    def train_async(self, start_iteration: int = 0):
+        """Asynchronous actor-learner training loop.
+
+        Self-play actors (a SelfPlayPool) keep playing games with the latest published weights while the
+        learner trains on the replay buffer. The learner draws at most sample_to_insert_ratio samples per
+        position inserted in the buffer, and waits for new games when it is ahead. Weights are published
+        to the actors every publish_interval_steps training steps.
+
+        An iteration ends every games_per_iteration games: the model is checkpointed and validated as in
+        train(), while the matches vs MCTS are played by a separate process on a snapshot of the weights.
+        Their rates are added to the metrics of that iteration when they arrive.
+
+        Args:
+            start_iteration: Iteration index to resume from (0-based).
+        """
+        iterations = int(self.config["training"]["iterations"])
+        buffer_size = int(self.config["training"]["buffer_size"])
+        games_per_iteration = int(self.config["training"]["games_per_iteration"])
+        batch_size = int(self.config["training"]["batch_size"])
+        sample_to_insert_ratio = float(self.config["training"].get("sample_to_insert_ratio", 4.0))
+        publish_interval = int(self.config["training"].get("publish_interval_steps", 50))
+        augment_on_sample = self._augment_on_sample
+        num_workers = int(self.config["training"].get("n_play_workers", max(1, (os.cpu_count() or 2) // 2)))
+
+        replay_buffer = self._make_replay_buffer(buffer_size)
+        inserted = 0
+        consumed = 0
+        evaluation = None
+        # started once the buffer holds a batch
+        batches = None
+
+        pool = SelfPlayPool(self.base_env, self.config, self.net, num_workers)
+        # keep every actor busy while the learner collects the finished games
+        pool.submit_self_play(2 * num_workers)
+
+        for iteration_index in range(start_iteration, iterations):
+            logger.info("========== Iteration %d/%d (async) ==========", iteration_index + 1, iterations)
+            started = time.perf_counter()
+            games = 0
+            positions = 0
+            steps = 0
+            wait_time = batches.wait_time if batches is not None else 0.0
+            losses = {"total_loss": [], "policy_loss": [], "value_loss": []}
+
+            with tqdm(total=games_per_iteration, desc="Async self-play") as pbar:
+                while games < games_per_iteration:
+                    can_train = (
+                        len(replay_buffer) >= batch_size and consumed + batch_size <= sample_to_insert_ratio * inserted
+                    )
+                    finished = pool.poll_self_play(block=not can_train)
+                    if finished:
+                        pool.submit_self_play(len(finished))
+                        for game_records in finished:
+                            records = game_records if augment_on_sample else self.augment_data(game_records)
+                            replay_buffer.extend(records)
+                            inserted += len(records)
+                            positions += len(records)
+                        games += len(finished)
+                        pbar.update(len(finished))
+                        continue
+
+                    if batches is None:
+                        batches = self._batch_prefetcher(replay_buffer, batch_size).__enter__()
+                    loss_dict = self.train_step_tensors(*batches.get())
+                    for key, value in loss_dict.items():
+                        losses[key].append(value)
+                    consumed += batch_size
+                    steps += 1
+                    if steps % publish_interval == 0:
+                        pool.publish(self.net)
+
+            pool.publish(self.net)
+            replay_buffer.flush()
+            if replay_buffer.dedup:
+                logger.info(
+                    "Replay buffer: %d distinct positions, %d merged so far.", len(replay_buffer), replay_buffer.merged
+                )
+            elapsed = time.perf_counter() - started
+            generated_per_s = positions / elapsed
+            consumed_per_s = steps * batch_size / elapsed
+            avg_total, avg_policy, avg_value = (
+                float(np.mean(losses[key])) if losses[key] else math.nan
+                for key in ("total_loss", "policy_loss", "value_loss")
+            )
+            logger.info("Avg loss: total=%.4f policy=%.4f value=%.4f", avg_total, avg_policy, avg_value)
+            data_wait = (batches.wait_time if batches is not None else 0.0) - wait_time
+            logger.info(
+                "Throughput: generated %.1f positions/s, consumed %.1f samples/s (%d steps, %.2f s waiting for data)",
+                generated_per_s,
+                consumed_per_s,
+                steps,
+                data_wait,
+            )
+
+            self.save_model(f"checkpoint_iter_{iteration_index + 1}.pt")
+
+            valid_metrics = None
+            if self.config["eval"]["run_eval"]:
+                valid_metrics = self.validate(
+                    jsonl_path=Path(__file__).parent / self.config["eval"]["eval_dataset"], draw_band=0.1
+                )
+
+            evaluation = self._collect_async_evaluation(evaluation, wait=False)
+            if self.config["eval"]["play_vs_mcts"]:
+                if evaluation is None:
+                    evaluation = self._start_async_evaluation(len(self.metrics["iterations"]))
+                else:
+                    logger.info("Previous evaluation still running, iteration %d is not played.", iteration_index + 1)
+
+            self.metrics["iterations"].append(
+                {
+                    "iteration": iteration_index + 1,
+                    "replay_buffer_size": len(replay_buffer),
+                    "avg_total_loss": avg_total,
+                    "avg_policy_loss": avg_policy,
+                    "avg_value_loss": avg_value,
+                    "match_metrics": {},
+                    "validation_metrics": valid_metrics,
+                    "generated_per_s": generated_per_s,
+                    "consumed_per_s": consumed_per_s,
+                    "data_wait_s": data_wait,
+                }
+            )
+            self.save_metrics()
+            self.save_plot_metrics()
+
+        pool.close(force=True)
+        if batches is not None:
+            batches.close()
+        self._collect_async_evaluation(evaluation, wait=True)
+
+    def _start_async_evaluation(self, metrics_index: int) -> tuple:
+        """Starts the matches vs MCTS of a snapshot of the weights in a separate process."""
+        net_state_dict = {k: v.detach().cpu().clone() for k, v in self.net.state_dict().items()}
+        out_q: mp.SimpleQueue = mp.SimpleQueue()
+        n_matches = int(self.config["eval"]["n_matches"])
+        p = mp.Process(
+            target=_eval_worker,
+            args=(0, n_matches, self.base_env, self.config, "cpu", net_state_dict, out_q, 1, None),
+        )
+        p.daemon = True
+        p.start()
+        return metrics_index, p, out_q
+
+    def _collect_async_evaluation(self, evaluation: tuple | None, wait: bool) -> tuple | None:
+        """Stores the rates of a finished evaluation in its iteration metrics.
+
+        Returns:
+            the evaluation if it is still running (and wait is False), else None.
+
+        Raises:
+            RuntimeError: if the evaluation process exited without posting its result.
+        """
+        if evaluation is None:
+            return None
+        metrics_index, p, out_q = evaluation
+        while out_q.empty():
+            if not p.is_alive() and out_q.empty():
+                raise RuntimeError(f"Evaluation vs MCTS process exited with code {p.exitcode} without a result.")
+            if not wait:
+                return evaluation
+            p.join(timeout=0.1)
+        status, _, payload = out_q.get()
+        p.join()
+        if status != "ok":
+            logger.warning(f"Evaluation vs MCTS failed: {payload}")
+            return None
+        n_matches = int(self.config["eval"]["n_matches"])
+        self.metrics["iterations"][metrics_index]["match_metrics"] = {
+            k: v / float(n_matches) for k, v in payload.items()
+        }
+        self.save_metrics()
+        self.save_plot_metrics()
+        return None
+
 
 def _make_env(game: str) -> GenericEnv:
     """Instantiate a game environment by name."""
@@ -0,0 +1,76 @@
+"""Static position evaluators for depth-limited search.
+
+An evaluator is a callable taking an env and returning a value in (-1, 1) from the point of view of the
+player to move, like the value head of the networks.
+"""
+
+import math
+from functools import cache
+
+import numpy as np
+
+from giotto.envs.batch_generic import winning_lines
+from giotto.envs.generic import GenericEnv
+
+
+@cache
+def _line_incidence(rows: int, cols: int, connect: int) -> np.ndarray:
+    """(n_lines, rows * cols) matrix with a 1 where a cell belongs to a line, to count pieces per line."""
+    lines = winning_lines(rows, cols, connect)
+    incidence = np.zeros((len(lines), rows * cols), dtype=np.float32)
+    if len(lines):
+        incidence[np.arange(len(lines))[:, None], lines] = 1.0
+    return incidence
+
+
+class WindowEvaluator:
+    """Threat/window-count heuristic for connect-k games (Connect4, Tris).
+
+    Every line of `env.connect` cells that contains pieces of a single player is an open window for that
+    player, worth more the more pieces it already holds. The score is the difference between the windows
+    of the player to move and those of the opponent, squashed in (-1, 1).
+    """
+
+    def __init__(self, base: float = 4.0, scale: float = 32.0):
+        """Instantiates evaluator.
+
+        Args:
+            base: a window with n pieces is worth base ** (n - 1).
+            scale: score giving a value of tanh(1) ~ 0.76.
+        """
+        self.base = base
+        self.scale = scale
+
+    def _weights(self, connect: int) -> np.ndarray:
+        """Value of a window by number of pieces in it."""
+        return np.array([0.0] + [self.base**n for n in range(connect)])
+
+    def __call__(self, env: GenericEnv) -> float:
+        """Evaluates env for the player to move."""
+        incidence = _line_incidence(env.rows, env.cols, env.connect)
+        weights = self._weights(env.connect)
+
+        board = env.board.ravel()
+        player = env.current_player
+        mine = (incidence @ (board == player)).astype(np.intp)
+        theirs = (incidence @ (board == 1 - player)).astype(np.intp)
+        score = weights[mine[theirs == 0]].sum() - weights[theirs[mine == 0]].sum()
+        return math.tanh(score / self.scale)
+
+
+class ValueNetEvaluator:
+    """Uses the value head of an AlphaZero network (torch or numpy) as static evaluator."""
+
+    def __init__(self, net):
+        """Instantiates evaluator.
+
+        Args:
+            net: AlphaZeroNet or AlphaZeroNetNumpy, already loaded and in eval mode.
+        """
+        self.net = net
+
+    def __call__(self, env: GenericEnv) -> float:
+        """Evaluates env for the player to move."""
+        _, value = self.net.predict(env.get_state())
+        # keep values strictly inside (-1, 1), proven wins and losses score beyond that
+        return float(np.clip(value, -0.999, 0.999))
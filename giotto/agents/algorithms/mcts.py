@@ -3,6 +3,9 @@ from __future__ import annotations
 import math
 import random
 
+import numpy as np
+
+from giotto.envs.batch_generic import BatchGenericEnv
 from giotto.envs.generic import GenericEnv
 
 # try except block to make it work in browser mode
@@ -31,12 +34,11 @@ class MCTSNode:
         """Instantiates MCTS node.
 
         Args:
-            env: environment at this node.
+            env: environment at this node, only read to list the untried actions (not stored).
             parent: parent node.
             parent_action: action taken to reach this node from parent.
             player_just_moved: index of player who made the move leading to this node.
         """
-        self.env = env
         self.parent = parent
         self.parent_action = parent_action
 
@@ -94,6 +96,7 @@ class MCTS:
         n_simulations: int = 1000,
         cpuct: float = 1.4,
         valuenet: ValueNet | None = None,
+        n_rollouts: int = 1,
     ):
         """Instantiates MCTS class.
 
@@ -101,31 +104,37 @@ class MCTS:
             n_simulations: number of simulations to run per move.
             cpuct: exploration constant.
             valuenet: value network for node evaluation. If None, rollouts are used.
+            n_rollouts: random playouts per leaf. More than one are played in lockstep on a batch env
+                and their results averaged.
         """
         self.n_simulations = n_simulations
         self.cpuct = cpuct
         self.valuenet = valuenet
+        self.n_rollouts = n_rollouts
+        self._batch_env: BatchGenericEnv | None = None
 
     def run(self, env: GenericEnv):
         """Runs MCTS to select action."""
         root_player = env.current_player
 
-        root_env = env.clone()
+        # single env walked down the tree with step() and back to the root with undo()
+        sim_env = env.clone()
         root = MCTSNode(
-            root_env,
+            sim_env,
             parent=None,
             parent_action=None,
-            player_just_moved=1 - root_env.current_player,
+            player_just_moved=1 - sim_env.current_player,
         )
 
         for _ in range(self.n_simulations):
             node = root
-            sim_env = env.clone()
+            depth = 0
 
             # SELECTION
             while not sim_env.done and node.is_fully_expanded() and node.children:
                 action, node = node.best_child(self.cpuct)
                 sim_env.step(action)
+                depth += 1
 
             # EXPANSION
             if not sim_env.done and node.untried_actions:
@@ -135,9 +144,10 @@ class MCTS:
                 # must update who just moved before step because current_player isn't updated by env after terminal move
                 player_just_moved = sim_env.current_player
                 sim_env.step(action)
+                depth += 1
 
                 child = MCTSNode(
-                    sim_env.clone(),
+                    sim_env,
                     parent=node,
                     parent_action=action,
                     player_just_moved=player_just_moved,
@@ -156,6 +166,10 @@ class MCTS:
             # BACKPROPAGATION
             self.backpropagate(node, result, root_player)
 
+            # back to the root position
+            for _ in range(depth):
+                sim_env.undo()
+
         # # visualize
         # for parentaction, child in root.children.items():
         #     print(f"action {parentaction}: avg value {child.avg_value} visits {child.total_visits}")
@@ -182,11 +196,31 @@ class MCTS:
             return -1
 
     def rollout(self, env: GenericEnv, root_player: int):
-        """Random playout until terminal state."""
+        """Random playout until terminal state. The env is restored to its starting position before returning."""
+        if self.n_rollouts > 1 and not env.done:
+            return self.batch_rollout(env, root_player)
+        n_moves = 0
         while not env.done:
             env.step(random.choice(env.get_valid_actions()))
-
-        return self.terminal_node_eval(env, root_player)
+            n_moves += 1
+
+        result = self.terminal_node_eval(env, root_player)
+        for _ in range(n_moves):
+            env.undo()
+        return result
+
+    def batch_rollout(self, env: GenericEnv, root_player: int) -> float:
+        """Plays n_rollouts random playouts from the env position in lockstep, averaged for root_player."""
+        if self._batch_env is None:
+            self._batch_env = env.batch_env(self.n_rollouts, auto_reset=False)
+        batch = self._batch_env
+        batch.set_position(env.board, env.current_player)
+        while not batch.done.all():
+            batch.step(batch.random_actions())
+
+        wins = np.count_nonzero(batch.winner == root_player)
+        losses = np.count_nonzero(batch.winner == 1 - root_player)
+        return (wins - losses) / self.n_rollouts
 
     def valuenet_eval(self, env: GenericEnv, root_player: int):
         """Value network evaluation of current state."""
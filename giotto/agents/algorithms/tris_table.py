@@ -0,0 +1,167 @@
+"""Perfect-play table of tic tac toe.
+
+Every reachable TrisEnv position is solved once and stored in flat arrays indexed by
+``code * 2 + player_to_move``, where code is the base-3 number of the board (digit = cell value + 1,
+cell 0 is the least significant digit). For every position the table holds:
+
+- value: game theoretical result for the player to move (1 win, 0 draw, -1 loss).
+- distance: number of moves to the end of the game under perfect play, -1 for unreachable positions.
+- best_moves: bitmask of the best actions (bit a - 1 for action a), quickest wins and slowest losses.
+
+Scores follow MinimaxAgent: a position won in k moves scores 10 - k for the player to move.
+
+Example command to write the table:
+python ./giotto/agents/algorithms/tris_table.py
+"""  # noqa: D415
+
+from __future__ import annotations
+
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from giotto.envs.batch_generic import winning_lines
+from giotto.envs.generic import GenericEnv
+
+N_CELLS = 9
+WIN_SCORE = N_CELLS + 1
+TABLE_SIZE = 3**N_CELLS * 2
+DEFAULT_TABLE_PATH = Path(__file__).parents[2] / "agents" / "models" / "tris" / "perfect_play.npz"
+
+_POWERS = 3 ** np.arange(N_CELLS)
+
+
+def _shrink(score: int) -> int:
+    """Moves a win (or loss) score one step towards 0, as MinimaxAgent does."""
+    return score - 1 if score > 0 else score + 1 if score < 0 else 0
+
+
+class TrisTable:
+    """O(1) lookup of perfect play for tic tac toe."""
+
+    def __init__(self, value: np.ndarray, distance: np.ndarray, best_moves: np.ndarray):
+        """Instantiates table from its arrays, see build()."""
+        self.value = value
+        self.distance = distance
+        self.best_moves_mask = best_moves
+
+    @classmethod
+    def build(cls) -> TrisTable:
+        """Enumerates and solves every reachable position, with both starting players."""
+        value = np.zeros(TABLE_SIZE, dtype=np.int8)
+        distance = np.full(TABLE_SIZE, fill_value=-1, dtype=np.int8)
+        best_moves = np.zeros(TABLE_SIZE, dtype=np.uint16)
+
+        lines = winning_lines(3, 3, 3).tolist()
+        cell_lines = [[line for line in lines if cell in line] for cell in range(N_CELLS)]
+        powers = _POWERS.tolist()
+        board = [-1] * N_CELLS
+
+        def store(index: int, score: int, moves: int, turn: int):
+            value[index] = (score > 0) - (score < 0)
+            distance[index] = WIN_SCORE - abs(score) if score else N_CELLS - turn
+            best_moves[index] = moves
+
+        def solve(code: int, player: int, turn: int) -> int:
+            """Negamax score of a non terminal position, for the player to move."""
+            index = code * 2 + player
+            if distance[index] >= 0:
+                return int(value[index]) * (WIN_SCORE - int(distance[index])) if value[index] else 0
+
+            scores = {}
+            for cell in range(N_CELLS):
+                if board[cell] != -1:
+                    continue
+                board[cell] = player
+                child_code = code + (player + 1) * powers[cell]
+                child_index = child_code * 2 + 1 - player
+                if any(all(board[c] == player for c in line) for line in cell_lines[cell]):
+                    child_score = -WIN_SCORE
+                    store(child_index, child_score, 0, turn + 1)
+                elif turn + 1 == N_CELLS:
+                    child_score = 0
+                    store(child_index, child_score, 0, turn + 1)
+                else:
+                    child_score = solve(child_code, 1 - player, turn + 1)
+                board[cell] = -1
+                scores[cell] = _shrink(-child_score)
+
+            score = max(scores.values())
+            store(index, score, sum(1 << cell for cell, s in scores.items() if s == score), turn)
+            return score
+
+        for starting_player in (0, 1):
+            solve(0, starting_player, 0)
+
+        return cls(value, distance, best_moves)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_TABLE_PATH) -> TrisTable:
+        """Loads table saved with save()."""
+        data = np.load(path)
+        return cls(data["value"], data["distance"], data["best_moves"])
+
+    def save(self, path: str | Path = DEFAULT_TABLE_PATH):
+        """Saves table as compressed .npz (a few KB)."""
+        np.savez_compressed(path, value=self.value, distance=self.distance, best_moves=self.best_moves_mask)
+
+    @staticmethod
+    def supports(env: GenericEnv) -> bool:
+        """Whether env is a tic tac toe game the table can answer for."""
+        return env.rows == 3 and env.cols == 3 and getattr(env, "connect", None) == 3
+
+    @staticmethod
+    def index(board: np.ndarray, player: int) -> int:
+        """Table index of a position."""
+        return int(np.dot(np.asarray(board).ravel() + 1, _POWERS)) * 2 + int(player)
+
+    def _checked_index(self, env: GenericEnv) -> int:
+        index = self.index(env.board, env.current_player)
+        if self.distance[index] < 0:
+            raise ValueError("Position not reachable in tic tac toe.")
+        return index
+
+    def lookup(self, env: GenericEnv) -> tuple[int, int, list[int]]:
+        """Returns value, distance to the end and best actions of env, for the player to move."""
+        index = self._checked_index(env)
+        mask = int(self.best_moves_mask[index])
+        best_moves = [a for a in range(1, N_CELLS + 1) if mask >> (a - 1) & 1]
+        return int(self.value[index]), int(self.distance[index]), best_moves
+
+    def score(self, env: GenericEnv) -> int:
+        """Negamax score of env for the player to move, like MinimaxAgent."""
+        index = self._checked_index(env)
+        return int(self.value[index]) * (WIN_SCORE - int(self.distance[index]))
+
+    def best_moves(self, env: GenericEnv) -> list[int]:
+        """Best actions of env: quickest wins, slowest losses."""
+        return self.lookup(env)[2]
+
+    def move_scores(self, env: GenericEnv) -> dict:
+        """Scores of all valid actions for the player to move, as MinimaxAgent.evaluate_all_moves."""
+        self._checked_index(env)
+        board = np.asarray(env.board).ravel()
+        player = env.current_player
+        code = int(np.dot(board + 1, _POWERS))
+        scores = {}
+        for action in env.get_valid_actions():
+            child_index = (code + (player + 1) * int(_POWERS[action - 1])) * 2 + 1 - player
+            scores[action] = -int(self.value[child_index]) * (WIN_SCORE - int(self.distance[child_index]))
+        return scores
+
+
+@cache
+def load_tris_table(path: str | Path = DEFAULT_TABLE_PATH) -> TrisTable:
+    """Returns the shared table, loaded from path or built in memory (~0.1s) if the file is not available."""
+    try:
+        return TrisTable.load(path)
+    except (OSError, ValueError, KeyError):
+        return TrisTable.build()
+
+
+if __name__ == "__main__":
+    table = TrisTable.build()
+    table.save()
+    reachable = int((table.distance >= 0).sum())
+    print(f"Saved {reachable} reachable positions to {DEFAULT_TABLE_PATH}")
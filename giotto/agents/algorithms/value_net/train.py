@@ -1,12 +1,16 @@
 import json
+import math
 import os
 import random
+import time
+import traceback
 from collections import deque
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
 import torch
+import torch.multiprocessing as mp
 import torch.nn.functional as F
 from tqdm import tqdm
 
@@ -18,6 +22,35 @@ from giotto.envs.generic import GenericEnv
 from giotto.utils.simmetries import EquivalentBoards
 
 
+def _self_play_worker(
+    worker_id: int,
+    n_games: int,
+    base_env: GenericEnv,
+    net_state_dict: dict,
+    out_queue: mp.SimpleQueue,
+    *,
+    mcts_sims: int,
+    num_processes: int,
+    seed: int | None = None,
+) -> None:
+    """Worker that plays self-play games with its own copy of the network and pushes them to out_queue."""
+    try:
+        # one share of the CPUs per process, to avoid oversubscription
+        torch.set_num_threads(max(1, math.floor((os.cpu_count() or 1) / num_processes)))
+        # forked workers inherit the parent generators: reseed them so that they play different games
+        worker_seed = seed + worker_id if seed is not None else None
+        random.seed(worker_seed)
+        np.random.seed(worker_seed)
+        if worker_seed is not None:
+            torch.manual_seed(worker_seed)
+
+        trainer = ValueNetTrainer(base_env)
+        trainer.net.load_state_dict(net_state_dict)
+        out_queue.put(("ok", worker_id, trainer.self_play(n_games, mcts_sims)))
+    except Exception as e:
+        out_queue.put(("err", worker_id, f"{e}\n{traceback.format_exc()}"))
+
+
 class ValueNetTrainer:
     """Trainer for Value Network."""
 
@@ -63,6 +96,43 @@ class ValueNetTrainer:
             games.extend(new_memory)
         return games
 
+    def self_play_parallel(self, n_games: int, mcts_sims: int, num_workers: int, seed: int | None = None) -> list:
+        """Generate self-play games using the current value network, split over num_workers processes."""
+        num_workers = max(1, min(int(num_workers), n_games))
+        if num_workers == 1:
+            return self.self_play(n_games, mcts_sims)
+
+        # snapshot weights once, workers load their own copy
+        net_state_dict = {k: v.detach().cpu() for k, v in self.net.state_dict().items()}
+        worker_games = [n_games // num_workers + (1 if i < n_games % num_workers else 0) for i in range(num_workers)]
+
+        out_q: mp.SimpleQueue = mp.SimpleQueue()
+        procs = []
+        for wid, ng in enumerate(worker_games):
+            p = mp.Process(
+                target=_self_play_worker,
+                args=(wid, ng, self.base_env, net_state_dict, out_q),
+                kwargs={"mcts_sims": mcts_sims, "num_processes": num_workers, "seed": seed},
+            )
+            p.start()
+            procs.append(p)
+
+        games = []
+        for _ in range(num_workers):
+            status, wid, payload = out_q.get()
+            if status != "ok":
+                for p in procs:
+                    if p.is_alive():
+                        p.terminate()
+                for p in procs:
+                    p.join(timeout=1.0)
+                raise RuntimeError(f"Self-play worker {wid} failed:\n{payload}")
+            games.extend(payload)
+
+        for p in procs:
+            p.join()
+        return games
+
     def augment_games(self, games: list) -> list:
         """Augment games using symmetries if available."""
         if hasattr(self.base_env, "simmetries") and isinstance(self.base_env.simmetries, EquivalentBoards):
@@ -75,6 +145,27 @@ class ValueNetTrainer:
         else:
             return games
 
+    def canonical_games(self, games: list) -> list:
+        """Keeps each position once, in its canonical orientation (the smallest of its equivalent boards)."""
+        simmetries = getattr(self.base_env, "simmetries", None)
+        if not isinstance(simmetries, EquivalentBoards) or not games:
+            return games
+        boards = np.stack([board for (board, _), _ in games])
+        canonical = simmetries.transform(boards, simmetries.canonical_transforms(boards))
+        return [((board, player_id), result) for board, ((_, player_id), result) in zip(canonical, games, strict=True)]
+
+    def random_symmetry(self, games: list) -> list:
+        """Applies a random symmetry transform to each position, with one gather over the whole batch."""
+        simmetries = getattr(self.base_env, "simmetries", None)
+        if not isinstance(simmetries, EquivalentBoards) or not games:
+            return games
+        boards = np.stack([board for (board, _), _ in games])
+        transform_ids = np.random.randint(len(simmetries.transforms()), size=len(games))
+        transformed = simmetries.transform(boards, transform_ids)
+        return [
+            ((board, player_id), result) for board, ((_, player_id), result) in zip(transformed, games, strict=True)
+        ]
+
     def train(
         self,
         epochs: int,
@@ -83,37 +174,52 @@ class ValueNetTrainer:
         batch_size: int,
         mcts_sims: int,
         buffer_length: int,
+        *,
+        augment_on_sample: bool = False,
+        num_workers: int = 1,
     ):
-        """Train the value network."""
+        """Train the value network.
+
+        With augment_on_sample the replay buffer stores canonical positions only and each sampled
+        position gets a random symmetry, instead of storing all the equivalent boards. With num_workers > 1
+        self-play games are played in parallel processes.
+        """
         self.net.train()
         train_losses = []
         replay_buffer = deque(maxlen=buffer_length)
 
         for epoch in range(epochs):
-            new_games = self.self_play(games_per_epoch, mcts_sims)
-            augmented = self.augment_games(new_games)
-            replay_buffer.extend(augmented)
+            started = time.perf_counter()
+            new_games = self.self_play_parallel(games_per_epoch, mcts_sims, num_workers)
+            self_play_time = time.perf_counter() - started
+            if augment_on_sample:
+                replay_buffer.extend(self.canonical_games(new_games))
+            else:
+                replay_buffer.extend(self.augment_games(new_games))
 
+            started = time.perf_counter()
+            n_samples = 0
             for _ in range(steps_per_epoch):
                 batch = random.sample(replay_buffer, min(len(replay_buffer), batch_size))
+                if augment_on_sample:
+                    batch = self.random_symmetry(batch)
 
-                self.optimizer.zero_grad()
-                batch_loss = 0.0
-
-                for state, result in batch:
-                    value_input = self.net.process_state(state)
-                    pred = self.net(value_input)
-                    target = torch.tensor([[result]], dtype=torch.float32)
-
-                    loss = F.mse_loss(pred, target)
-                    batch_loss += loss
+                value_input = self.net.process_states([state for state, _ in batch])
+                target = torch.tensor([[result] for _, result in batch], dtype=torch.float32)
 
-                batch_loss = batch_loss / len(batch)
+                self.optimizer.zero_grad()
+                batch_loss = F.mse_loss(self.net(value_input), target)
                 batch_loss.backward()
                 self.optimizer.step()
 
                 train_losses.append(batch_loss.item())
-            print(f"[Train] Epoch {epoch+1}/{epochs} - MSE: {train_losses[-1]:.4f}")
+                n_samples += len(batch)
+            train_time = time.perf_counter() - started
+            print(
+                f"[Train] Epoch {epoch + 1}/{epochs} - MSE: {train_losses[-1]:.4f}"
+                f" - self-play {len(new_games) / self_play_time:.0f} positions/s"
+                f" - training {n_samples / train_time:.0f} samples/s"
+            )
 
         return train_losses
 
@@ -186,6 +292,9 @@ class ValueNetTrainer:
         mcts_sims: int,
         buffer_length: int,
         log_dir: str,
+        *,
+        augment_on_sample: bool = False,
+        num_workers: int = 1,
     ):
         """Run the training and testing process."""
         train_games = n_games
@@ -200,6 +309,8 @@ class ValueNetTrainer:
             batch_size,
             mcts_sims,
             buffer_length,
+            augment_on_sample=augment_on_sample,
+            num_workers=num_workers,
         )
         self.save_model(os.path.join(log_dir, "valuenet.pt"))
 
@@ -219,6 +330,8 @@ class ValueNetTrainer:
                 "buffer_length": buffer_length,
                 "n_games": n_games,
                 "mcts_sims": mcts_sims,
+                "augment_on_sample": augment_on_sample,
+                "num_workers": num_workers,
             },
         )
 
@@ -228,6 +341,7 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Value Net training")
     parser.add_argument("-g", "--game", help="game to play [tris, connect4]", required=True)
+    parser.add_argument("-w", "--workers", type=int, default=1, help="self-play processes (default: 1)")
     args = vars(parser.parse_args())
 
     # game
@@ -273,4 +387,5 @@ if __name__ == "__main__":
         mcts_sims=1,
         buffer_length=1000,
         log_dir=LOGS_DIR,
+        num_workers=args["workers"],
     )
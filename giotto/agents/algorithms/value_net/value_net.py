@@ -51,3 +51,12 @@ class ValueNet(nn.Module):
 
         input_array = np.stack([current, opponent], axis=0)
         return torch.from_numpy(input_array).unsqueeze(0)
+
+    @staticmethod
+    def process_states(states: list[list[np.ndarray, int]]) -> torch.tensor:
+        """Processes a batch of env states into value network input of shape (B, 2, rows, cols)."""
+        boards = np.stack([state[0] for state in states])
+        player_ids = np.array([state[1] for state in states])[:, None, None]
+
+        input_array = np.stack([boards == player_ids, boards == 1 - player_ids], axis=1).astype(np.float32)
+        return torch.from_numpy(input_array)
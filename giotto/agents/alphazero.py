@@ -17,7 +17,12 @@ except ImportError:
 
 
 class AlphaZeroAgent(GenericAgent):
-    """Selects action with AlphaZero style policy-value network and MCTS."""
+    """Selects action with AlphaZero style policy-value network and MCTS.
+
+    The search tree is kept between moves: on each call the tree is advanced through the moves played
+    since the previous call (ours and the opponent's, read from env.info["moves"]), so the next search
+    starts from the already explored subtree. A new game or an undone move resets the tree.
+    """
 
     def __init__(
         self,
@@ -26,11 +31,32 @@ class AlphaZeroAgent(GenericAgent):
         simulations: int = 800,
         cpuct: float = 1.4,
         net: AlphaZeroNet | None = None,
+        *,
+        reuse_tree: bool = True,
+        backend: str = "torch",
     ):
+        """Instantiates agent.
+
+        Args:
+            name: name of the agent.
+            game: tris or connect4, to load the trained network. Ignored if net is given.
+            simulations: MCTS simulations per move.
+            cpuct: MCTS exploration factor.
+            net: optional network to use instead of the trained one.
+            reuse_tree: keep the search tree across moves. If False every move is searched from scratch.
+            backend: torch, or onnx to run the exported web/models/<game>.onnx with onnxruntime (optional
+                dependency). Ignored if net is given.
+        """
         super().__init__(name)
         # load model
         if net:
             self.net = net
+        elif backend == "onnx":
+            from giotto.agents.algorithms.alphazero.net_onnx import OnnxAlphaZeroNet  # noqa: PLC0415 optional onnxruntime
+
+            self.net = OnnxAlphaZeroNet(Path(__file__).parents[2] / "web" / "models" / f"{game.lower()}.onnx")
+        elif backend != "torch":
+            raise ValueError(f"Backend {backend} not supported.")
         else:
             # TODO: use model config json
             if game.lower() == "tris":
@@ -50,6 +76,10 @@ class AlphaZeroAgent(GenericAgent):
 
         self.simulations = simulations
         self.cpuct = cpuct
+        self.reuse_tree = reuse_tree
+        self.mcts = AlphaZeroMCTS(net=self.net, n_simulations=simulations, cpuct=cpuct)
+        # moves of the position the cached tree root refers to, None if there is no tree
+        self._tree_moves: list[int] | None = None
 
     def load_net(self, path: str):
         """Loads value network model."""
@@ -63,10 +93,26 @@ class AlphaZeroAgent(GenericAgent):
 
     def select_action(self, env):
         """Selects action using AlphaZero style network."""
-        mcts = AlphaZeroMCTS(
-            net=self.net,
-            n_simulations=self.simulations,
-            cpuct=self.cpuct,
-        )
+        mcts = self.mcts
+        mcts.n_simulations = self.simulations
+        mcts.cpuct = self.cpuct
+
+        moves = env.info["moves"]
+        known = self._tree_moves
+        if self.reuse_tree and known is not None and moves[: len(known)] == known:
+            # same game: follow the moves played since the last search
+            for action in moves[len(known) :]:
+                mcts.advance_root(action)
+        else:
+            mcts.reset()
+
         action, _root = mcts.run(env, temperature=0.0)
+
+        mcts.advance_root(action)
+        self._tree_moves = [*moves, action]
         return action
+
+    def reset(self):
+        """Discards the search tree, the next move is searched from scratch."""
+        self.mcts.reset()
+        self._tree_moves = None
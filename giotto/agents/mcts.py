@@ -6,10 +6,11 @@ from giotto.envs.generic import GenericEnv
 class MCTSAgent(GenericAgent):
     """Selects action with MCTS."""
 
-    def __init__(self, name: str = "MCTSAgent", simulations: int = 10000, cpuct: float = 1.4):
+    def __init__(self, name: str = "MCTSAgent", simulations: int = 10000, cpuct: float = 1.4, rollouts: int = 1):
         super().__init__(name)
         self.simulations = simulations
         self.cpuct = cpuct
+        self.rollouts = rollouts
 
     def select_action(self, env: GenericEnv) -> int:
         """Randomly selects valid action.
@@ -20,6 +21,6 @@ class MCTSAgent(GenericAgent):
         Returns:
             action as integer (1-9 tris, 1-7 connect4).
         """
-        mcts = MCTS(n_simulations=self.simulations, cpuct=self.cpuct)
+        mcts = MCTS(n_simulations=self.simulations, cpuct=self.cpuct, n_rollouts=self.rollouts)
         action = mcts.run(env)
         return action
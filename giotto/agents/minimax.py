@@ -1,79 +1,285 @@
 import math
+import time
 
+from giotto.agents.algorithms.heuristics import WindowEvaluator
 from giotto.agents.generic import GenericAgent
 from giotto.envs.generic import GenericEnv
 
+# transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# the clock is read once every this many nodes
+_TIME_CHECK_NODES = 256
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget is over."""
+
+
+def _shrink(score: float) -> float:
+    """Moves a win (or loss) score one step towards 0: a win one move further away is worth a bit less.
+
+    Win scores are at least 2 when shrunk (see _win_score), heuristic scores, strictly inside (-1, 1), are left
+    untouched. Scores in between are clamped to +-1, so that _shrink is monotone and bounds stay bounds.
+    """
+    if score >= 2:
+        return score - 1
+    if score <= -2:
+        return score + 1
+    return min(max(score, -1), 1)
+
+
+def _widen(bound: float, upper: bool) -> float:
+    """Maps a bound on _shrink(x) to the loosest bound on x implying it, so that child searches stay correct.
+
+    Args:
+        bound: bound on the shrunk score.
+        upper: whether bound is an upper (beta) or a lower (alpha) bound.
+    """
+    if bound > 1 or (bound == 1 and not upper):
+        return bound + 1
+    if bound < -1 or (bound == -1 and upper):
+        return bound - 1
+    # heuristic range: _shrink is the identity there
+    return bound
+
 
 class MinimaxAgent(GenericAgent):
-    """Minimax-based TicTacToe agent."""
+    """Minimax-based agent.
 
-    def __init__(self, name="Minimax"):
-        """Instantiates agent."""
+    The search is a negamax with alpha-beta pruning. Results are stored in a transposition table keyed by
+    the canonical (symmetry invariant) position key of the env, so equivalent positions are searched once.
+    Scores are relative to the player to move, hence the table is kept across moves and games. It holds at
+    most max_table_entries positions: when full, the shallower half of the entries, the cheapest to search
+    again, is dropped. The whole tris game tree fits well within the default size.
+
+    By default the game tree is searched to the end, which is only feasible for tris. With max_depth or
+    time_limit the search is iteratively deepened and positions at the depth limit are scored by a static
+    evaluator. Wins and losses score win_score minus the distance in moves, static evaluations stay
+    within (-1, 1).
+    """
+
+    def __init__(
+        self, name="Minimax", max_depth=None, time_limit=None, evaluator=None, table=None, *, max_table_entries=500_000
+    ):
+        """Instantiates agent.
+
+        Args:
+            name: name of the agent.
+            max_depth: maximum search depth in moves. None to search up to the end of the game.
+            time_limit: wall-clock budget in seconds for each select_action. None for no limit.
+            evaluator: callable scoring a non terminal env in (-1, 1) for the player to move.
+                Defaults to WindowEvaluator.
+            table: optional TrisTable answering tic tac toe positions without any search.
+            max_table_entries: maximum number of positions kept in the transposition table.
+        """
         super().__init__(name)
         self.player_id = None
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.evaluator = evaluator if evaluator is not None else WindowEvaluator()
+        self.table = table
+        self.max_table_entries = max_table_entries
+        # canonical key -> (depth, flag, score, best action, position key the best action refers to)
+        self.transposition_table = {}
+        # move ordering: killer moves per ply and history scores of the moves causing cutoffs
+        self._killers = []
+        self._history = {}
+        self._deadline = None
+        self._nodes = 0
 
     def select_action(self, env: GenericEnv) -> int:
-        """Selects action using minimax algorithm."""
+        """Selects action using iteratively deepened minimax, within the depth and time limits."""
         if self.player_id is None:
             self.player_id = env.current_player
 
+        if self.table is not None and self.table.supports(env):
+            return self.table.best_moves(env)[0]
+
+        target_depth = self._target_depth(env)
+
+        # the best move of a position already searched deep enough, in the same orientation, is known
+        entry = self.transposition_table.get(env.canonical_hash_key)
+        if entry is not None and entry[0] >= target_depth and entry[1] == EXACT and entry[4] == env.hash_key:
+            return entry[3]
+
+        self._start_search(target_depth)
+        if self.time_limit is not None:
+            self._deadline = time.perf_counter() + self.time_limit
+
+        # a single env is walked down and back up the tree with step/undo
+        sim_env = env.clone()
+        actions = self._order_actions(sim_env, 0, entry[3] if entry is not None and entry[4] == env.hash_key else None)
+        best_action = actions[0]
+        try:
+            for depth in range(1, target_depth + 1):
+                best_score, best_action = self._search_root(sim_env, depth, actions)
+                actions = [best_action] + [a for a in actions if a != best_action]
+                if abs(best_score) >= 1:
+                    break  # proven result, a deeper search would not change it
+        except _SearchTimeout:
+            pass  # keep the move of the last completed iteration
+
+        return best_action
+
+    def _target_depth(self, env: GenericEnv) -> int:
+        """Search depth needed for the env: the moves left until the board is full, capped by max_depth."""
+        depth = env.rows * env.cols - env.turn_counter
+        if self.max_depth is not None:
+            depth = min(depth, self.max_depth)
+        return depth
+
+    def _start_search(self, max_depth: int):
+        """Resets the per search state."""
+        self._killers = [[None, None] for _ in range(max_depth + 1)]
+        self._history = {}
+        self._deadline = None
+        self._nodes = 0
+
+    def _search_root(self, env: GenericEnv, depth: int, actions: list[int]) -> tuple[float, int]:
+        """Searches the root moves in the given order, keeping the first best one."""
         best_score = -math.inf
         best_action = None
-
-        for action in env.get_valid_actions():
-            sim_env = env.clone()
-            sim_env.step(action)
-            score = self._minimax(sim_env, depth=1)
+        for action in actions:
+            env.step(action)
+            # only moves strictly better than the current best are of interest
+            score = _shrink(-self._negamax(env, depth - 1, -math.inf, -_widen(best_score, upper=False), ply=1))
+            env.undo()
             if score > best_score:
                 best_score = score
                 best_action = action
 
-        return best_action
+        self._store(env.canonical_hash_key, (depth, EXACT, best_score, best_action, env.hash_key))
+        return best_score, best_action
 
-    def _minimax(self, env, depth=0) -> int:
-        """Minimax algorithm."""
+    def _negamax(self, env: GenericEnv, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """Alpha-beta negamax. The env is explored in place and restored before returning.
+
+        Args:
+            env: position to search.
+            depth: remaining depth in moves. Positions at depth 0 are scored by the evaluator.
+            alpha: lower bound of the window, relative to the player to move.
+            beta: upper bound of the window, relative to the player to move.
+            ply: distance from the root, for the killer moves.
+
+        Returns:
+            score for the player to move. It is exact if inside (alpha, beta), otherwise a bound.
+        """
         if env.done:
-            return self._evaluate(env, depth)
-
-        if env.current_player == self.player_id:
-            best = -math.inf
-            for action in env.get_valid_actions():
-                sim_env = env.clone()
-                sim_env.step(action)
-                best = max(best, self._minimax(sim_env, depth + 1))
-            return best
-        else:
-            best = math.inf
-            for action in env.get_valid_actions():
-                sim_env = env.clone()
-                sim_env.step(action)
-                best = min(best, self._minimax(sim_env, depth + 1))
-            return best
+            # the game can only have been won by the player who just moved
+            return 0 if env.info["winner"] == -1 else -self._win_score(env)
+        if depth == 0:
+            return self.evaluator(env)
 
-    def _evaluate(self, env, depth) -> int:
-        """Position evaluation."""
-        winner = env.info["winner"]
+        self._nodes += 1
+        if self._deadline is not None and self._nodes % _TIME_CHECK_NODES == 0 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
 
-        if winner == -1:
-            return 0
+        key = env.canonical_hash_key
+        entry = self.transposition_table.get(key)
+        tt_action = None
+        if entry is not None:
+            entry_depth, flag, score, action, position_key = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+            if position_key == env.hash_key:
+                tt_action = action
+        alpha_orig = alpha
 
-        elif winner == self.player_id:
-            return 10 - depth  # faster win = larger score
+        best = -math.inf
+        best_action = None
+        for action in self._order_actions(env, ply, tt_action):
+            env.step(action)
+            score = _shrink(
+                -self._negamax(env, depth - 1, -_widen(beta, upper=True), -_widen(alpha, upper=False), ply + 1)
+            )
+            env.undo()
+            if score > best:
+                best = score
+                best_action = action
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    self._store_cutoff(action, depth, ply)
+                    break
 
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
         else:
-            return depth - 10  # slower loss = better than fast loss
+            flag = EXACT
+        self._store(key, (depth, flag, best, best_action, env.hash_key))
+        return best
+
+    def _store(self, key: int, entry: tuple):
+        """Stores entry in the transposition table, dropping its shallower half first if it is full."""
+        table = self.transposition_table
+        if key not in table and len(table) >= self.max_table_entries:
+            kept = sorted(table.items(), key=lambda item: item[1][0], reverse=True)[: self.max_table_entries // 2]
+            self.transposition_table = table = dict(kept)
+        table[key] = entry
+
+    def _order_actions(self, env: GenericEnv, ply: int, tt_action: int | None) -> list[int]:
+        """Orders the valid actions: table move, killer moves, then by history score and closeness to the center."""
+        cols = env.cols
+        center = (cols - 1) / 2
+        history = self._history
+
+        def static_key(action):
+            # actions are columns (connect4) or cells numbered row by row (tris)
+            row, col = divmod(action - 1, cols)
+            return -history.get(action, 0), abs(col - center) + abs(row - center)
+
+        actions = sorted(env.get_valid_actions(), key=static_key)
+
+        first = [tt_action] if tt_action is not None else []
+        if ply < len(self._killers):
+            first += [a for a in self._killers[ply] if a is not None and a != tt_action]
+        if first:
+            actions = [a for a in first if a in actions] + [a for a in actions if a not in first]
+        return actions
+
+    def _store_cutoff(self, action: int, depth: int, ply: int):
+        """Records a move causing a beta cutoff as killer move of the ply and in the history scores."""
+        killers = self._killers[ply]
+        if killers[0] != action:
+            killers[1] = killers[0]
+            killers[0] = action
+        self._history[action] = self._history.get(action, 0) + depth * depth
+
+    @staticmethod
+    def _win_score(env: GenericEnv) -> int:
+        """Score of a win, larger than the number of moves in a game so that distances stay positive.
+
+        A win is shrunk at most once per move before the root, so wins are still at least 2 when shrunk.
+        """
+        return env.rows * env.cols + 1
 
     def evaluate_all_moves(self, env: GenericEnv) -> dict:
-        """Evaluates all valid moves."""
+        """Evaluates all valid moves, without time limit. Scores are from the point of view of player_id."""
         if self.player_id is None:
             self.player_id = env.current_player
+        sign = 1 if env.current_player == self.player_id else -1
+
+        if self.table is not None and self.table.supports(env):
+            return {action: sign * score for action, score in self.table.move_scores(env).items()}
+
+        depth = self._target_depth(env)
+        self._start_search(depth)
 
         move_scores = {}
 
-        for action in env.get_valid_actions():
-            sim_env = env.clone()
+        sim_env = env.clone()
+        for action in sim_env.get_valid_actions():
             sim_env.step(action)
-            score = self._minimax(sim_env)
-            move_scores[action] = score
+            move_scores[action] = -sign * self._negamax(sim_env, depth - 1, -math.inf, math.inf, ply=1)
+            sim_env.undo()
 
         return move_scores
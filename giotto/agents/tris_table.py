@@ -0,0 +1,32 @@
+from giotto.agents.algorithms.tris_table import TrisTable, load_tris_table
+from giotto.agents.generic import GenericAgent
+from giotto.envs.generic import GenericEnv
+
+
+class TrisTableAgent(GenericAgent):
+    """Perfect TicTacToe agent reading the precomputed perfect-play table."""
+
+    def __init__(self, name: str = "TrisTable", table: TrisTable | None = None):
+        """Instantiates agent.
+
+        Args:
+            name: name of the agent.
+            table: perfect-play table. Defaults to the shared table of load_tris_table().
+        """
+        super().__init__(name)
+        self.table = table if table is not None else load_tris_table()
+
+    def select_action(self, env: GenericEnv) -> int:
+        """Selects the first best action: quickest win, or slowest loss.
+
+        Args:
+            env: environment to extract valid actions from.
+
+        Returns:
+            action as integer (1-9).
+        """
+        return self.table.best_moves(env)[0]
+
+    def evaluate_all_moves(self, env: GenericEnv) -> dict:
+        """Evaluates all valid moves for the player to move, with the same scores as MinimaxAgent."""
+        return self.table.move_scores(env)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from giotto.envs.batch_generic import BatchGenericEnv
+
+
+class BatchConnect4Env(BatchGenericEnv):
+    """N Connect4 games advanced in lockstep. Actions are columns 1-7 like in Connect4Env.
+
+    Column heights are tracked per game so that drops are a single gather, and only the lines
+    through the last dropped piece are checked for a win.
+    """
+
+    def __init__(self, n_envs: int, auto_reset: bool = True, seed: int | None = None):
+        """Instantiates batch environment."""
+        self.heights = np.zeros((n_envs, 7), dtype=np.int8)
+        super().__init__(n_envs, rows=6, cols=7, n_actions=7, connect=4, auto_reset=auto_reset, seed=seed)
+
+    def reset(self, starting_player: int | None = None, env_ids: np.ndarray | None = None):
+        """Resets games to the initial state."""
+        super().reset(starting_player=starting_player, env_ids=env_ids)
+        if env_ids is None:
+            self.heights[:] = 0
+        else:
+            self.heights[env_ids] = 0
+
+    def set_position(self, board: np.ndarray, current_player: int, env_ids: np.ndarray | None = None):
+        """Copies the position of a single env into the given games, recomputing the column heights."""
+        super().set_position(board, current_player, env_ids=env_ids)
+        if env_ids is None:
+            self.heights[:] = (np.asarray(board) != -1).sum(axis=0)
+        else:
+            self.heights[env_ids] = (np.asarray(board) != -1).sum(axis=0)
+
+    def valid_action_mask(self) -> np.ndarray:
+        """Returns a (N, 7) boolean mask of the columns that are not full."""
+        return self.heights < self.rows
+
+    def _decode_actions(self, env_ids: np.ndarray, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Converts columns 1-7 to the (rows, cols) arrays of the landing cells."""
+        cols = actions.astype(np.int64) - 1
+        rows = self.heights[env_ids, cols].astype(np.int64)
+        if np.any(rows >= self.rows):
+            raise ValueError("Column already full.")
+        self.heights[env_ids, cols] += 1
+        return rows, cols
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def winning_lines(rows: int, cols: int, connect: int) -> np.ndarray:
+    """Enumerates all the lines of `connect` aligned cells on a board.
+
+    Args:
+        rows: number of rows of the board.
+        cols: number of columns of the board.
+        connect: number of aligned pieces needed to win.
+
+    Returns:
+        array of shape (n_lines, connect) with the flat cell indices of each line.
+    """
+    lines = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                end_r = r + (connect - 1) * dr
+                end_c = c + (connect - 1) * dc
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    lines.append([(r + i * dr) * cols + (c + i * dc) for i in range(connect)])
+    return np.array(lines, dtype=np.int64)
+
+
+class BatchGenericEnv:
+    """N games of a 2 players grid-based game advanced in lockstep with vectorized numpy operations.
+
+    Boards live in a single (N, rows, cols) int8 array with the same encoding as GenericEnv
+    (-1 empty, 0/1 player pieces) and actions are the same 1-based integers used by the single envs.
+    Per-game state (player to move, turn counter, done flag, winner) is kept in arrays of length N.
+    With auto_reset, games that end during a step are restarted immediately and their results
+    are added to `results`.
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        rows: int,
+        cols: int,
+        n_actions: int,
+        connect: int,
+        *,
+        auto_reset: bool = True,
+        seed: int | None = None,
+    ):
+        """Instantiates batch environment.
+
+        Args:
+            n_envs: number of games played in parallel.
+            rows: number of rows of the board.
+            cols: number of columns of the board.
+            n_actions: number of actions (1-based).
+            connect: number of aligned pieces needed to win.
+            auto_reset: restart games as soon as they end.
+            seed: seed of the random generator used for starting players and random actions.
+        """
+        self.n_envs = n_envs
+        self.rows = rows
+        self.cols = cols
+        self.n_actions = n_actions
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        # lines through each cell, padded to the same length (mask marks the real ones)
+        self._lines = winning_lines(rows, cols, connect)
+        n_cells = rows * cols
+        per_cell = [np.flatnonzero((self._lines == cell).any(axis=1)) for cell in range(n_cells)]
+        max_lines = max(len(lines) for lines in per_cell)
+        self._cell_lines = np.zeros((n_cells, max_lines), dtype=np.int64)
+        self._cell_lines_mask = np.zeros((n_cells, max_lines), dtype=bool)
+        for cell, lines in enumerate(per_cell):
+            self._cell_lines[cell, : len(lines)] = lines
+            self._cell_lines_mask[cell, : len(lines)] = True
+
+        self.boards = np.full((n_envs, rows, cols), fill_value=-1, dtype=np.int8)
+        self.current_player = np.zeros(n_envs, dtype=np.int8)
+        self.turn_counter = np.zeros(n_envs, dtype=np.int16)
+        self.done = np.zeros(n_envs, dtype=bool)
+        self.winner = np.full(n_envs, fill_value=-1, dtype=np.int8)
+
+        # finished games statistics: [draws, player 0 wins, player 1 wins]
+        self.games_finished = 0
+        self.results = np.zeros(3, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, starting_player: int | None = None, env_ids: np.ndarray | None = None):
+        """Resets games to the initial state.
+
+        Args:
+            starting_player: index of starting player (0=O, 1=X). Random per game if None.
+            env_ids: indices of the games to reset. All games if None.
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.n_envs)
+        if starting_player in (0, 1):
+            self.current_player[env_ids] = starting_player
+        else:
+            self.current_player[env_ids] = self.rng.integers(2, size=len(env_ids))
+        self.boards[env_ids] = -1
+        self.turn_counter[env_ids] = 0
+        self.done[env_ids] = False
+        self.winner[env_ids] = -1
+
+    def set_position(self, board: np.ndarray, current_player: int, env_ids: np.ndarray | None = None):
+        """Copies the position of a single env into the given games, which restart from it.
+
+        Args:
+            board: (rows, cols) board with the GenericEnv encoding.
+            current_player: index of the player to move.
+            env_ids: indices of the games to set. All games if None.
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.n_envs)
+        self.boards[env_ids] = board
+        self.current_player[env_ids] = current_player
+        self.turn_counter[env_ids] = np.count_nonzero(np.asarray(board) != -1)
+        self.done[env_ids] = False
+        self.winner[env_ids] = -1
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Plays one action in every game that is not over.
+
+        Args:
+            actions: array of N actions (1-based). Actions of finished games are ignored.
+
+        Returns:
+            done and winner arrays as they were after the move, before any auto reset.
+            winner is -1 for draws and for games that are not over.
+        """
+        actions = np.asarray(actions)
+        active = np.flatnonzero(~self.done)
+        players = self.current_player[active]
+
+        rows, cols = self._decode_actions(active, actions[active])
+        self.boards[active, rows, cols] = players
+        self.turn_counter[active] += 1
+
+        won = self._check_lines(active, rows * self.cols + cols, players)
+        finished = won | (self.turn_counter[active] == self.rows * self.cols)
+        self.done[active] = finished
+        self.winner[active] = np.where(won, players, -1)
+
+        # update current player also when game finished, like the single envs
+        self.current_player[active] = 1 - players
+
+        done = self.done.copy()
+        winner = self.winner.copy()
+
+        ended = active[finished]
+        if len(ended):
+            self.games_finished += len(ended)
+            self.results += np.bincount(winner[ended] + 1, minlength=3)
+            if self.auto_reset:
+                self.reset(env_ids=ended)
+
+        return done, winner
+
+    def check_win(self, player_idx: int) -> np.ndarray:
+        """Checks which games the given player has won, scanning all the lines of every board.
+
+        Args:
+            player_idx: index of the player to check for a win.
+
+        Returns:
+            boolean array of length N.
+        """
+        flat = self.boards.reshape(self.n_envs, -1)
+        return (flat[:, self._lines] == player_idx).all(axis=2).any(axis=1)
+
+    def random_actions(self) -> np.ndarray:
+        """Samples one uniformly random valid action per game (1-based)."""
+        scores = self.rng.random((self.n_envs, self.n_actions))
+        scores[~self.valid_action_mask()] = -1.0
+        return scores.argmax(axis=1) + 1
+
+    def play_random_games(self, n_games: int) -> np.ndarray:
+        """Plays random games until at least n_games more games are finished. Requires auto_reset.
+
+        Returns:
+            finished games results as [draws, player 0 wins, player 1 wins].
+        """
+        if not self.auto_reset:
+            raise ValueError("play_random_games requires auto_reset=True.")
+        start_results = self.results.copy()
+        target = self.games_finished + n_games
+        while self.games_finished < target:
+            self.step(self.random_actions())
+        return self.results - start_results
+
+    def get_states(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns boards (N, rows, cols) and players to move (N,) as copies."""
+        return self.boards.copy(), self.current_player.copy()
+
+    def _check_lines(self, env_ids: np.ndarray, cells: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """Checks only the lines through the last played cell of each game."""
+        flat = self.boards.reshape(self.n_envs, -1)
+        line_cells = self._lines[self._cell_lines[cells]]  # (n, max_lines, connect)
+        values = flat[env_ids[:, None, None], line_cells]
+        complete = (values == players[:, None, None]).all(axis=2) & self._cell_lines_mask[cells]
+        return complete.any(axis=1)
+
+    # -------------
+    # game specific methods, to be implemented in the child classes
+    # -------------
+    def valid_action_mask(self) -> np.ndarray:
+        """Returns a (N, n_actions) boolean mask of the valid actions, action a at index a - 1."""
+        raise NotImplementedError
+
+    def _decode_actions(self, env_ids: np.ndarray, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Converts the actions of the given games to (rows, cols) arrays of played cells."""
+        raise NotImplementedError
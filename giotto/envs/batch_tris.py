@@ -0,0 +1,22 @@
+import numpy as np
+
+from giotto.envs.batch_generic import BatchGenericEnv
+
+
+class BatchTrisEnv(BatchGenericEnv):
+    """N Tic Tac Toe games advanced in lockstep. Actions are integers 1-9 like in TrisEnv."""
+
+    def __init__(self, n_envs: int, auto_reset: bool = True, seed: int | None = None):
+        """Instantiates batch environment."""
+        super().__init__(n_envs, rows=3, cols=3, n_actions=9, connect=3, auto_reset=auto_reset, seed=seed)
+
+    def valid_action_mask(self) -> np.ndarray:
+        """Returns a (N, 9) boolean mask of the empty cells."""
+        return self.boards.reshape(self.n_envs, -1) == -1
+
+    def _decode_actions(self, env_ids: np.ndarray, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Converts actions 1-9 to (rows, cols) arrays."""
+        rows, cols = np.divmod(actions.astype(np.int64) - 1, self.cols)
+        if np.any(self.boards[env_ids, rows, cols] != -1):
+            raise ValueError("Cell already occupied.")
+        return rows, cols
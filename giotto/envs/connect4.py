@@ -1,12 +1,37 @@
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view
 
+from giotto.envs.batch_connect4 import BatchConnect4Env
 from giotto.envs.generic import GenericEnv
 from giotto.utils.simmetries import EquivalentBoards
 
+ROWS = 6
+COLS = 7
+
+# Bitboard layout: one group of ROWS + 1 bits per column, bottom row first.
+# The extra sentinel bit on top of each column stops shifted lines from wrapping into the next column.
+_STRIDE = ROWS + 1
+_CELL_BITS = np.array([[1 << (c * _STRIDE + r) for c in range(COLS)] for r in range(ROWS)], dtype=np.uint64)
+# vertical, horizontal, diagonal (\) and diagonal (/) shifts
+_DIRECTIONS = (1, _STRIDE, _STRIDE - 1, _STRIDE + 1)
+
+
+def _has_four(mask: int) -> bool:
+    """Checks if a player bitboard contains four aligned pieces."""
+    for shift in _DIRECTIONS:
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
 
 class Connect4Env(GenericEnv):
-    """Connect4 environment."""
+    """Connect4 environment.
+
+    The board is stored as two bitboards (one per player) plus the height of each column,
+    so that dropping a piece and checking for a win are constant time operations.
+    The numpy ``board`` is built from the bitboards only when accessed.
+    """
 
     simmetries = EquivalentBoards(
         rotate90=False,
@@ -18,39 +43,64 @@ class Connect4Env(GenericEnv):
         reflect_diag_ne_sw=False,
     )
 
+    # number of aligned pieces needed to win
+    connect = 4
+
     def __init__(self):
         """Instantiates environment."""
         signs = ["o", "x", -1]  # third is empty place, accessed with -1
-        rows = 6
-        cols = 7
-        super().__init__(signs, rows, cols)
+        super().__init__(signs, ROWS, COLS)
         self.reset()
 
-    def check_win(self, player_idx: int) -> bool:
-        """Checks if the given player has won."""
-        player_mask = self.board == player_idx
-
-        # Horizontal: windows of 4 along columns for each row
-        horiz_windows = sliding_window_view(player_mask, window_shape=(1, 4)).squeeze(axis=2)  # (rows, cols-3, 4)
-        if np.any(np.all(horiz_windows, axis=-1)):
-            return True
+    @property
+    def board(self) -> np.ndarray:
+        """Numpy view of the board (-1 empty, 0/1 player pieces), rebuilt from the bitboards when needed.
 
-        # Vertical: windows of 4 along rows for each column
-        vert_windows = sliding_window_view(player_mask, window_shape=(4, 1)).squeeze(axis=3)  # (rows-3, cols, 4)
-        if np.any(np.all(vert_windows, axis=-1)):
-            return True
-
-        # Diagonal (\): windows of 4x4, check main diagonal
-        square_windows = sliding_window_view(player_mask, window_shape=(4, 4))  # (rows-3, cols-3, 4, 4)
-        diag_down_right = np.diagonal(square_windows, axis1=-2, axis2=-1)  # (rows-3, cols-3, 4)
-        if np.any(np.all(diag_down_right, axis=-1)):
-            return True
+        The returned array is cached until the next move and must not be modified in place.
+        """
+        if self._board is None:
+            board = np.full((self.rows, self.cols), fill_value=-1)
+            board[(_CELL_BITS & np.uint64(self._masks[0])) != 0] = 0
+            board[(_CELL_BITS & np.uint64(self._masks[1])) != 0] = 1
+            self._board = board
+        return self._board
+
+    @board.setter
+    def board(self, board: np.ndarray):
+        """Loads a copy of a numpy board into the bitboard representation and recomputes the position keys."""
+        board = np.array(board)
+        masks = [0, 0]
+        for player_idx in (0, 1):
+            for r, c in np.argwhere(board == player_idx):
+                masks[player_idx] |= 1 << (int(c) * _STRIDE + int(r))
+        self._masks = masks
+        self._heights = (board != -1).sum(axis=0).tolist()
+        self._board = board
+        self._init_hash()
+
+    def _play(self, action: int | tuple[int, int]) -> tuple[int, int]:
+        """Drops a piece of the current player in O(1) on the bitboard."""
+        row, col = self.decode_action(action)
+        self._masks[self.current_player] |= 1 << (col * _STRIDE + row)
+        self._heights[col] = row + 1
+        self._board = None
+        return row, col
+
+    def _unplay(self, action: int | tuple[int, int]) -> tuple[int, int]:
+        """Removes the top piece of the column played by the given action."""
+        if isinstance(action, (int | np.integer)):
+            col = int(action) - 1
+            row = self._heights[col] - 1
+        else:
+            row, col = action
+        self._masks[self.current_player] &= ~(1 << (col * _STRIDE + row))
+        self._heights[col] = row
+        self._board = None
+        return row, col
 
-        # Diagonal (/): same 4x4 windows, check anti-diagonal by flipping columns
-        flipped_mask = player_mask[:, ::-1]
-        square_windows_flipped = sliding_window_view(flipped_mask, window_shape=(4, 4))
-        diag_up_right = np.diagonal(square_windows_flipped, axis1=-2, axis2=-1)
-        return bool(np.any(np.all(diag_up_right, axis=-1)))
+    def check_win(self, player_idx: int) -> bool:
+        """Checks if the given player has won."""
+        return _has_four(self._masks[player_idx])
 
     def get_winning_cells(self, player_idx: int) -> list[tuple[int, int]] | None:
         """Returns the cells forming the winning line for a player.
@@ -98,9 +148,8 @@ class Connect4Env(GenericEnv):
         Returns:
             list of valid actions as integers (1-7).
         """
-        # checks if top row is empty or not for each column
-        playable = (self.board == -1).any(axis=0)
-        return (np.nonzero(playable)[0] + 1).tolist()
+        rows = self.rows
+        return [col + 1 for col, height in enumerate(self._heights) if height < rows]
 
     def decode_action(self, action: int | tuple[int, int]) -> tuple[int, int]:
         """Ensures action is encoded as tuple (row, col).
@@ -113,9 +162,8 @@ class Connect4Env(GenericEnv):
         """
         if isinstance(action, (int | np.integer)):
             action_col = int(action) - 1  # convert to 0-6
-            col_values = [row[action_col] for row in self.board]
-            action_row = next((i for i, val in enumerate(col_values) if val == -1), None)
-            if action_row is None:
+            action_row = self._heights[action_col]
+            if action_row >= self.rows:
                 raise ValueError("Column already full.")
             action = (action_row, action_col)
         return action
@@ -145,12 +193,22 @@ class Connect4Env(GenericEnv):
         new_env.signs = self.signs
         new_env.rows = self.rows
         new_env.cols = self.cols
-        new_env.board = self.board.copy()
+        new_env._masks = self._masks.copy()
+        new_env._heights = self._heights.copy()
+        new_env._board = self._board  # never modified in place, safe to share
         new_env.current_player = self.current_player
         new_env.turn_counter = self.turn_counter
         new_env.done = self.done
+        new_env._move_keys = self._move_keys
+        new_env._side_key = self._side_key
+        new_env._sym_keys = self._sym_keys
+        new_env.hash_key = self.hash_key
         info = {"moves": self.info["moves"].copy()}
         if "winner" in self.info:
             info["winner"] = self.info["winner"]
         new_env.info = info
         return new_env
+
+    def batch_env(self, n_envs: int, auto_reset: bool = True, seed: int | None = None) -> BatchConnect4Env:
+        """Returns a batch env playing n_envs Connect4 games in lockstep."""
+        return BatchConnect4Env(n_envs, auto_reset=auto_reset, seed=seed)
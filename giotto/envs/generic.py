@@ -1,16 +1,73 @@
 from __future__ import annotations
 
+from functools import cache
+from operator import xor
+
 import numpy as np
 
+from giotto.envs.batch_generic import BatchGenericEnv
+from giotto.utils.simmetries import EquivalentBoards
+
+# fixed seed so that position keys are stable across processes and runs
+ZOBRIST_SEED = 20250125
+
+
+@cache
+def zobrist_tables(rows: int, cols: int) -> tuple[list[list[int]], int]:
+    """Random 64-bit keys for every (player, flat cell) pair and for the side to move."""
+    rng = np.random.default_rng(ZOBRIST_SEED)
+    piece_keys = rng.integers(0, 2**64, size=(2, rows * cols), dtype=np.uint64).tolist()
+    side_key = int(rng.integers(0, 2**64, dtype=np.uint64))
+    return piece_keys, side_key
+
+
+@cache
+def zobrist_move_keys(rows: int, cols: int, simmetries: EquivalentBoards | None = None) -> list[list[tuple[int, ...]]]:
+    """Builds the Zobrist keys xor-ed into the position keys when a piece is placed.
+
+    Every (player, cell) pair gets a random 64-bit key. A position key is the xor of the keys of its pieces,
+    plus a side key when player 1 is to move. One key is kept per symmetry transform (identity first):
+    the key of transform t is the key of the transformed board.
+
+    Args:
+        rows: number of rows of the board.
+        cols: number of columns of the board.
+        simmetries: symmetries of the game. If None only the identity is used.
+
+    Returns:
+        nested list indexed by [player][flat cell] with a tuple of keys, one per transform.
+        Each key already includes the side to move toggle.
+    """
+    piece_keys, side_key = zobrist_tables(rows, cols)
+
+    if simmetries is None:
+        perms = np.arange(rows * cols)[None]
+    else:
+        perms = simmetries.cell_permutations(rows, cols)
+    # cell c of the original board lands on inv_perms[t, c] in transform t
+    inv_perms = np.argsort(perms, axis=1).tolist()
+
+    return [
+        [tuple(piece_keys[player][inv_perm[cell]] ^ side_key for inv_perm in inv_perms) for cell in range(rows * cols)]
+        for player in (0, 1)
+    ]
+
 
 class GenericEnv:
-    """Generic class for 2 players grid-based game."""
+    """Generic class for 2 players grid-based game.
+
+    The env maintains a 64-bit Zobrist key of the position (pieces + player to move) in ``hash_key``,
+    updated incrementally by step() and undo(), plus the keys of all the symmetric positions
+    from which a canonical key is derived.
+    """
 
     def __init__(self, signs: list, rows: int, cols: int):
         """Instantiates environment."""
         self.signs = signs
         self.rows = rows
         self.cols = cols
+        self._move_keys = zobrist_move_keys(rows, cols, getattr(self, "simmetries", None))
+        self._side_key = zobrist_tables(rows, cols)[1]
 
     def reset(self, starting_player: int | None = None):
         """Resets environment to initial state.
@@ -26,6 +83,37 @@ class GenericEnv:
 
         self.done = False
         self.info = {"moves": []}
+        self._init_hash()
+
+    @property
+    def canonical_hash_key(self) -> int:
+        """Position key shared by all the positions equivalent under the env symmetries."""
+        return min(self._sym_keys)
+
+    @property
+    def canonical_transform(self) -> int:
+        """Id of the symmetry transform (index in simmetries.transforms()) giving the canonical key."""
+        keys = self._sym_keys
+        return keys.index(min(keys))
+
+    def _init_hash(self):
+        """Computes the position keys from scratch from the current board and player."""
+        n_transforms = len(self._move_keys[0][0])
+        keys = [0] * n_transforms
+        for player in (0, 1):
+            for cell in np.flatnonzero(self.board == player):
+                keys = [k ^ z for k, z in zip(keys, self._move_keys[player][cell])]
+        # each move key toggles the side to move: fix the parity so that only player 1 has the side key
+        if (np.count_nonzero(self.board != -1) % 2) != self.current_player:
+            keys = [k ^ self._side_key for k in keys]
+        self._sym_keys = tuple(keys)
+        self.hash_key = keys[0]
+
+    def _update_hash(self, player: int, cell: tuple[int, int]):
+        """Xors the key of a piece of player on cell into all the position keys (works both ways)."""
+        move_keys = self._move_keys[player][cell[0] * self.cols + cell[1]]
+        self._sym_keys = keys = tuple(map(xor, self._sym_keys, move_keys))
+        self.hash_key = keys[0]
 
     def step(self, action: int):
         """Updates environment after an action has been taken.
@@ -36,11 +124,9 @@ class GenericEnv:
         """
         self.info["moves"].append(action)
 
-        # decode action
-        action = self.decode_action(action)
-
         # play the move
-        self.board[action] = self.current_player
+        cell = self._play(action)
+        self._update_hash(self.current_player, cell)
         self.turn_counter += 1
 
         # check win/draw
@@ -56,10 +142,55 @@ class GenericEnv:
         # do this also when game finished, as it's needed for mcts
         self.current_player = (self.current_player + 1) % 2
 
+    def undo(self):
+        """Takes back the last move, restoring the env to the state before the corresponding step.
+
+        Lets search algorithms walk a single env down and back up the game tree instead of cloning it.
+        """
+        if not self.info["moves"]:
+            raise ValueError("No moves to undo.")
+        action = self.info["moves"].pop()
+
+        # the player who made the last move is the one to move again
+        self.current_player = (self.current_player + 1) % 2
+        cell = self._unplay(action)
+        self._update_hash(self.current_player, cell)
+        self.turn_counter -= 1
+
+        # only the last move can have ended the game
+        self.done = False
+        self.info.pop("winner", None)
+
     def get_state(self) -> list[np.ndarray, int]:
         """Returns state of the env."""
         return [self.board.copy(), int(self.current_player)]
 
+    def _play(self, action: int | tuple[int, int]) -> tuple[int, int]:
+        """Places a piece of the current player. Child envs can override it with a faster board representation.
+
+        Args:
+            action: action as integer or tuple (row, col).
+
+        Returns:
+            played cell as tuple (row, col).
+        """
+        cell = self.decode_action(action)
+        self.board[cell] = self.current_player
+        return cell
+
+    def _unplay(self, action: int | tuple[int, int]) -> tuple[int, int]:
+        """Removes the piece placed by the given action. Inverse of _play.
+
+        Args:
+            action: last action played, as integer or tuple (row, col).
+
+        Returns:
+            cleared cell as tuple (row, col).
+        """
+        cell = self.decode_action(action)
+        self.board[cell] = -1
+        return cell
+
     # -------------
     # game specific methods, to be implemented in the child classes
     # -------------
@@ -97,6 +228,10 @@ class GenericEnv:
         """Returns a copy of the env."""
         raise NotImplementedError
 
+    def batch_env(self, n_envs: int, auto_reset: bool = True, seed: int | None = None) -> BatchGenericEnv:
+        """Returns a batch env playing n_envs games of the same game in lockstep."""
+        raise NotImplementedError
+
     def render(self):
         """Text rendering of the current env state."""
         raise NotImplementedError
@@ -1,5 +1,6 @@
 import numpy as np
 
+from giotto.envs.batch_tris import BatchTrisEnv
 from giotto.envs.generic import GenericEnv
 from giotto.utils.simmetries import EquivalentBoards
 
@@ -17,6 +18,9 @@ class TrisEnv(GenericEnv):
         reflect_diag_ne_sw=True,
     )
 
+    # number of aligned pieces needed to win
+    connect = 3
+
     def __init__(self):
         """Instantiates environment."""
         signs = ["o", "x", " "]  # third is empty place, accessed with -1
@@ -115,8 +119,16 @@ class TrisEnv(GenericEnv):
         new_env.current_player = self.current_player
         new_env.turn_counter = self.turn_counter
         new_env.done = self.done
+        new_env._move_keys = self._move_keys
+        new_env._side_key = self._side_key
+        new_env._sym_keys = self._sym_keys
+        new_env.hash_key = self.hash_key
         info = {"moves": self.info["moves"].copy()}
         if "winner" in self.info:
             info["winner"] = self.info["winner"]
         new_env.info = info
         return new_env
+
+    def batch_env(self, n_envs: int, auto_reset: bool = True, seed: int | None = None) -> BatchTrisEnv:
+        """Returns a batch env playing n_envs Tic Tac Toe games in lockstep."""
+        return BatchTrisEnv(n_envs, auto_reset=auto_reset, seed=seed)
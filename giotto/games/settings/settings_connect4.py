@@ -50,7 +50,7 @@ DEFAULT_O_PLAYER = PlayerType.GIOTTO_C4
 SUPPORTED_PLAYER_TYPES = [
     PlayerType.HUMAN,
     PlayerType.RANDOM,
-    # PlayerType.MINIMAX, # too slow for connect4
+    PlayerType.MINIMAX,
     PlayerType.MCTS,
     PlayerType.GIOTTO_C4,
 ]
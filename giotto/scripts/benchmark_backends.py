@@ -0,0 +1,86 @@
+"""Benchmark of the AlphaZero network backends: torch eager and compiled, AlphaZeroNetNumpy and onnxruntime.
+Example command:
+python ./giotto/scripts/benchmark_backends.py -g connect4 -b 1 8 64 256 -t 1
+"""  # noqa: D415
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+from giotto.agents.algorithms.alphazero.net_compiled import CompiledAlphaZeroNet
+from giotto.agents.algorithms.alphazero.net_numpy import AlphaZeroNetNumpy
+
+GAMES = {
+    "tris": {"input_size": [2, 3, 3], "policy_output_size": 9, "channels": 64, "residual_blocks": 5},
+    "connect4": {"input_size": [2, 6, 7], "policy_output_size": 7, "channels": 128, "residual_blocks": 10},
+}
+
+
+def median_ms(function, repeats: int) -> float:
+    """Median wall time of function() in ms, after one warm-up call."""
+    function()
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return 1000 * float(np.median(times))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AlphaZero network backends")
+    parser.add_argument("-g", "--game", help="network size [tris, connect4]", required=True)
+    parser.add_argument(
+        "-b", "--batch-sizes", help="states per batch_predict call [default 1 8 64 256]", type=int, nargs="+"
+    )
+    parser.add_argument("-n", "--repeats", help="timed calls per measure [default 50]", type=int, default=50)
+    parser.add_argument(
+        "-t", "--threads", help="intra-op threads of torch and onnxruntime [default 1]", type=int, default=1
+    )
+    parser.add_argument(
+        "-O", "--optimization", help="onnxruntime graph optimization level [default all]", default="all"
+    )
+    parser.add_argument("--inductor", help="also benchmark torch.compile (slow to compile)", action="store_true")
+    args = parser.parse_args()
+
+    if args.game.lower() not in GAMES:
+        raise ValueError(f"{args.game} not a valid game")
+    config = GAMES[args.game.lower()]
+    batch_sizes = args.batch_sizes or [1, 8, 64, 256]
+    threads = args.threads
+    torch.set_num_threads(threads)
+
+    torch_net = AlphaZeroNet(value_output_size=1, **config).eval()
+    backends = {
+        "torch": torch_net,
+        "fused": CompiledAlphaZeroNet(torch_net, mode="none"),
+        "trace": CompiledAlphaZeroNet(torch_net, mode="trace"),
+        "script": CompiledAlphaZeroNet(torch_net, mode="script"),
+        "trace cl": CompiledAlphaZeroNet(torch_net, mode="trace", channels_last=True),
+        "trace bf16": CompiledAlphaZeroNet(torch_net, mode="trace", bf16=True),
+        "numpy": AlphaZeroNetNumpy(value_output_size=1, **config).load_state_dict(torch_net.state_dict()),
+    }
+    if args.inductor:
+        backends["inductor"] = CompiledAlphaZeroNet(torch_net, mode="inductor")
+    try:
+        from giotto.agents.algorithms.alphazero.net_onnx import OnnxAlphaZeroNet
+
+        backends["onnx"] = OnnxAlphaZeroNet.from_net(
+            torch_net, intra_op_threads=threads, graph_optimization=args.optimization
+        )
+    except ImportError:
+        print("onnxruntime not installed, skipping the onnx backend")
+
+    rng = np.random.default_rng(0)
+    rows, cols = config["input_size"][1:]
+    states = [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(max(batch_sizes))]
+    reference = torch_net.batch_predict(states)[0]
+    print(f"{args.game} {config['channels']}x{config['residual_blocks']}, {threads} thread(s), batch_predict ms")
+    print(f"{'':>10}  " + "".join(f"{f'batch {b}':>12}" for b in batch_sizes) + "  max policy diff")
+    for name, net in backends.items():
+        max_diff = np.abs(net.batch_predict(states)[0] - reference).max()
+        timings = [median_ms(lambda net=net, b=b: net.batch_predict(states[:b]), args.repeats) for b in batch_sizes]
+        print(f"{name:>10}  " + "".join(f"{ms:12.3f}" for ms in timings) + f"  {max_diff:.1e}")
@@ -0,0 +1,87 @@
+"""Micro-benchmark of the NumPy AlphaZero net: workspace forward against a per-call allocating im2col.
+Example command:
+python ./giotto/scripts/benchmark_numpy_net.py -g connect4 -b 1 16
+"""  # noqa: D415
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+from giotto.agents.algorithms.alphazero.net_numpy import AlphaZeroNetNumpy
+
+GAMES = {
+    "tris": {"input_size": [2, 3, 3], "policy_output_size": 9, "channels": 64, "residual_blocks": 5},
+    "connect4": {"input_size": [2, 6, 7], "policy_output_size": 7, "channels": 128, "residual_blocks": 10},
+}
+
+
+def allocating_forward(net: AlphaZeroNetNumpy, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Forward pass with the same compiled weights, padding and im2col columns allocated at every layer."""
+
+    def conv(name, h, residual=None):
+        weight, bias = net._convs[name]
+        n, rows, cols, cin = h.shape
+        if bias is None:
+            weight, bias = weight[:-1], weight[-1]
+            padded = np.pad(h, ((0, 0), (1, 1), (1, 1), (0, 0)))
+            im2col = np.empty((n, rows, cols, 3, 3, cin), dtype=np.float32)
+            for i in range(3):
+                for j in range(3):
+                    im2col[:, :, :, i, j] = padded[:, i : i + rows, j : j + cols]
+            h = im2col
+        out = (h.reshape(n * rows * cols, -1) @ weight + bias).reshape(n, rows, cols, -1)
+        if residual is not None:
+            out = out + residual
+        return np.maximum(out, 0.0)
+
+    def fc(name, h):
+        weight, bias = net._fcs[name]
+        return h @ weight + bias
+
+    h = conv("conv", np.ascontiguousarray(x.transpose(0, 2, 3, 1)))
+    for i in range(net.residual_blocks):
+        h = conv(f"res_blocks.{i}.conv2", conv(f"res_blocks.{i}.conv1", h), residual=h)
+    p = conv("policy_conv", h).transpose(0, 3, 1, 2).reshape(len(x), -1)
+    v = conv("value_conv", h).transpose(0, 3, 1, 2).reshape(len(x), -1)
+    return fc("policy_fc", p), np.tanh(fc("value_fc2", np.maximum(fc("value_fc1", v), 0.0)))
+
+
+def measure(forward, x: np.ndarray, repeats: int) -> tuple[float, int]:
+    """Median latency in ms and peak bytes allocated by one call, after warm-up."""
+    forward(x)
+    tracemalloc.start()
+    forward(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        forward(x)
+        times.append(time.perf_counter() - started)
+    return 1000 * float(np.median(times)), peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy AlphaZero net forward pass")
+    parser.add_argument("-g", "--game", help="network size [tris, connect4]", required=True)
+    parser.add_argument("-b", "--batch-sizes", help="batch sizes [default 1 16]", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("-n", "--repeats", help="timed calls per measure [default 200]", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.game.lower() not in GAMES:
+        raise ValueError(f"{args.game} not a valid game")
+    config = GAMES[args.game.lower()]
+    net = AlphaZeroNetNumpy(value_output_size=1, **config)
+    net.load_state_dict(AlphaZeroNet(value_output_size=1, **config).state_dict())
+
+    rng = np.random.default_rng(0)
+    for batch_size in args.batch_sizes:
+        x = rng.integers(0, 2, size=(batch_size, *config["input_size"])).astype(np.float32)
+        reference, outputs = allocating_forward(net, x), net.forward(x)
+        assert all(np.allclose(a, b, atol=1e-4) for a, b in zip(reference, outputs, strict=True))
+        for label, forward in (("allocating", lambda x: allocating_forward(net, x)), ("workspace", net.forward)):
+            ms, peak = measure(forward, x, args.repeats)
+            print(f"{args.game} batch {batch_size:>3} {label:>10}: {ms:8.3f} ms  {peak / 1024:8.1f} KiB allocated")
@@ -55,7 +55,7 @@ if __name__ == "__main__":
     elif args["player"].lower() == "mcts":
         player = MCTSAgent()
     elif args["player"].lower() == "minimax":
-        player = MinimaxAgent()
+        player = MinimaxAgent(time_limit=1.0)
     elif args["player"].lower() == "valuenet":
         player = ValueNetAgent(game=args["game"])
     elif args["alphazero"].lower() == "alphazero":
@@ -71,7 +71,7 @@ if __name__ == "__main__":
     elif args["opp"].lower() == "mcts":
         opp = MCTSAgent()
     elif args["opp"].lower() == "minimax":
-        opp = MinimaxAgent()
+        opp = MinimaxAgent(time_limit=1.0)
     elif args["opp"].lower() == "valuenet":
         opp = ValueNetAgent(game=args["game"])
     elif args["opp"].lower() == "alphazero":
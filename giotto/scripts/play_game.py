@@ -42,7 +42,7 @@ if __name__ == "__main__":
     elif args["opp"].lower() == "mcts":
         opp = MCTSAgent()
     elif args["opp"].lower() == "minimax":
-        opp = MinimaxAgent()
+        opp = MinimaxAgent(time_limit=1.0)
     elif args["opp"].lower() == "valuenet":
         opp = ValueNetAgent(simulations=100, game=args["game"])
     elif args["opp"].lower() == "alphazero":
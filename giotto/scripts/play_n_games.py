@@ -56,7 +56,7 @@ if __name__ == "__main__":
     elif args["player"].lower() == "mcts":
         player = MCTSAgent()
     elif args["player"].lower() == "minimax":
-        player = MinimaxAgent()
+        player = MinimaxAgent(time_limit=1.0)
     elif args["player"].lower() == "valuenet":
         player = ValueNetAgent(game=args["game"])
     elif args["player"].lower() == "alphazero":
@@ -74,7 +74,7 @@ if __name__ == "__main__":
     elif args["opp"].lower() == "mcts":
         opp = MCTSAgent(simulations=800, cpuct=3.5)
     elif args["opp"].lower() == "minimax":
-        opp = MinimaxAgent()
+        opp = MinimaxAgent(time_limit=1.0)
     elif args["opp"].lower() == "valuenet":
         opp = ValueNetAgent(game=args["game"])
     elif args["opp"].lower() == "alphazero":
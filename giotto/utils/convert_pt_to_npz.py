@@ -1,10 +1,15 @@
 import argparse
+import json
+from pathlib import Path
 
 import numpy as np
 import torch
 
+from giotto.agents.algorithms.alphazero.net_numpy import AlphaZeroNetNumpy, compare_nets, quantize_state_dict
 from giotto.agents.algorithms.value_net.value_net import ValueNet
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
 
 def convert_valuenet_pt_to_npz(pt_path: str, npz_path: str) -> None:
     """Convert a .pt checkpoint of a ValueNet to a .npz file.
@@ -29,7 +34,24 @@ def convert_valuenet_pt_to_npz(pt_path: str, npz_path: str) -> None:
     print(f"Exported ValueNet .npz to {npz_path}")
 
 
-def convert_alphazero_pt_to_npz(pt_path: str, npz_path: str) -> None:
+def load_positions(jsonl_path: str | Path, max_lines: int | None = None) -> list:
+    """[board, player_id] states of a validation JSONL dataset, as read by AlphaZeroTrainer.validate."""
+    states = []
+    with open(jsonl_path, encoding="utf-8") as file:
+        for line in file:
+            if max_lines is not None and len(states) >= max_lines:
+                break
+            line = line.strip()  # noqa: PLW2901
+            if not line:
+                continue
+            board, player_id = json.loads(line)["state"]
+            states.append([np.asarray(board, dtype=np.int64), int(player_id)])
+    return states
+
+
+def convert_alphazero_pt_to_npz(
+    pt_path: str, npz_path: str, *, quantize: str | None = None, calibration_path: str | Path | None = None
+) -> dict | None:
     """Convert a .pt state-dict of an AlphaZeroNet to a .npz file.
 
     Saves the full state_dict (including BatchNorm running_mean / running_var)
@@ -38,19 +60,34 @@ def convert_alphazero_pt_to_npz(pt_path: str, npz_path: str) -> None:
     Args:
         pt_path: Path to the .pt file (saved directly as state_dict, not nested).
         npz_path: Destination path for the .npz file.
+        quantize: optional weight quantization, "int8" or "float16", see quantize_state_dict.
+        calibration_path: optional validation JSONL dataset. With quantize, the quantized net is compared
+            to the float one on its positions.
+
+    Returns:
+        with quantize and calibration_path, the comparison of compare_nets. None otherwise.
     """
     from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
 
     if "tris" in pt_path.lower():
-        model = AlphaZeroNet(
-            input_size=[2, 3, 3], value_output_size=1, policy_output_size=9, channels=64, residual_blocks=5
-        )
+        config = {
+            "input_size": [2, 3, 3],
+            "value_output_size": 1,
+            "policy_output_size": 9,
+            "channels": 64,
+            "residual_blocks": 5,
+        }
     elif "connect4" in pt_path.lower():
-        model = AlphaZeroNet(
-            input_size=[2, 6, 7], value_output_size=1, policy_output_size=7, channels=128, residual_blocks=10
-        )
+        config = {
+            "input_size": [2, 6, 7],
+            "value_output_size": 1,
+            "policy_output_size": 7,
+            "channels": 128,
+            "residual_blocks": 10,
+        }
     else:
         raise ValueError("Game not specified for AlphaZeroNet .pt path.")
+    model = AlphaZeroNet(**config)
 
     # AlphaZero train.py saves state_dict directly (not nested).
     state_dict = torch.load(pt_path, map_location="cpu")
@@ -60,20 +97,44 @@ def convert_alphazero_pt_to_npz(pt_path: str, npz_path: str) -> None:
     # Use state_dict() (not named_parameters()) to capture BatchNorm buffers
     # (running_mean, running_var) needed for correct eval-mode inference.
     weights = {k: v.detach().cpu().numpy() for k, v in model.state_dict().items() if "num_batches_tracked" not in k}
-    np.savez_compressed(npz_path, **weights)
-    print(f"Exported AlphaZeroNet .npz to {npz_path}")
-
-
-def convert_pt_to_npz(pt_path: str, npz_path: str) -> None:
+    if quantize is None:
+        np.savez_compressed(npz_path, **weights)
+        print(f"Exported AlphaZeroNet .npz to {npz_path}")
+        return None
+
+    quantized = quantize_state_dict(weights, quantize)
+    np.savez_compressed(npz_path, **quantized)
+    print(f"Exported {quantize} AlphaZeroNet .npz to {npz_path} ({Path(npz_path).stat().st_size / 1024:.0f} KiB)")
+    if calibration_path is None:
+        return None
+    report = compare_nets(
+        AlphaZeroNetNumpy(**config).load_state_dict(weights),
+        AlphaZeroNetNumpy(**config).load_state_dict(quantized),
+        load_positions(calibration_path),
+    )
+    print(
+        f"{report['positions']} positions: policy top-1 agreement {report['top1_agreement']:.2%}, "
+        f"value MAE {report['value_mae']:.4f}"
+    )
+    return report
+
+
+def convert_pt_to_npz(
+    pt_path: str, npz_path: str, *, quantize: str | None = None, calibration_path: str | Path | None = None
+) -> None:
     """Auto-detect model type from filename and convert .pt to .npz.
 
     Args:
         pt_path: Path to the .pt file.
         npz_path: Destination path for the .npz file.
+        quantize: optional weight quantization of AlphaZeroNet models, "int8" or "float16".
+        calibration_path: optional validation JSONL dataset to compare the quantized model against.
     """
     name = pt_path.lower()
     if "alphazero" in name:
-        convert_alphazero_pt_to_npz(pt_path, npz_path)
+        convert_alphazero_pt_to_npz(pt_path, npz_path, quantize=quantize, calibration_path=calibration_path)
+    elif quantize is not None:
+        raise ValueError("Quantization is only supported for AlphaZeroNet models.")
     else:
         convert_valuenet_pt_to_npz(pt_path, npz_path)
 
@@ -81,9 +142,21 @@ def convert_pt_to_npz(pt_path: str, npz_path: str) -> None:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert .pt checkpoint to .npz")
     parser.add_argument("-p", "--path", help="path to .pt checkpoint", required=True)
+    parser.add_argument("-o", "--output", help="path of the .npz file [default: .pt path with .npz suffix]")
+    parser.add_argument("-q", "--quantize", help="quantize AlphaZeroNet weights", choices=["int8", "float16"])
+    parser.add_argument(
+        "-c",
+        "--calibration",
+        help="validation JSONL to compare the quantized model on [default: eval_datasets/<game>_positions.jsonl]",
+    )
     args = parser.parse_args()
 
     pt_path = args.path
-    npz_path = pt_path.replace(".pt", ".npz")
-
-    convert_pt_to_npz(pt_path, npz_path)
+    npz_path = args.output or pt_path.replace(".pt", ".npz")
+    calibration_path = args.calibration
+    if args.quantize and calibration_path is None:
+        game = "tris" if "tris" in pt_path.lower() else "connect4"
+        default_path = PROJECT_ROOT / "eval_datasets" / f"{game}_positions.jsonl"
+        calibration_path = default_path if default_path.exists() else None
+
+    convert_pt_to_npz(pt_path, npz_path, quantize=args.quantize, calibration_path=calibration_path)
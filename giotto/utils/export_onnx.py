@@ -2,6 +2,7 @@
 
 import argparse
 from pathlib import Path
+from typing import BinaryIO
 
 import numpy as np
 import torch
@@ -55,19 +56,32 @@ def export_model(game: str, output_dir: Path | None = None):
     dummy = torch.randn(1, c, h, w)
 
     onnx_path = output_dir / f"{game}.onnx"
+    export_net(net, onnx_path)
+    print(f"Exported {onnx_path} ({onnx_path.stat().st_size / 1024:.0f} KB)")
+
+    # Validate: compare PyTorch vs ONNX outputs
+    _validate(net, dummy, onnx_path)
+
+
+def export_net(net: AlphaZeroNet, f: str | Path | BinaryIO) -> None:
+    """Writes net as an ONNX model with a dynamic batch axis.
+
+    Args:
+        net: network, in eval mode.
+        f: destination path or binary file object.
+    """
+    c, h, w = net.input_size
     torch.onnx.export(
         net,
-        dummy,
-        str(onnx_path),
+        torch.zeros(1, c, h, w),
+        str(f) if isinstance(f, Path) else f,
         input_names=["input"],
         output_names=["policy", "value"],
         dynamic_axes={"input": {0: "batch"}, "policy": {0: "batch"}, "value": {0: "batch"}},
         opset_version=13,
+        # TorchScript exporter: the torch.export based one also needs onnxscript
+        dynamo=False,
     )
-    print(f"Exported {onnx_path} ({onnx_path.stat().st_size / 1024:.0f} KB)")
-
-    # Validate: compare PyTorch vs ONNX outputs
-    _validate(net, dummy, onnx_path)
 
 
 def _validate(net: AlphaZeroNet, dummy: torch.Tensor, onnx_path: Path):
@@ -21,16 +21,14 @@ class EquivalentBoards:
         self.reflect_vertical = reflect_vertical
         self.reflect_diag_nw_se = reflect_diag_nw_se
         self.reflect_diag_ne_sw = reflect_diag_ne_sw
+        # permutation tables, computed on first use for each board shape
+        self._cell_perms: dict[tuple, np.ndarray] = {}
+        self._policy_perms: dict[tuple, np.ndarray] = {}
 
-    def get_equivalent_boards(self, board: np.ndarray, policy_targets: np.ndarray | None = None):
-        """Generates all unique equivalent boards applying the specified symmetries.
-
-        Args:
-            board: original board as numpy array.
-            policy_targets: optionally an array with a value for each cell. In this case these are also augmented.
+    def transforms(self) -> list[tuple[str, callable]]:
+        """Returns (name, function) of the enabled transforms, identity first.
 
-        Returns:
-            list of equivalent boards as numpy arrays, or optionally list of board and targets pairs.
+        The position of a transform in this list is used as its transform id.
         """
         transforms = [("identity", identity)]
         if self.rotate90:
@@ -47,77 +45,156 @@ class EquivalentBoards:
             transforms.append(("reflect_diag_nw_se", reflect_diag_nw_se))
         if self.reflect_diag_ne_sw:
             transforms.append(("reflect_diag_ne_sw", reflect_diag_ne_sw))
+        return transforms
 
-        unique_boards: list[np.ndarray] = []
-        results = []
+    def cell_permutations(self, rows: int, cols: int) -> np.ndarray:
+        """Flat-index permutation of each enabled transform, identity first.
 
-        rows, cols = board.shape[:2]
-        for transform_name, transform_fn in transforms:
-            transformed_board = transform_fn(board)
+        For transform t, ``transformed.reshape(-1) == board.reshape(-1)[perms[t]]``. Computed once per board
+        shape, the returned array is shared and read-only.
 
-            if any(np.array_equal(transformed_board, seen) for seen in unique_boards):
-                continue
-            unique_boards.append(transformed_board)
+        Args:
+            rows: number of rows of the board.
+            cols: number of columns of the board.
 
-            if policy_targets is None:
-                results.append(transformed_board)
+        Returns:
+            array of shape (n_transforms, rows * cols).
+        """
+        key = (rows, cols)
+        if key not in self._cell_perms:
+            index_board = np.arange(rows * cols).reshape(rows, cols)
+            perms = []
+            for transform_name, transform_fn in self.transforms():
+                transformed = transform_fn(index_board)
+                if transformed.shape != (rows, cols):
+                    raise ValueError(
+                        f"Transform '{transform_name}' not supported: it changes the shape of a {rows}x{cols} board."
+                    )
+                perms.append(transformed.reshape(-1))
+            perms = np.stack(perms)
+            perms.flags.writeable = False
+            self._cell_perms[key] = perms
+        return self._cell_perms[key]
+
+    def policy_permutations(self, rows: int, cols: int, n_actions: int) -> np.ndarray:
+        """Action-index permutation of each enabled transform, identity first.
+
+        For transform t, the policy of the transformed position is ``policy[perms[t]]``. Policies over cells
+        (tris) follow the cell permutation; policies over columns (connect4) are supported for transforms that
+        move whole columns.
+
+        Args:
+            rows: number of rows of the board.
+            cols: number of columns of the board.
+            n_actions: size of the policy.
+
+        Returns:
+            read-only array of shape (n_transforms, n_actions).
+        """
+        key = (rows, cols, n_actions)
+        if key not in self._policy_perms:
+            cell_perms = self.cell_permutations(rows, cols)
+            if n_actions == rows * cols:
+                perms = cell_perms
+            elif n_actions == cols:
+                source_cols = cell_perms.reshape(-1, rows, cols) % cols
+                # every column of the transformed board must come from a single column
+                unsupported = np.flatnonzero(np.any(source_cols != source_cols[:, :1], axis=(1, 2)))
+                if len(unsupported):
+                    transform_name = self.transforms()[unsupported[0]][0]
+                    raise ValueError(
+                        f"Transform '{transform_name}' not supported for column-policy targets of shape {(cols,)}"
+                    )
+                perms = source_cols[:, 0].copy()
+                perms.flags.writeable = False
             else:
-                transformed_policy = self._transform_policy_targets(
-                    policy_targets=policy_targets,
-                    rows=rows,
-                    cols=cols,
-                    transform_name=transform_name,
+                raise ValueError(
+                    f"Unsupported policy_targets shape {(n_actions,)}. Expected {(rows * cols,)} or {(cols,)} ."
                 )
-                results.append((transformed_board, transformed_policy))
+            self._policy_perms[key] = perms
+        return self._policy_perms[key]
 
-        return results
+    def transform(
+        self, boards: np.ndarray, transform_ids: np.ndarray | int, policies: np.ndarray | None = None
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Applies a transform to each board of a batch, and optionally to its policy, with one gather.
 
-    def _transform_policy_targets(
-        self, policy_targets: np.ndarray, rows: int, cols: int, transform_name: str
-    ) -> np.ndarray:
-        """Augments policy targets accordingly to transformation."""
-        policy_targets = np.asarray(policy_targets, dtype=np.float32)
+        Args:
+            boards: boards of shape (N, rows, cols).
+            transform_ids: transform id (index in transforms()) of each board, or one id for all of them.
+            policies: optional policies of shape (N, A), over cells or columns.
 
-        # cellwise policy (TicTacToe): length rows*cols
-        if policy_targets.shape == (rows * cols,):
-            policy_grid = policy_targets.reshape(rows, cols)
-
-            if transform_name == "identity":
-                transformed_grid = identity(policy_grid)
-            elif transform_name == "rotate90":
-                transformed_grid = rotate90(policy_grid)
-            elif transform_name == "rotate180":
-                transformed_grid = rotate180(policy_grid)
-            elif transform_name == "rotate270":
-                transformed_grid = rotate270(policy_grid)
-            elif transform_name == "reflect_horizontal":
-                transformed_grid = reflect_horizontal(policy_grid)
-            elif transform_name == "reflect_vertical":
-                transformed_grid = reflect_vertical(policy_grid)
-            elif transform_name == "reflect_diag_nw_se":
-                transformed_grid = reflect_diag_nw_se(policy_grid)
-            elif transform_name == "reflect_diag_ne_sw":
-                transformed_grid = reflect_diag_ne_sw(policy_grid)
-            else:
-                raise ValueError(f"Unknown transform_name: {transform_name}")
+        Returns:
+            transformed boards, or (boards, policies) if policies are given.
+        """
+        n, rows, cols = boards.shape
+        transform_ids = np.broadcast_to(transform_ids, (n,))
+        flat = boards.reshape(n, rows * cols)
+        transformed = np.take_along_axis(flat, self.cell_permutations(rows, cols)[transform_ids], axis=1)
+        transformed = transformed.reshape(n, rows, cols)
+        if policies is None:
+            return transformed
+        policy_perms = self.policy_permutations(rows, cols, policies.shape[1])
+        return transformed, np.take_along_axis(policies, policy_perms[transform_ids], axis=1)
+
+    def canonical_transforms(self, boards: np.ndarray) -> np.ndarray:
+        """Id of the transform giving the lexicographically smallest (flattened) form of each board.
+
+        Args:
+            boards: boards of shape (N, rows, cols).
 
-            return transformed_grid.reshape(rows * cols)
+        Returns:
+            array of shape (N,) with the transform ids, the lowest one on ties.
+        """
+        n, rows, cols = boards.shape
+        # (N, n_transforms, cells)
+        candidates = boards.reshape(n, rows * cols)[:, self.cell_permutations(rows, cols)]
+        best = np.zeros(n, dtype=np.intp)
+        index = np.arange(n)
+        for t in range(1, candidates.shape[1]):
+            differs = candidates[:, t] != candidates[index, best]
+            # compare at the first differing cell
+            first = differs.argmax(axis=1)
+            smaller = differs.any(axis=1) & (candidates[index, t, first] < candidates[index, best, first])
+            best[smaller] = t
+        return best
+
+    def canonical(self, board: np.ndarray) -> tuple[np.ndarray, int]:
+        """Lexicographically smallest equivalent board and the id of the transform giving it."""
+        transform_id = int(self.canonical_transforms(board[None])[0])
+        return self.transform(board[None], transform_id)[0], transform_id
+
+    def get_equivalent_boards(self, board: np.ndarray, policy_targets: np.ndarray | None = None):
+        """Generates all unique equivalent boards applying the specified symmetries.
 
-        # column policy (Connect4): length cols
-        if policy_targets.shape == (cols,):
-            if transform_name in ("identity", "reflect_horizontal"):
-                # horizontal flip (up-down) doesn't change columns
-                return policy_targets.copy()
-            if transform_name == "reflect_vertical":
-                # mirror left-right => reverse column probabilities
-                return policy_targets[::-1].copy()
+        Args:
+            board: original board as numpy array.
+            policy_targets: optionally an array with a value for each cell. In this case these are also augmented.
 
-            # other transforms generally don't make sense for gravity-based Connect4.
-            raise ValueError(f"Transform '{transform_name}' not supported for column-policy targets of shape {(cols,)}")
+        Returns:
+            list of equivalent boards as numpy arrays, or optionally list of board and targets pairs.
+        """
+        rows, cols = board.shape[:2]
+        transformed = board.reshape(rows * cols)[self.cell_permutations(rows, cols)]
+        # first occurrence of each distinct board, in transform order
+        seen = set()
+        kept = []
+        for t, cells in enumerate(transformed):
+            key = cells.tobytes()
+            if key not in seen:
+                seen.add(key)
+                kept.append(t)
+        boards = [transformed[t].reshape(rows, cols) for t in kept]
+        if policy_targets is None:
+            return boards
 
-        raise ValueError(
-            f"Unsupported policy_targets shape {policy_targets.shape}. Expected {(rows*cols,)} or {(cols,)} ."
-        )
+        policy_targets = np.asarray(policy_targets, dtype=np.float32)
+        if policy_targets.ndim != 1:
+            raise ValueError(
+                f"Unsupported policy_targets shape {policy_targets.shape}. Expected {(rows * cols,)} or {(cols,)} ."
+            )
+        policy_perms = self.policy_permutations(rows, cols, len(policy_targets))
+        return [(board, policy_targets[policy_perms[t]]) for board, t in zip(boards, kept, strict=True)]
 
 
 def identity(board):
@@ -1,9 +1,11 @@
 import random
 from collections import Counter
 
+import numpy as np
 from tqdm import tqdm
 
 from giotto.agents.generic import GenericAgent
+from giotto.agents.random import RandomAgent
 from giotto.envs.generic import GenericEnv
 
 
@@ -45,26 +47,36 @@ def play_n_games(
     agents: list[GenericAgent],
     invert_starts: bool = True,
 ):
-    """Plays n games between two agents and returns stats."""
-    winners = Counter({agents[0].name: 0, agents[1].name: 0, "Draw": 0})
-    pbar = tqdm(range(n_games), desc="Playing games", ncols=100, leave=True)
-
-    starter = 0
-    for _ in pbar:
-        new_env = env.clone()
-        _, _, winner = play_game(new_env, agents, starter, render=False)
-        winners[winner] += 1
+    """Plays n games between two agents and returns stats.
 
-        if invert_starts:
-            starter = (starter + 1) % 2
+    Games between two random agents are all played in lockstep on the batch version of env.
+    """
+    winners = Counter({agents[0].name: 0, agents[1].name: 0, "Draw": 0})
 
-        pbar.set_postfix(
-            {
-                agents[0].name: winners[agents[0].name],
-                agents[1].name: winners[agents[1].name],
-                "Draw": winners["Draw"],
-            }
-        )
+    if all(isinstance(agent, RandomAgent) for agent in agents):
+        draws, wins_0, wins_1 = play_random_games(n_games, env, invert_starts)
+        winners[agents[0].name] += wins_0
+        winners[agents[1].name] += wins_1
+        winners["Draw"] += draws
+    else:
+        pbar = tqdm(range(n_games), desc="Playing games", ncols=100, leave=True)
+
+        starter = 0
+        for _ in pbar:
+            new_env = env.clone()
+            _, _, winner = play_game(new_env, agents, starter, render=False)
+            winners[winner] += 1
+
+            if invert_starts:
+                starter = (starter + 1) % 2
+
+            pbar.set_postfix(
+                {
+                    agents[0].name: winners[agents[0].name],
+                    agents[1].name: winners[agents[1].name],
+                    "Draw": winners["Draw"],
+                }
+            )
 
     # Final recap
     for agent in agents:
@@ -73,6 +85,26 @@ def play_n_games(
     return winners
 
 
+def play_random_games(n_games: int, env: GenericEnv, invert_starts: bool = True) -> list[int]:
+    """Plays n games between two random players in lockstep on the batch version of env.
+
+    Args:
+        n_games: number of games to play.
+        env: environment of the game.
+        invert_starts: alternate the starting player like play_n_games. Player 0 starts every game otherwise.
+
+    Returns:
+        [draws, player 0 wins, player 1 wins].
+    """
+    batch = env.batch_env(n_games, auto_reset=False)
+    starters = np.arange(n_games) % 2 if invert_starts else np.zeros(n_games, dtype=int)
+    for player in (0, 1):
+        batch.reset(starting_player=player, env_ids=np.flatnonzero(starters == player))
+    while not batch.done.all():
+        batch.step(batch.random_actions())
+    return np.bincount(batch.winner + 1, minlength=3).tolist()
+
+
 def initialized_game(
     env: GenericEnv,
     agents: list[GenericAgent],
@@ -0,0 +1,64 @@
+"""Fixtures shared by the AlphaZero tests."""
+
+import numpy as np
+import pytest
+import torch
+
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+
+
+class FakeNet:
+    """Deterministic cheap network: skewed priors and a material-count value."""
+
+    def __init__(self, n_actions):
+        self.policy_output_size = n_actions
+        self.policy = np.linspace(1.0, 2.0, n_actions, dtype=np.float32)
+        self.policy /= self.policy.sum()
+
+    def eval(self):
+        pass
+
+    def predict(self, state):
+        board, player = state
+        value = np.tanh(0.1 * np.sum(board == player) - 0.15 * np.sum(board == 1 - player) + 0.01 * board[0].sum())
+        return self.policy, np.float32(value)
+
+    def batch_predict(self, states):
+        results = [self.predict(state) for state in states]
+        return np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+
+@pytest.fixture
+def make_fake_net():
+    """Factory of FakeNet, taking the number of actions."""
+    return FakeNet
+
+
+@pytest.fixture
+def make_alphazero_net():
+    """Factory of seeded AlphaZeroNet in eval mode, built from a network config.
+
+    Args of the factory:
+        network: dict with input_size, policy_output_size, channels, residual_blocks and optionally
+            value_output_size (default 1), like the network section of the yaml configs.
+        seed: torch seed of the weights.
+        trained_bn: give the BatchNorm layers trained-like running statistics, so folding them is not a no-op.
+    """
+
+    def make(network: dict, seed: int = 0, trained_bn: bool = False) -> AlphaZeroNet:
+        torch.manual_seed(seed)
+        net = AlphaZeroNet(
+            input_size=network["input_size"],
+            value_output_size=network.get("value_output_size", 1),
+            policy_output_size=network["policy_output_size"],
+            channels=network["channels"],
+            residual_blocks=network["residual_blocks"],
+        )
+        if trained_bn:
+            for module in net.modules():
+                if isinstance(module, torch.nn.BatchNorm2d):
+                    module.running_mean.uniform_(-0.5, 0.5)
+                    module.running_var.uniform_(0.5, 2.0)
+        return net.eval()
+
+    return make
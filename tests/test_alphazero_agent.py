@@ -0,0 +1,45 @@
+"""Tests for the search tree reuse of AlphaZeroAgent."""
+
+from giotto.agents.alphazero import AlphaZeroAgent
+from giotto.envs.connect4 import Connect4Env
+
+
+class TestAlphaZeroAgentTreeReuse:
+    def test_tree_advanced_through_opponent_move(self, make_fake_net):
+        agent = AlphaZeroAgent(net=make_fake_net(7), simulations=100)
+        env = Connect4Env()
+        env.reset(0)
+
+        action = agent.select_action(env)
+        env.step(action)
+        reply = agent.mcts._root.children[4]
+        reused_visits = reply.n_visits
+        env.step(4)
+        agent.select_action(env)
+
+        assert reused_visits > 0
+        # the reply subtree was the root of the second search, which added its simulations on top
+        assert reply.n_visits == reused_visits + 100
+        assert agent._tree_moves[:2] == [action, 4]
+
+    def test_new_game_resets_tree(self, make_fake_net):
+        agent = AlphaZeroAgent(net=make_fake_net(7), simulations=50)
+        env = Connect4Env()
+        env.reset(0)
+        for _ in range(3):
+            env.step(agent.select_action(env))
+
+        env.reset(1)
+        env.step(3)
+        action = agent.select_action(env)
+        fresh = AlphaZeroAgent(net=make_fake_net(7), simulations=50)
+
+        assert action == fresh.select_action(env)
+        assert agent._tree_moves == [3, action]
+
+    def test_same_moves_as_without_reuse_at_the_first_move(self, make_fake_net):
+        env = Connect4Env()
+        env.reset(0)
+        reuse = AlphaZeroAgent(net=make_fake_net(7), simulations=80)
+        scratch = AlphaZeroAgent(net=make_fake_net(7), simulations=80, reuse_tree=False)
+        assert reuse.select_action(env) == scratch.select_action(env)
@@ -0,0 +1,116 @@
+"""Tests for the inference-optimized torch AlphaZero network."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+import yaml
+
+from giotto.agents.algorithms.alphazero import train
+from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS
+from giotto.agents.algorithms.alphazero.net_compiled import CompiledAlphaZeroNet, fuse_conv_bn
+from giotto.agents.algorithms.alphazero.train import AlphaZeroTrainer, _inference_net
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+
+TRIS_CFG = {"input_size": [2, 3, 3], "policy_output_size": 9, "channels": 8, "residual_blocks": 2}
+C4_CFG = {"input_size": [2, 6, 7], "policy_output_size": 7, "channels": 8, "residual_blocks": 2}
+CONFIG_PATH = Path(__file__).parents[1] / "giotto" / "agents" / "algorithms" / "alphazero" / "config_tris.yaml"
+
+
+def _states(cfg, n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows, cols = cfg["input_size"][1:]
+    return [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(n)]
+
+
+@pytest.fixture(params=[TRIS_CFG, C4_CFG], ids=["tris", "connect4"])
+def cfg(request):
+    return request.param
+
+
+class TestFuseConvBn:
+    def test_matches_eager_net(self, cfg, make_alphazero_net):
+        net = make_alphazero_net(cfg, trained_bn=True)
+        fused = fuse_conv_bn(net)
+        x = torch.rand(5, *cfg["input_size"])
+        with torch.inference_mode():
+            for expected, got in zip(net(x), fused(x), strict=True):
+                torch.testing.assert_close(got, expected, rtol=1e-5, atol=1e-5)
+        assert not any(isinstance(module, torch.nn.BatchNorm2d) for module in fused.modules())
+        # the source net keeps its BatchNorms
+        assert isinstance(net.bn, torch.nn.BatchNorm2d)
+
+
+class TestCompiledAlphaZeroNet:
+    @pytest.mark.parametrize("mode", ["none", "trace", "script"])
+    @pytest.mark.parametrize("channels_last", [False, True])
+    def test_matches_eager_net(self, cfg, mode, channels_last, make_alphazero_net):
+        net = make_alphazero_net(cfg, trained_bn=True)
+        compiled = CompiledAlphaZeroNet(net, mode=mode, channels_last=channels_last)
+        # traced with one state, used with batches of any size
+        for n in (1, 7):
+            states = _states(cfg, n, seed=n)
+            policies, values = compiled.batch_predict(states)
+            expected_policies, expected_values = net.batch_predict(states)
+            assert policies.shape == (n, cfg["policy_output_size"])
+            assert values.shape == (n,)
+            np.testing.assert_allclose(policies, expected_policies, rtol=1e-5, atol=1e-5)
+            np.testing.assert_allclose(values, expected_values, rtol=1e-5, atol=1e-5)
+
+    def test_bf16_close_to_float(self, cfg, make_alphazero_net):
+        net = make_alphazero_net(cfg, trained_bn=True)
+        compiled = CompiledAlphaZeroNet(net, bf16=True)
+        state = _states(cfg, 1)[0]
+        policy, value = compiled.predict(state)
+        expected_policy, expected_value = net.predict(state)
+        assert policy.dtype == np.float32
+        np.testing.assert_allclose(policy, expected_policy, atol=2e-2)
+        assert abs(float(value) - float(expected_value)) < 2e-2
+
+    def test_unknown_mode_raises(self, make_alphazero_net):
+        with pytest.raises(ValueError):
+            CompiledAlphaZeroNet(make_alphazero_net(TRIS_CFG, trained_bn=True), mode="jit")
+
+    def test_runs_mcts(self, make_alphazero_net):
+        net = CompiledAlphaZeroNet(make_alphazero_net(C4_CFG, trained_bn=True), channels_last=True)
+        env = Connect4Env()
+        action, root = AlphaZeroMCTS(net=net, n_simulations=16, cpuct=1.4).run(env, temperature=0.0)
+        assert action in env.get_valid_actions()
+        assert sum(child.n_visits for child in root.children.values()) > 0
+
+    def test_selected_from_network_config(self, make_alphazero_net):
+        net = make_alphazero_net(TRIS_CFG, trained_bn=True)
+        config = {"network": {"backend": "compiled", "compile_mode": "script", "channels_last": True}}
+        search_net = _inference_net(net, config)
+        assert isinstance(search_net, CompiledAlphaZeroNet)
+        assert search_net.mode == "script"
+        assert search_net.memory_format == torch.channels_last
+
+    def test_single_worker_training_searches_on_compiled_net(self, tmp_path, monkeypatch):
+        built = []
+
+        class SpyCompiledNet(CompiledAlphaZeroNet):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.calls = 0
+                built.append(self)
+
+            def batch_predict(self, states):
+                self.calls += 1
+                return super().batch_predict(states)
+
+        monkeypatch.setattr(train, "CompiledAlphaZeroNet", SpyCompiledNet)
+        with open(CONFIG_PATH) as f:
+            config = yaml.safe_load(f)
+        config["network"].update({"channels": 8, "residual_blocks": 1, "backend": "compiled", "compile_mode": "none"})
+        config["mcts"]["n_sims"] = 8
+        config["training"].update({"iterations": 1, "games_per_iteration": 2, "batch_size": 8, "n_play_workers": 1})
+        config["eval"].update({"run_eval": False, "play_vs_mcts": False})
+        trainer = AlphaZeroTrainer(TrisEnv(), config, save_dir=tmp_path)
+        trainer.train()
+
+        assert len(built) == 1
+        assert built[0].calls > 0
+        assert (tmp_path / "checkpoint_iter_1.pt").exists()
@@ -1,5 +1,6 @@
 """Verify that AlphaZeroNetNumpy produces outputs numerically identical to AlphaZeroNet (PyTorch)."""
 
+import tracemalloc
 from pathlib import Path
 
 import numpy as np
@@ -7,7 +8,12 @@ import pytest
 import torch
 
 from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
-from giotto.agents.algorithms.alphazero.net_numpy import AlphaZeroNetNumpy
+from giotto.agents.algorithms.alphazero.net_numpy import (
+    AlphaZeroNetNumpy,
+    compare_nets,
+    dequantize_state_dict,
+    quantize_state_dict,
+)
 
 
 def _make_pair(input_size, policy_output_size, channels, residual_blocks):
@@ -118,6 +124,66 @@ class TestBatchPredict:
         np.testing.assert_allclose(float(value_single), float(values_batch[0]), rtol=1e-6, atol=1e-6)
 
 
+class TestFoldedBatchNorm:
+    def test_trained_statistics_match_torch(self, net_pair):
+        (torch_net, numpy_net), cfg = net_pair
+        generator = torch.Generator().manual_seed(5)
+        with torch.no_grad():
+            for module in torch_net.modules():
+                if isinstance(module, torch.nn.BatchNorm2d):
+                    n = module.num_features
+                    module.running_mean.copy_(torch.randn(n, generator=generator))
+                    module.running_var.copy_(torch.rand(n, generator=generator) + 0.5)
+                    module.weight.copy_(torch.randn(n, generator=generator))
+                    module.bias.copy_(torch.randn(n, generator=generator))
+        numpy_net.load_state_dict(torch_net.state_dict())
+
+        rows, cols = cfg["input_size"][1], cfg["input_size"][2]
+        rng = np.random.default_rng(6)
+        states = [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(5)]
+        t_policies, t_values = torch_net.batch_predict(states)
+        n_policies, n_values = numpy_net.batch_predict(states)
+
+        np.testing.assert_allclose(t_policies, n_policies, rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(t_values, n_values, rtol=1e-4, atol=1e-5)
+
+    def test_forward_needs_weights(self):
+        numpy_net = AlphaZeroNetNumpy(input_size=[2, 3, 3], value_output_size=1, policy_output_size=9, channels=8)
+        with pytest.raises(RuntimeError):
+            numpy_net.predict([np.zeros((3, 3)), 0])
+
+
+class TestWorkspaces:
+    def test_reused_buffers_give_same_outputs(self, net_pair):
+        (torch_net, numpy_net), cfg = net_pair
+        rows, cols = cfg["input_size"][1], cfg["input_size"][2]
+        rng = np.random.default_rng(7)
+        states = [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(4)]
+
+        first = numpy_net.batch_predict(states)
+        numpy_net.batch_predict(states[:1])
+        policies, values = numpy_net.batch_predict(states)
+        # outputs are not views of the buffers
+        np.testing.assert_array_equal(first[0], policies)
+        np.testing.assert_array_equal(first[1], values)
+        t_policies, _ = torch_net.batch_predict(states)
+        np.testing.assert_allclose(t_policies, policies, rtol=1e-5, atol=1e-5)
+
+    def test_forward_allocates_only_outputs_after_warm_up(self, net_pair):
+        (_, numpy_net), cfg = net_pair
+        x = np.random.default_rng(8).random((8, *cfg["input_size"]), dtype=np.float32)
+        numpy_net.forward(x)
+        tracemalloc.start()
+        try:
+            numpy_net.forward(x)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # the two returned arrays plus interpreter noise, far below one activation tensor
+        activation_bytes = x.shape[0] * cfg["channels"] * cfg["input_size"][1] * cfg["input_size"][2] * 4
+        assert peak < min(4096, activation_bytes)
+
+
 # ─── npz round-trip via converter ───────────────────────────────────────────
 
 
@@ -208,3 +274,44 @@ def test_converter_real_model(pt_path, cfg, tmp_path):
 
     np.testing.assert_allclose(t_policy, n_policy, rtol=1e-5, atol=1e-5)
     np.testing.assert_allclose(float(t_value), float(n_value), rtol=1e-5, atol=1e-5)
+
+
+# ─── quantized weights ───────────────────────────────────────────────────────
+
+
+class TestQuantization:
+    @pytest.mark.parametrize("mode", ["int8", "float16"])
+    def test_quantized_net_agrees_with_float(self, net_pair, mode, tmp_path):
+        (torch_net, numpy_net), cfg = net_pair
+        npz_path = tmp_path / "alphazero.npz"
+        np.savez_compressed(str(npz_path), **quantize_state_dict(torch_net.state_dict(), mode))
+
+        quantized_net = AlphaZeroNetNumpy(value_output_size=1, **cfg)
+        quantized_net.load_numpy_weights(str(npz_path))
+
+        rng = np.random.default_rng(5)
+        rows, cols = cfg["input_size"][1], cfg["input_size"][2]
+        states = [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(64)]
+        report = compare_nets(numpy_net, quantized_net, states)
+        assert report["positions"] == 64
+        assert report["top1_agreement"] >= 0.9
+        assert report["value_mae"] < 0.01
+
+    def test_int8_weights_are_smaller(self, net_pair):
+        (torch_net, _), _ = net_pair
+        state_dict = {k: v for k, v in torch_net.state_dict().items() if "num_batches_tracked" not in k}
+        quantized = quantize_state_dict(state_dict, "int8")
+        assert quantized["conv.weight"].dtype == np.int8
+        assert quantized["conv.weight_scale"].shape == (quantized["conv.weight"].shape[0],)
+        # 1-d parameters are kept in float32
+        assert quantized["bn.weight"].dtype == np.float32
+        restored = dequantize_state_dict(quantized)
+        error = np.abs(restored["policy_fc.weight"] - state_dict["policy_fc.weight"].numpy())
+        assert (error <= quantized["policy_fc.weight_scale"][:, None] / 2 + 1e-7).all()
+
+        assert sum(v.nbytes for v in quantized.values()) < 0.5 * sum(v.numpy().nbytes for v in state_dict.values())
+
+    def test_unknown_mode_raises(self, net_pair):
+        (torch_net, _), _ = net_pair
+        with pytest.raises(ValueError):
+            quantize_state_dict(torch_net.state_dict(), "int4")
@@ -0,0 +1,138 @@
+"""Tests for the onnxruntime backend of the AlphaZero network."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+pytest.importorskip("onnxruntime")
+
+from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS
+from giotto.agents.algorithms.alphazero.net_onnx import OnnxAlphaZeroNet
+from giotto.agents.algorithms.alphazero.train import AlphaZeroTrainer, _inference_net
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+from giotto.utils.export_onnx import export_net
+
+TRIS_CFG = {"input_size": [2, 3, 3], "policy_output_size": 9, "channels": 8, "residual_blocks": 2}
+C4_CFG = {"input_size": [2, 6, 7], "policy_output_size": 7, "channels": 8, "residual_blocks": 2}
+CONFIG_PATH = Path(__file__).parents[1] / "giotto" / "agents" / "algorithms" / "alphazero" / "config_tris.yaml"
+
+
+@pytest.fixture(params=[TRIS_CFG, C4_CFG], ids=["tris", "connect4"])
+def net_pair(request, make_alphazero_net):
+    cfg = request.param
+    torch_net = make_alphazero_net(cfg)
+    return torch_net, OnnxAlphaZeroNet.from_net(torch_net, intra_op_threads=1), cfg
+
+
+def _states(cfg, n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows, cols = cfg["input_size"][1:]
+    return [[rng.integers(-1, 2, size=(rows, cols)), i % 2] for i in range(n)]
+
+
+class TestOnnxAlphaZeroNet:
+    def test_batch_predict_matches_torch(self, net_pair):
+        torch_net, onnx_net, cfg = net_pair
+        states = _states(cfg, 6)
+        t_policies, t_values = torch_net.batch_predict(states)
+        o_policies, o_values = onnx_net.batch_predict(states)
+
+        assert o_policies.shape == (6, cfg["policy_output_size"])
+        assert o_values.shape == (6,)
+        np.testing.assert_allclose(o_policies, t_policies, rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(o_values, t_values, rtol=1e-4, atol=1e-5)
+
+    def test_predict_and_interface(self, net_pair):
+        torch_net, onnx_net, cfg = net_pair
+        state = _states(cfg, 1, seed=1)[0]
+        t_policy, t_value = torch_net.predict(state)
+        o_policy, o_value = onnx_net.predict(state)
+
+        np.testing.assert_allclose(o_policy, t_policy, rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(float(o_value), float(t_value), rtol=1e-4, atol=1e-5)
+        assert onnx_net.policy_output_size == cfg["policy_output_size"]
+        assert onnx_net.input_size == cfg["input_size"]
+        assert onnx_net.eval() is onnx_net
+
+    def test_loads_exported_file(self, net_pair, tmp_path):
+        torch_net, onnx_net, cfg = net_pair
+        path = tmp_path / "model.onnx"
+        export_net(torch_net, path)
+        from_file = OnnxAlphaZeroNet(path, graph_optimization="basic")
+        states = _states(cfg, 3, seed=2)
+        np.testing.assert_allclose(from_file.batch_predict(states)[0], onnx_net.batch_predict(states)[0], atol=1e-6)
+
+    def test_unknown_optimization_level_raises(self, net_pair, tmp_path):
+        torch_net, _, _ = net_pair
+        path = tmp_path / "model.onnx"
+        export_net(torch_net, path)
+        with pytest.raises(ValueError):
+            OnnxAlphaZeroNet(path, graph_optimization="max")
+
+    def test_runs_mcts(self, make_alphazero_net):
+        net = OnnxAlphaZeroNet.from_net(make_alphazero_net(C4_CFG))
+        env = Connect4Env()
+        action, root = AlphaZeroMCTS(net=net, n_simulations=16, cpuct=1.4).run(env, temperature=0.0)
+        assert action in env.get_valid_actions()
+        assert sum(child.n_visits for child in root.children.values()) > 0
+
+
+class TestInferenceNet:
+    @pytest.mark.parametrize("backend", ["torch", "onnx", "numpy"])
+    def test_backends_agree(self, backend, make_alphazero_net):
+        net = make_alphazero_net(TRIS_CFG)
+        config = {"network": {"value_output_size": 1, "backend": backend, "onnx_threads": 1, **TRIS_CFG}}
+        search_net = _inference_net(net, config)
+
+        assert (search_net is net) == (backend == "torch")
+        states = _states(TRIS_CFG, 4)
+        np.testing.assert_allclose(search_net.batch_predict(states)[0], net.batch_predict(states)[0], atol=1e-5)
+
+    def test_unknown_backend_raises(self, make_alphazero_net):
+        net = make_alphazero_net(TRIS_CFG)
+        with pytest.raises(ValueError):
+            _inference_net(net, {"network": {"backend": "tensorrt"}})
+
+    @pytest.mark.parametrize("backend", ["compiled", "onnx", "numpy"])
+    def test_inference_server_rejects_other_backends(self, backend, tmp_path):
+        with open(CONFIG_PATH) as f:
+            config = yaml.safe_load(f)
+        config["network"]["backend"] = backend
+        config["training"].update({"inference_server": True, "n_play_workers": 2})
+        trainer = AlphaZeroTrainer(TrisEnv(), config, save_dir=tmp_path)
+        with pytest.raises(ValueError, match="inference_server"):
+            trainer.train()
+        with pytest.raises(ValueError, match="inference_server"):
+            trainer.self_play_parallel(2, num_workers=2)
+
+    def test_trainer_self_play_on_onnx(self, tmp_path):
+        with open(CONFIG_PATH) as f:
+            config = yaml.safe_load(f)
+        config["network"].update({"channels": 8, "residual_blocks": 1, "backend": "onnx", "onnx_threads": 1})
+        config["mcts"]["n_sims"] = 8
+        records = AlphaZeroTrainer(TrisEnv(), config, save_dir=tmp_path).self_play(1)
+        assert len(records) >= 5
+        assert all(abs(record["policy_target"].sum() - 1.0) < 1e-5 for record in records)
+
+    def test_single_worker_training_searches_on_onnx(self, tmp_path, monkeypatch):
+        calls = []
+        batch_predict = OnnxAlphaZeroNet.batch_predict
+
+        def counting_batch_predict(net, states):
+            calls.append(len(states))
+            return batch_predict(net, states)
+
+        monkeypatch.setattr(OnnxAlphaZeroNet, "batch_predict", counting_batch_predict)
+        with open(CONFIG_PATH) as f:
+            config = yaml.safe_load(f)
+        config["network"].update({"channels": 8, "residual_blocks": 1, "backend": "onnx", "onnx_threads": 1})
+        config["mcts"]["n_sims"] = 8
+        config["training"].update({"iterations": 1, "games_per_iteration": 2, "batch_size": 8, "n_play_workers": 1})
+        config["eval"].update({"run_eval": False, "play_vs_mcts": False})
+        AlphaZeroTrainer(TrisEnv(), config, save_dir=tmp_path).train()
+
+        assert calls
+        assert (tmp_path / "checkpoint_iter_1.pt").exists()
@@ -0,0 +1,87 @@
+"""Tests for the array-backed AlphaZero MCTS tree against the AZNode tree."""
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.alphazero.array_mcts import ArrayAlphaZeroMCTS, ArrayTree
+from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+
+
+def _visits(root):
+    return {action: child.n_visits for action, child in root.children.items()}
+
+
+@pytest.mark.parametrize("env_cls,n_actions", [(TrisEnv, 9), (Connect4Env, 7)])
+@pytest.mark.parametrize("batch_size", [1, 8])
+class TestArrayMCTSMatchesObjectTree:
+    def test_same_visits_with_tree_reuse(self, env_cls, n_actions, batch_size, make_fake_net):
+        net = make_fake_net(n_actions)
+        env = env_cls()
+        env.reset(0)
+        searches = [
+            AlphaZeroMCTS(net, n_simulations=200, cpuct=1.5, batch_size=batch_size),
+            ArrayAlphaZeroMCTS(net, n_simulations=200, cpuct=1.5, batch_size=batch_size, capacity=16),
+        ]
+        for _ in range(4):
+            results = []
+            for mcts in searches:
+                run = mcts.run if batch_size == 1 else mcts.run_batched
+                action, root = run(env)
+                results.append((action, _visits(root), root.n_visits))
+            assert results[0] == results[1]
+            action = results[0][0]
+            for mcts in searches:
+                mcts.advance_root(action)
+            env.step(action)
+
+
+class TestArrayTree:
+    def test_expand_and_select(self):
+        tree = ArrayTree(capacity=2)
+        root = tree.add_root()
+        policy = np.array([0.1, 0.2, 0.3, 0.4], dtype=np.float32)
+        tree.expand(root, 0, [1, 3, 4], policy)
+        children = tree.children(root)
+        assert len(children) == 3
+        assert tree.action[children.start : children.stop].tolist() == [1, 3, 4]
+        assert np.isclose(tree.prob[children.start : children.stop].sum(), 1.0)
+        assert tree.action[tree.select_child(root, cpuct=1.0)] == 4
+
+    def test_compact_keeps_subtree(self):
+        tree = ArrayTree()
+        root = tree.add_root()
+        policy = np.full(3, 1 / 3, dtype=np.float32)
+        tree.expand(root, 0, [1, 2, 3], policy)
+        first, second, _ = tree.children(root)
+        tree.expand(second, 1, [1, 2], policy)
+        grandchild = tree.children(second)[1]
+        tree.expand(grandchild, 0, [3], policy)
+        tree.backpropagate([root, second, grandchild], 0.5)
+
+        tree.compact(second)
+        assert tree.size == 4
+        assert tree.parent[0] == -1
+        assert tree.n_visits[0] == 1 and tree.total_score[0] == -0.5
+        children = tree.children(0)
+        assert tree.action[children.start : children.stop].tolist() == [1, 2]
+        assert all(tree.parent[c] == 0 for c in children)
+        assert tree.total_score[children[1]] == 0.5
+        (great_grandchild,) = tree.children(children[1])
+        assert tree.parent[great_grandchild] == children[1]
+        assert tree.action[great_grandchild] == 3
+
+    def test_backpropagate_many_matches_single(self):
+        single, many = ArrayTree(), ArrayTree()
+        for tree in (single, many):
+            root = tree.add_root()
+            tree.expand(root, 0, [1, 2], np.array([0.5, 0.5], dtype=np.float32))
+        paths = [[0, 1], [0, 2], [0, 1]]
+        values = [0.3, -0.2, 1.0]
+        for path, value in zip(paths, values):
+            single.backpropagate(path, value)
+        many.backpropagate_many(paths, values)
+        assert np.array_equal(single.n_visits, many.n_visits)
+        assert np.allclose(single.total_score, many.total_score)
+        assert np.allclose(single.neg_value, many.neg_value)
@@ -0,0 +1,118 @@
+"""Tests for the vectorized batch environments against the single envs."""
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.mcts import MCTS
+from giotto.agents.random import RandomAgent
+from giotto.envs.batch_connect4 import BatchConnect4Env
+from giotto.envs.batch_tris import BatchTrisEnv
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+from giotto.utils.text_play import play_n_games, play_random_games
+
+BATCH_ENVS = [(BatchTrisEnv, TrisEnv), (BatchConnect4Env, Connect4Env)]
+
+
+@pytest.mark.parametrize("batch_cls,env_cls", BATCH_ENVS)
+class TestBatchEnvs:
+    def test_initial_state(self, batch_cls, env_cls):
+        batch = batch_cls(8, seed=0)
+        assert batch.boards.shape == (8, *env_cls().board.shape)
+        assert np.all(batch.boards == -1)
+        assert batch.valid_action_mask().all()
+        assert not batch.done.any()
+
+    def test_lockstep_matches_single_envs(self, batch_cls, env_cls):
+        n = 64
+        batch = batch_cls(n, auto_reset=False, seed=1)
+        envs = []
+        for i in range(n):
+            env = env_cls()
+            env.reset(starting_player=int(batch.current_player[i]))
+            envs.append(env)
+
+        while not batch.done.all():
+            mask = batch.valid_action_mask()
+            actions = batch.random_actions()
+            done, winner = batch.step(actions)
+            for i, env in enumerate(envs):
+                if env.done:
+                    continue
+                assert sorted(env.get_valid_actions()) == list(np.flatnonzero(mask[i]) + 1)
+                env.step(int(actions[i]))
+                assert np.array_equal(batch.boards[i], env.board)
+                assert done[i] == env.done
+                assert winner[i] == env.info.get("winner", -1)
+                assert batch.current_player[i] == env.current_player
+
+    def test_check_win_matches_step(self, batch_cls, env_cls):
+        batch = batch_cls(128, auto_reset=False, seed=2)
+        while not batch.done.all():
+            batch.step(batch.random_actions())
+        for player in (0, 1):
+            assert np.array_equal(batch.check_win(player), batch.winner == player)
+
+    def test_auto_reset(self, batch_cls, env_cls):
+        batch = batch_cls(32, seed=3)
+        results = batch.play_random_games(200)
+        assert results.sum() >= 200
+        assert batch.games_finished == results.sum()
+        assert not batch.done.any()
+
+    def test_invalid_action_raises(self, batch_cls, env_cls):
+        batch = batch_cls(1, seed=4)
+        rows = batch.rows
+        with pytest.raises(ValueError):
+            for _ in range(rows + 1):
+                batch.step(np.array([1]))
+
+    def test_set_position_continues_single_env(self, batch_cls, env_cls):
+        env = env_cls()
+        env.reset(starting_player=1)
+        for action in (1, 2, 3, 5):
+            env.step(action)
+        batch = env.batch_env(16, auto_reset=False, seed=5)
+        assert isinstance(batch, batch_cls)
+        batch.set_position(env.board, env.current_player)
+
+        envs = [env.clone() for _ in range(batch.n_envs)]
+        while not batch.done.all():
+            actions = batch.random_actions()
+            done, winner = batch.step(actions)
+            for i, single in enumerate(envs):
+                if single.done:
+                    continue
+                single.step(int(actions[i]))
+                assert np.array_equal(batch.boards[i], single.board)
+                assert done[i] == single.done
+                assert winner[i] == single.info.get("winner", -1)
+
+    def test_batch_rollout_restores_env(self, batch_cls, env_cls):
+        env = env_cls()
+        env.reset(starting_player=0)
+        for action in (1, 2, 3):
+            env.step(action)
+        board, hash_key = env.board.copy(), env.hash_key
+        value = MCTS(n_simulations=1, n_rollouts=32).rollout(env, root_player=0)
+        assert -1.0 <= value <= 1.0
+        assert np.array_equal(env.board, board)
+        assert env.hash_key == hash_key
+
+    def test_play_random_games(self, batch_cls, env_cls):
+        results = play_random_games(101, env_cls(), invert_starts=True)
+        assert sum(results) == 101
+        winners = play_n_games(50, env_cls(), [RandomAgent("first"), RandomAgent("second")])
+        assert sum(winners.values()) == 50
+
+
+def test_batch_rollout_averages_playouts():
+    env = TrisEnv()
+    env.reset(starting_player=0)
+    # player 0 completes the right column with the last empty cell
+    for action in (1, 2, 3, 4, 6, 5, 8, 7):
+        env.step(action)
+    mcts = MCTS(n_simulations=1, n_rollouts=8)
+    assert mcts.rollout(env, root_player=0) == 1.0
+    assert mcts.rollout(env, root_player=1) == -1.0
+    assert MCTS(n_simulations=50, n_rollouts=8).run(env) == 9
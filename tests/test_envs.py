@@ -407,3 +407,197 @@ class TestConnect4EnvClone:
                 env.step(action)
         clone = env.clone()
         assert clone.info["winner"] == env.info["winner"]
+
+
+def _reference_connect4_win(board, player_idx):
+    """Brute-force four-in-a-row check used to validate the bitboard implementation."""
+    rows, cols = board.shape
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                cells = [(r + i * dr, c + i * dc) for i in range(4)]
+                if all(0 <= rr < rows and 0 <= cc < cols and board[rr, cc] == player_idx for rr, cc in cells):
+                    return True
+    return False
+
+
+class TestConnect4EnvBitboard:
+    def test_random_games_match_reference(self):
+        rng = np.random.default_rng(0)
+        env = Connect4Env()
+        for _ in range(200):
+            env.reset(int(rng.integers(2)))
+            while not env.done:
+                env.step(int(rng.choice(env.get_valid_actions())))
+                board = env.board
+                for player_idx in (0, 1):
+                    assert env.check_win(player_idx) == _reference_connect4_win(board, player_idx)
+            assert (board != -1).sum() == env.turn_counter
+
+    def test_board_view_matches_moves(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [4, 4, 3, 5]:
+            env.step(action)
+        expected = np.full((6, 7), -1)
+        expected[0, 3], expected[1, 3], expected[0, 2], expected[0, 4] = 0, 1, 0, 1
+        assert np.array_equal(env.board, expected)
+        assert np.array_equal(env.get_state()[0], expected)
+
+    def test_board_setter_loads_position(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [1, 2, 1, 2, 1, 2]:
+            env.step(action)
+        other = Connect4Env()
+        other.reset(0)
+        other.board = env.board.copy()
+        assert other.get_valid_actions() == env.get_valid_actions()
+        assert other.decode_action(1) == (3, 0)
+        other.step(1)
+        assert other.check_win(0)
+
+    def test_board_setter_updates_position_keys_and_copies(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [4, 3, 4, 5, 2, 2]:
+            env.step(action)
+        other = Connect4Env()
+        other.reset(0)
+        other.step(7)
+        other.current_player = env.current_player
+        board = env.board.copy()
+        other.board = board
+        assert other.hash_key == env.hash_key
+        assert other.canonical_hash_key == env.canonical_hash_key
+        board[0, 0] = 1
+        assert other.board[0, 0] == -1
+
+    def test_no_wrap_around_columns(self):
+        # pieces at the top of one column and the bottom of the next must not form a vertical line
+        env = Connect4Env()
+        env.reset(0)
+        for action in [1, 1, 1, 2, 1, 3, 2, 1, 2, 1]:
+            env.step(action)
+        assert not env.done
+        assert not env.check_win(0)
+        assert not env.check_win(1)
+
+
+@pytest.mark.parametrize("env_cls", [TrisEnv, Connect4Env], ids=["tris", "connect4"])
+class TestUndo:
+    def test_undo_restores_previous_state(self, env_cls):
+        rng = np.random.default_rng(1)
+        env = env_cls()
+        for _ in range(50):
+            env.reset(int(rng.integers(2)))
+            snapshots = []
+            while not env.done:
+                snapshots.append(env.clone())
+                env.step(int(rng.choice(env.get_valid_actions())))
+            while snapshots:
+                env.undo()
+                expected = snapshots.pop()
+                assert np.array_equal(env.board, expected.board)
+                assert env.current_player == expected.current_player
+                assert env.turn_counter == expected.turn_counter
+                assert env.done == expected.done
+                assert env.info == expected.info
+                assert env.get_valid_actions() == expected.get_valid_actions()
+
+    def test_undo_clears_winner(self, env_cls):
+        env = env_cls()
+        env.reset(0)
+        moves = [1, 4, 2, 5, 3] if env_cls is TrisEnv else [1, 2, 1, 2, 1, 2, 1]
+        for action in moves:
+            env.step(action)
+        assert env.done
+        env.undo()
+        assert not env.done
+        assert "winner" not in env.info
+        assert env.current_player == 0
+        env.step(moves[-1])
+        assert env.info["winner"] == 0
+
+    def test_undo_on_empty_history_raises(self, env_cls):
+        env = env_cls()
+        env.reset(0)
+        with pytest.raises(ValueError, match="No moves to undo"):
+            env.undo()
+
+
+@pytest.mark.parametrize("env_cls", [TrisEnv, Connect4Env], ids=["tris", "connect4"])
+class TestZobristHash:
+    def test_incremental_key_matches_recomputed_key(self, env_cls):
+        rng = np.random.default_rng(2)
+        env = env_cls()
+        for _ in range(30):
+            env.reset(int(rng.integers(2)))
+            start_key = env.hash_key
+            while not env.done:
+                env.step(int(rng.choice(env.get_valid_actions())))
+                incremental = (env.hash_key, env.canonical_hash_key)
+                env._init_hash()
+                assert (env.hash_key, env.canonical_hash_key) == incremental
+            while env.info["moves"]:
+                env.undo()
+            assert env.hash_key == start_key
+
+    def test_transpositions_share_key(self, env_cls):
+        env_a, env_b = env_cls(), env_cls()
+        env_a.reset(0)
+        env_b.reset(0)
+        for action in [1, 2, 3]:
+            env_a.step(action)
+        for action in [3, 2, 1]:
+            env_b.step(action)
+        assert np.array_equal(env_a.board, env_b.board)
+        assert env_a.hash_key == env_b.hash_key
+
+    def test_player_to_move_changes_key(self, env_cls):
+        env_a, env_b = env_cls(), env_cls()
+        env_a.reset(0)
+        env_b.reset(1)
+        assert env_a.hash_key != env_b.hash_key
+
+    def test_undo_restores_key(self, env_cls):
+        env = env_cls()
+        env.reset(0)
+        env.step(2)
+        key = env.hash_key
+        env.step(3)
+        assert env.hash_key != key
+        env.undo()
+        assert env.hash_key == key
+
+    def test_clone_copies_key(self, env_cls):
+        env = env_cls()
+        env.reset(0)
+        env.step(2)
+        clone = env.clone()
+        assert clone.hash_key == env.hash_key
+        clone.step(1)
+        assert clone.hash_key != env.hash_key
+
+    def test_mirrored_positions_share_canonical_key(self, env_cls):
+        env_a, env_b = env_cls(), env_cls()
+        env_a.reset(0)
+        env_b.reset(0)
+        # left-right mirror of each other on both boards
+        for a, b in [(1, 3), (4, 6)] if env_cls is TrisEnv else [(1, 7), (2, 6)]:
+            env_a.step(a)
+            env_b.step(b)
+        assert env_a.hash_key != env_b.hash_key
+        assert env_a.canonical_hash_key == env_b.canonical_hash_key
+
+    def test_canonical_transform_gives_canonical_board(self, env_cls):
+        env = env_cls()
+        env.reset(0)
+        for action in [1, 2]:
+            env.step(action)
+        _, transform_fn = env.simmetries.transforms()[env.canonical_transform]
+        canonical_env = env_cls()
+        canonical_env.reset(env.current_player)
+        canonical_env.board = transform_fn(env.board).copy()
+        canonical_env._init_hash()
+        assert canonical_env.hash_key == env.canonical_hash_key
@@ -0,0 +1,110 @@
+"""Tests for the LRU cache of network evaluations used by AlphaZeroMCTS."""
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.alphazero.array_mcts import ArrayAlphaZeroMCTS
+from giotto.agents.algorithms.alphazero.eval_cache import EvaluationCache, policy_permutations
+from giotto.agents.algorithms.alphazero.mcts import AlphaZeroMCTS
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+
+
+class _SymmetricNet:
+    """Cheap network invariant to board symmetries, counting its evaluations."""
+
+    def __init__(self, n_actions):
+        self.policy_output_size = n_actions
+        self.policy = np.full(n_actions, 1 / n_actions, dtype=np.float32)
+        self.n_evaluated = 0
+
+    def eval(self):
+        pass
+
+    def predict(self, state):
+        self.n_evaluated += 1
+        board, player = state
+        return self.policy, np.float32(np.tanh(0.1 * np.sum(board == player) - 0.15 * np.sum(board == 1 - player)))
+
+    def batch_predict(self, states):
+        results = [self.predict(state) for state in states]
+        return np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+
+def _play(env, actions):
+    env.reset(0)
+    for action in actions:
+        env.step(action)
+    return env
+
+
+class TestEvaluationCache:
+    def test_lru_eviction_and_counters(self):
+        cache = EvaluationCache(max_size=2)
+        env = TrisEnv()
+        keys = [cache.key(_play(env, [action])) for action in (1, 2, 5)]
+        policy = np.full(9, 1 / 9)
+
+        assert cache.get(keys[0]) is None
+        cache.put(keys[0], policy, 0.1)
+        cache.put(keys[1], policy, 0.2)
+        assert cache.get(keys[0])[1] == 0.1  # keys[0] becomes the most recently used
+        cache.put(keys[2], policy, 0.5)
+
+        assert len(cache) == 2
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2])[1] == 0.5
+        assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 2}
+
+    def test_tris_policy_mapped_to_symmetric_position(self):
+        cache = EvaluationCache()
+        env = TrisEnv()
+        policy = np.arange(9, dtype=np.float32)
+        # corner 1 then 2, and its reflection on the main diagonal: corner 1 then 4
+        cache.put(cache.key(_play(env, [1, 2])), policy, 0.3)
+        mirrored_policy, value = cache.get(cache.key(_play(env, [1, 4])))
+
+        assert value == 0.3
+        reflected = policy.reshape(3, 3).T.ravel()
+        assert np.array_equal(mirrored_policy, reflected)
+
+    def test_connect4_policy_mapped_to_mirrored_position(self):
+        cache = EvaluationCache()
+        env = Connect4Env()
+        policy = np.arange(7, dtype=np.float32)
+        cache.put(cache.key(_play(env, [1, 2, 2])), policy, -0.4)
+        mirrored_policy, value = cache.get(cache.key(_play(env, [7, 6, 6])))
+
+        assert value == -0.4
+        assert np.array_equal(mirrored_policy, policy[::-1])
+
+    def test_identity_first(self):
+        perms = policy_permutations(Connect4Env.simmetries, 6, 7, 7)
+        assert np.array_equal(perms[0], np.arange(7))
+
+
+@pytest.mark.parametrize("env_cls,n_actions", [(TrisEnv, 9), (Connect4Env, 7)])
+@pytest.mark.parametrize("mcts_cls", [AlphaZeroMCTS, ArrayAlphaZeroMCTS])
+@pytest.mark.parametrize("batch_size", [1, 8])
+class TestMCTSWithCache:
+    def test_same_search_fewer_evaluations(self, env_cls, n_actions, mcts_cls, batch_size):
+        env = env_cls()
+        env.reset(0)
+        visits = []
+        evaluations = []
+        for cache in (None, EvaluationCache()):
+            net = _SymmetricNet(n_actions)
+            mcts = mcts_cls(net, n_simulations=200, cpuct=1.5, batch_size=batch_size, cache=cache)
+            game = env.clone()
+            game_visits = []
+            for _ in range(3):
+                run = mcts.run if batch_size == 1 else mcts.run_batched
+                action, root = run(game)
+                game_visits.append({a: child.n_visits for a, child in root.children.items()})
+                mcts.advance_root(action)
+                game.step(action)
+            visits.append(game_visits)
+            evaluations.append(net.n_evaluated)
+
+        assert visits[0] == visits[1]
+        assert evaluations[1] < evaluations[0]
@@ -0,0 +1,86 @@
+"""Tests for the batched inference server used by multiprocess self-play."""
+
+import threading
+
+import numpy as np
+import pytest
+import torch
+
+from giotto.agents.algorithms.alphazero.inference_server import InferenceServer
+from giotto.agents.algorithms.alphazero.net import AlphaZeroNet
+from giotto.envs.tris import TrisEnv
+
+NETWORK_CONFIG = {
+    "input_size": [2, 3, 3],
+    "policy_output_size": 9,
+    "value_output_size": 1,
+    "residual_blocks": 1,
+    "channels": 8,
+}
+
+
+def _states(n):
+    env = TrisEnv()
+    env.reset(0)
+    states = []
+    for action in [5, 1, 9, 3, 2, 8, 4, 6][:n]:
+        env.step(action)
+        states.append(env.get_state())
+    return states
+
+
+class TestInferenceServer:
+    def test_matches_local_network(self):
+        torch.manual_seed(0)
+        net = AlphaZeroNet(**NETWORK_CONFIG)
+        net.eval()
+        state_dict = {k: v.detach().cpu() for k, v in net.state_dict().items()}
+        server = InferenceServer(NETWORK_CONFIG, state_dict, n_clients=2, slot_size=4, max_wait_ms=5.0)
+        server.start()
+        try:
+            states = _states(6)
+            results = [None, None]
+
+            def run(client_id):
+                # 6 states with a slot of 4 are sent as two requests
+                results[client_id] = server.client(client_id).batch_predict(states)
+
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            policy, value = server.client(0).predict(states[0])
+        finally:
+            stats = server.stop()
+
+        expected_policies, expected_values = net.batch_predict(states)
+        for policies, values in results:
+            assert np.allclose(policies, expected_policies, atol=1e-5)
+            assert np.allclose(values, expected_values, atol=1e-5)
+        assert np.allclose(policy, expected_policies[0], atol=1e-5)
+        assert np.isclose(value, expected_values[0], atol=1e-5)
+        assert stats["requests"] == 5
+        assert 1 <= stats["batches"] <= 5
+        assert stats["avg_batch_size"] * stats["batches"] == 13
+
+    def test_failure_is_raised_by_clients_and_stop(self):
+        torch.manual_seed(0)
+        # weights of a wider network: the server fails to load them
+        state_dict = AlphaZeroNet(**{**NETWORK_CONFIG, "channels": 16}).state_dict()
+        server = InferenceServer(NETWORK_CONFIG, state_dict, n_clients=2, slot_size=4)
+        server.start()
+        with pytest.raises(RuntimeError, match="size mismatch"):
+            server.client(0).predict(_states(1)[0])
+        with pytest.raises(RuntimeError, match="size mismatch"):
+            server.client(1).batch_predict(_states(2))
+        with pytest.raises(RuntimeError, match="Inference server failed"):
+            server.stop()
+
+    def test_stop_raises_if_the_server_died(self):
+        torch.manual_seed(0)
+        server = InferenceServer(NETWORK_CONFIG, AlphaZeroNet(**NETWORK_CONFIG).state_dict(), n_clients=1, slot_size=1)
+        server.start()
+        server._process.kill()
+        with pytest.raises(RuntimeError, match="without its statistics"):
+            server.stop()
@@ -1,6 +1,13 @@
 """Tests for MinimaxAgent correctness on TrisEnv."""
 
+import time
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.heuristics import WindowEvaluator
 from giotto.agents.minimax import MinimaxAgent
+from giotto.envs.connect4 import Connect4Env
 from giotto.envs.tris import TrisEnv
 
 
@@ -83,40 +90,225 @@ class TestMinimaxEvaluateAllMoves:
 
 class TestMinimaxScoring:
     def test_depth_penalises_slow_win(self):
-        # A win at depth 1 should score higher than a win at depth 3
+        # 9 wins at once, 4, 6 and 7 force a win with the next move
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 2, 5, 3]:
+            env.step(action)
+        scores = MinimaxAgent().evaluate_all_moves(env)
+        assert scores[9] == MinimaxAgent._win_score(env)
+        assert scores[9] > scores[4] == scores[6] == scores[7] > 0
+
+    def test_draw_scores_zero_regardless_of_depth(self):
         env = TrisEnv()
         env.reset(0)
+        for action in [5, 2, 1, 9]:
+            env.step(action)
+        scores = MinimaxAgent().evaluate_all_moves(env)
+        assert scores[3] == scores[6] == scores[8] == 0
+
+    def test_loss_returns_negative_score(self):
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 2, 5, 3]:
+            env.step(action)
         agent = MinimaxAgent()
-        agent.player_id = 0
+        agent.player_id = 1  # agent is P1, P0 is to move and wins with 9
+        scores = agent.evaluate_all_moves(env)
+        assert scores[9] == -MinimaxAgent._win_score(env)
+        assert all(score < 0 for action, score in scores.items() if action != 8)
 
-        # Simulate terminal envs at different depths
-        env_win_fast = TrisEnv()
-        env_win_fast.reset(0)
-        for action in [1, 4, 2, 5, 3]:  # P0 wins top row
-            if not env_win_fast.done:
-                env_win_fast.step(action)
 
-        env_win_slow = env_win_fast.clone()
-        score_fast = agent._evaluate(env_win_fast, depth=1)
-        score_slow = agent._evaluate(env_win_slow, depth=5)
-        assert score_fast > score_slow
+def _reference_scores(env, player_id):
+    """Plain full-width minimax, as the agent used to compute evaluate_all_moves."""
 
-    def test_draw_scores_zero_regardless_of_depth(self):
+    def minimax(env, depth):
+        if env.done:
+            winner = env.info["winner"]
+            if winner == -1:
+                return 0
+            return 10 - depth if winner == player_id else depth - 10
+        scores = []
+        for action in env.get_valid_actions():
+            child = env.clone()
+            child.step(action)
+            scores.append(minimax(child, depth + 1))
+        return max(scores) if env.current_player == player_id else min(scores)
+
+    scores = {}
+    for action in env.get_valid_actions():
+        child = env.clone()
+        child.step(action)
+        scores[action] = minimax(child, 0)
+    return scores
+
+
+class TestMinimaxTranspositionTable:
+    def test_scores_match_plain_minimax(self):
+        rng = np.random.default_rng(0)
+        agent = MinimaxAgent()
+        for _ in range(20):
+            env = TrisEnv()
+            env.reset(0)
+            for _ in range(rng.integers(4, 7)):
+                if env.done:
+                    break
+                env.step(int(rng.choice(env.get_valid_actions())))
+            if env.done:
+                continue
+            agent.player_id = env.current_player
+            assert agent.evaluate_all_moves(env) == _reference_scores(env, agent.player_id)
+
+    def test_scores_for_opponent_to_move(self):
         env = TrisEnv()
         env.reset(0)
-        for action in [1, 2, 3, 5, 4, 6, 9, 7, 8]:
+        for action in [1, 5, 9, 3]:
             env.step(action)
         agent = MinimaxAgent()
-        agent.player_id = 0
-        assert agent._evaluate(env, depth=1) == 0
-        assert agent._evaluate(env, depth=9) == 0
+        agent.player_id = 1
+        assert agent.evaluate_all_moves(env) == _reference_scores(env, 1)
 
-    def test_loss_returns_negative_score(self):
+    def test_selected_action_is_optimal(self):
+        rng = np.random.default_rng(1)
+        agent = MinimaxAgent()
+        for _ in range(20):
+            env = TrisEnv()
+            env.reset(int(rng.integers(2)))
+            for _ in range(rng.integers(3, 7)):
+                if env.done:
+                    break
+                env.step(int(rng.choice(env.get_valid_actions())))
+            if env.done:
+                continue
+            scores = _reference_scores(env, env.current_player)
+            assert scores[agent.select_action(env)] == max(scores.values())
+
+    def test_table_persists_across_games(self):
+        agent = MinimaxAgent()
         env = TrisEnv()
         env.reset(0)
-        for action in [1, 4, 2, 5, 3]:  # P0 wins
-            if not env.done:
-                env.step(action)
+        agent.select_action(env)
+        size = len(agent.transposition_table)
+        assert size > 0
+        env.reset(0)
+        agent.select_action(env)
+        assert len(agent.transposition_table) == size
+
+    def test_self_play_is_a_draw(self):
         agent = MinimaxAgent()
-        agent.player_id = 1  # agent is P1, so this is a loss
-        assert agent._evaluate(env, depth=1) < 0
+        env = TrisEnv()
+        env.reset(0)
+        while not env.done:
+            env.step(agent.select_action(env))
+        assert env.info["winner"] == -1
+
+
+class TestMinimaxDepthLimited:
+    def test_connect4_takes_immediate_win(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [1, 7, 2, 7, 3, 6]:
+            env.step(action)
+        agent = MinimaxAgent(max_depth=3)
+        assert agent.select_action(env) == 4
+
+    def test_connect4_blocks_opponent(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [7, 1, 7, 2, 6, 3]:
+            env.step(action)
+        agent = MinimaxAgent(max_depth=4)
+        assert agent.select_action(env) == 4
+
+    def test_time_limit(self):
+        env = Connect4Env()
+        env.reset(0)
+        agent = MinimaxAgent(time_limit=0.2)
+        start = time.perf_counter()
+        action = agent.select_action(env)
+        assert time.perf_counter() - start < 1.0
+        assert action in env.get_valid_actions()
+
+    def test_depth_limited_tris_matches_full_search_when_deep_enough(self):
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 5, 9]:
+            env.step(action)
+        full = MinimaxAgent().evaluate_all_moves(env)
+        limited = MinimaxAgent(max_depth=9).evaluate_all_moves(env)
+        assert full == limited
+
+    def test_transposition_table_is_capped(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [4, 4, 3]:
+            env.step(action)
+        capped = MinimaxAgent(max_depth=5, max_table_entries=200)
+        expected = MinimaxAgent(max_depth=5).select_action(env)
+        assert capped.select_action(env) == expected
+        assert 0 < len(capped.transposition_table) <= 200
+
+
+class TestWindowEvaluator:
+    def test_empty_board_is_even(self):
+        env = Connect4Env()
+        env.reset(0)
+        assert WindowEvaluator()(env) == 0.0
+
+    def test_values_are_opposite_for_the_two_players(self):
+        env = Connect4Env()
+        env.reset(0)
+        for action in [4, 4, 3]:
+            env.step(action)
+        value = WindowEvaluator()(env)
+        env.current_player = 1 - env.current_player
+        assert 0 < -value < 1
+        assert WindowEvaluator()(env) == -value
+
+
+def _reference_depth_limited(env, depth, evaluator, win_score):
+    """Plain full-width negamax to a fixed depth, scored like MinimaxAgent: wins lose one point per move."""
+    if env.done:
+        return 0 if env.info["winner"] == -1 else -win_score
+    if depth == 0:
+        return evaluator(env)
+    best = -np.inf
+    for action in env.get_valid_actions():
+        env.step(action)
+        score = -_reference_depth_limited(env, depth - 1, evaluator, win_score)
+        env.undo()
+        if abs(score) >= 2:
+            score -= np.sign(score)
+        best = max(best, score)
+    return best
+
+
+class TestMinimaxDepthLimitedMatchesMinimax:
+    def test_root_score_and_move_on_connect4_positions(self):
+        rng = np.random.default_rng(3)
+        evaluator = WindowEvaluator()
+        # one agent for all positions: the transposition table carries bounds from one search to the next
+        agent = MinimaxAgent(max_depth=4)
+        checked = 0
+        while checked < 12:
+            env = Connect4Env()
+            env.reset(int(rng.integers(2)))
+            for _ in range(rng.integers(6, 16)):
+                if env.done:
+                    break
+                env.step(int(rng.choice(env.get_valid_actions())))
+            if env.done:
+                continue
+            win_score = agent._win_score(env)
+            scores = {}
+            for action in env.get_valid_actions():
+                env.step(action)
+                score = -_reference_depth_limited(env, 3, evaluator, win_score)
+                env.undo()
+                scores[action] = score - np.sign(score) if abs(score) >= 2 else score
+
+            agent._start_search(4)
+            root_score, _ = agent._search_root(env.clone(), 4, env.get_valid_actions())
+            assert root_score == pytest.approx(max(scores.values()))
+            assert scores[agent.select_action(env)] == pytest.approx(max(scores.values()))
+            checked += 1
@@ -0,0 +1,234 @@
+"""Tests for the ring-buffer replay memory of the AlphaZero trainer."""
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.alphazero.prefetch import BatchPrefetcher
+from giotto.agents.algorithms.alphazero.replay_buffer import ReplayBuffer
+from giotto.envs.tris import TrisEnv
+
+
+def _records(n, offset=0):
+    records = []
+    for i in range(n):
+        board = np.full((3, 3), fill_value=-1)
+        board.flat[i % 9] = i % 2
+        policy = np.zeros(9, dtype=np.float32)
+        policy[(i + offset) % 9] = 1.0
+        records.append({"state": [board, (i + 1) % 2], "policy_target": policy, "value_target": float(i + offset)})
+    return records
+
+
+class TestReplayBuffer:
+    def test_ring_overwrites_oldest(self):
+        buffer = ReplayBuffer(capacity=5, board_shape=(3, 3), n_actions=9)
+        buffer.extend(_records(3))
+        assert len(buffer) == 3
+        buffer.extend(_records(4, offset=100))
+        assert len(buffer) == 5
+        assert buffer.position == 2
+        # the two oldest (values 0, 1) were overwritten
+        assert sorted(buffer.values.tolist()) == [2.0, 100.0, 101.0, 102.0, 103.0]
+
+    def test_batch_larger_than_capacity_keeps_newest(self):
+        buffer = ReplayBuffer(capacity=3, board_shape=(3, 3), n_actions=9)
+        buffer.extend(_records(7))
+        assert sorted(buffer.values.tolist()) == [4.0, 5.0, 6.0]
+
+    def test_batch_matches_records(self):
+        records = _records(6)
+        buffer = ReplayBuffer(capacity=10, board_shape=(3, 3), n_actions=9, seed=0)
+        buffer.extend(records)
+        x, policies, values = buffer.get_batch(np.array([4, 1]))
+
+        assert x.shape == (2, 2, 3, 3)
+        assert x.dtype == policies.dtype == values.dtype == np.float32
+        for row, index in enumerate([4, 1]):
+            board, player = records[index]["state"]
+            assert np.array_equal(x[row, 0], board == player)
+            assert np.array_equal(x[row, 1], board == 1 - player)
+            assert np.array_equal(policies[row], records[index]["policy_target"])
+            assert values[row, 0] == records[index]["value_target"]
+
+    def test_sample_distinct_positions(self):
+        buffer = ReplayBuffer(capacity=50, board_shape=(3, 3), n_actions=9, seed=0)
+        buffer.extend(_records(20))
+        indices = buffer.sample_indices(20)
+        assert sorted(indices.tolist()) == list(range(20))
+        x, _, values = buffer.sample(8)
+        assert x.shape == (8, 2, 3, 3)
+        assert values.shape == (8, 1)
+
+
+class TestPersistentReplayBuffer:
+    def test_reopen_restores_flushed_positions(self, tmp_path):
+        buffer = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path)
+        buffer.extend(_records(6))
+        buffer.extend(_records(4, offset=6))
+        buffer.flush()
+
+        reopened = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path)
+        assert len(reopened) == 8
+        assert reopened.position == 2
+        assert isinstance(reopened.boards, np.memmap)
+        x, policies, values = reopened.get_batch(np.arange(8))
+        expected = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9)
+        expected.extend(_records(6))
+        expected.extend(_records(4, offset=6))
+        expected_x, expected_policies, _ = expected.get_batch(np.arange(8))
+        assert np.array_equal(x, expected_x)
+        assert np.array_equal(policies, expected_policies)
+        assert sorted(values[:, 0].tolist()) == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+
+    def test_layout_mismatch_raises(self, tmp_path):
+        ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path).flush()
+        with pytest.raises(ValueError):
+            ReplayBuffer(capacity=16, board_shape=(3, 3), n_actions=9, directory=tmp_path)
+
+    def test_storage_mode_mismatch_raises(self, tmp_path):
+        buffer = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path)
+        buffer.extend(_records(4) * 2)
+        buffer.flush()
+        with pytest.raises(ValueError, match="dedup=False"):
+            ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path, dedup=True)
+        with pytest.raises(ValueError, match="canonical=False"):
+            ReplayBuffer(
+                capacity=8,
+                board_shape=(3, 3),
+                n_actions=9,
+                directory=tmp_path,
+                simmetries=TrisEnv.simmetries,
+                canonical=True,
+            )
+        assert not (tmp_path / "weights.npy").exists()
+        assert len(ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path)) == 8
+
+
+class TestAugmentedSampling:
+    def test_transformed_batch_matches_equivalent_boards(self):
+        env = TrisEnv()
+        records = _records(9)
+        buffer = ReplayBuffer(capacity=10, board_shape=(3, 3), n_actions=9, simmetries=env.simmetries)
+        buffer.extend(records)
+        indices = np.arange(9)
+        transforms = np.arange(9) % len(env.simmetries.transforms())
+        x, policies, _ = buffer.get_batch(indices, transforms)
+
+        functions = [function for _, function in env.simmetries.transforms()]
+        for row, (index, t) in enumerate(zip(indices, transforms, strict=True)):
+            board, player = records[index]["state"]
+            policy = records[index]["policy_target"]
+            assert np.array_equal(x[row, 0], functions[t](board) == player)
+            assert np.array_equal(x[row, 1], functions[t](board) == 1 - player)
+            # the policy follows its board
+            assert np.array_equal(policies[row], functions[t](policy.reshape(3, 3)).reshape(-1))
+
+    def test_augment_needs_simmetries(self):
+        buffer = ReplayBuffer(capacity=10, board_shape=(3, 3), n_actions=9)
+        buffer.extend(_records(9))
+        with pytest.raises(ValueError):
+            buffer.sample(4, augment=True)
+
+
+class TestBatchPrefetcher:
+    @pytest.mark.parametrize("queue_size", [0, 2])
+    def test_yields_requested_batches(self, queue_size):
+        buffer = ReplayBuffer(capacity=20, board_shape=(3, 3), n_actions=9, seed=0, simmetries=TrisEnv().simmetries)
+        buffer.extend(_records(12))
+        with BatchPrefetcher(buffer, batch_size=4, n_batches=5, queue_size=queue_size, augment=True) as batches:
+            shapes = [tuple(tensor.shape for tensor in batch) for batch in batches]
+        assert shapes == [((4, 2, 3, 3), (4, 9), (4, 1))] * 5
+        assert batches.consumed == 5
+        assert batches.wait_time >= 0.0
+
+    def test_sampling_errors_reach_the_consumer(self):
+        buffer = ReplayBuffer(capacity=20, board_shape=(3, 3), n_actions=9)
+        buffer.extend(_records(3))
+        with BatchPrefetcher(buffer, batch_size=8, queue_size=2) as batches, pytest.raises(ValueError):
+            batches.get()
+
+
+class TestCanonicalStorage:
+    def test_equivalent_positions_share_one_orientation(self):
+        env = TrisEnv()
+        board = np.full((3, 3), fill_value=-1)
+        board[0, 1] = 0
+        board[2, 2] = 1
+        policy = np.zeros(9, dtype=np.float32)
+        policy[3] = 1.0
+        records = [
+            {
+                "state": [function(board), 1],
+                "policy_target": function(policy.reshape(3, 3)).reshape(-1),
+                "value_target": 0.5,
+            }
+            for _, function in env.simmetries.transforms()
+        ]
+        buffer = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, simmetries=env.simmetries, canonical=True)
+        buffer.extend(records)
+
+        assert len(buffer) == 8
+        assert (buffer.boards == buffer.boards[0]).all()
+        assert (buffer.policies == buffer.policies[0]).all()
+        # the stored board is one of the equivalent boards, with its policy moved accordingly
+        t = next(t for t, record in enumerate(records) if np.array_equal(record["state"][0], buffer.boards[0]))
+        assert np.array_equal(buffer.policies[0], records[t]["policy_target"])
+
+    def test_requires_simmetries(self):
+        with pytest.raises(ValueError):
+            ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, canonical=True)
+
+
+class TestDedupReplayBuffer:
+    def test_repeated_positions_merged_with_averaged_targets(self):
+        env = TrisEnv()
+        board = np.full((3, 3), fill_value=-1)
+        board[0, 0] = 0
+        first = np.zeros(9, dtype=np.float32)
+        first[4] = 1.0
+        second = np.zeros(9, dtype=np.float32)
+        second[8] = 1.0
+        mirrored = env.simmetries.transform(board[None], 5, second[None])
+        records = [
+            {"state": [board, 1], "policy_target": first, "value_target": 1.0},
+            # the same position seen mirrored, with a different search result
+            {"state": [mirrored[0][0], 1], "policy_target": mirrored[1][0], "value_target": 0.0},
+            {"state": [board, 0], "policy_target": first, "value_target": -1.0},
+        ]
+        buffer = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, simmetries=env.simmetries, dedup=True)
+        buffer.extend(records)
+
+        assert len(buffer) == 2
+        assert buffer.merged == 1
+        assert buffer.weights[:2].tolist() == [2.0, 1.0]
+        assert buffer.values[0] == 0.5
+        board_canonical, t = env.simmetries.canonical(board)
+        assert np.array_equal(buffer.boards[0], board_canonical)
+        expected_policy = env.simmetries.transform(board[None], t, ((first + second) / 2)[None])[1][0]
+        np.testing.assert_allclose(buffer.policies[0], expected_policy)
+
+    def test_overwritten_positions_leave_the_index(self):
+        buffer = ReplayBuffer(capacity=3, board_shape=(3, 3), n_actions=9, dedup=True)
+        buffer.extend(_records(5))
+        assert len(buffer) == 3
+        assert len(buffer._slots) == 3
+        # the first position was overwritten: it comes back as a new entry
+        buffer.extend(_records(1))
+        assert buffer.merged == 0
+        assert sorted(buffer._slots.values()) == [0, 1, 2]
+
+    def test_sampling_follows_weights(self):
+        buffer = ReplayBuffer(capacity=4, board_shape=(3, 3), n_actions=9, seed=0, dedup=True)
+        buffer.extend(_records(2) + _records(1) * 98)
+        counts = np.bincount([buffer.sample_indices(1)[0] for _ in range(500)], minlength=2)
+        assert counts[0] > 400
+
+    def test_reopened_buffer_keeps_merging(self, tmp_path):
+        buffer = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path, dedup=True)
+        buffer.extend(_records(3) * 2)
+        buffer.flush()
+
+        reopened = ReplayBuffer(capacity=8, board_shape=(3, 3), n_actions=9, directory=tmp_path, dedup=True)
+        reopened.extend(_records(3))
+        assert len(reopened) == 3
+        assert reopened.weights[:3].tolist() == [3.0, 3.0, 3.0]
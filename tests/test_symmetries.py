@@ -175,3 +175,51 @@ class TestPolicyAugmentationConnect4:
         policy = np.ones(7, dtype=np.float32)
         with pytest.raises(ValueError, match="not supported"):
             eb.get_equivalent_boards(board, policy_targets=policy)
+
+
+class TestBatchedTransforms:
+    def test_matches_transform_functions(self):
+        rng = np.random.default_rng(0)
+        boards = rng.integers(-1, 2, size=(16, 3, 3))
+        policies = rng.random((16, 9)).astype(np.float32)
+        functions = [function for _, function in TrisEnv.simmetries.transforms()]
+        transform_ids = np.arange(16) % len(functions)
+        out_boards, out_policies = TrisEnv.simmetries.transform(boards, transform_ids, policies)
+        for board, policy, t, out_board, out_policy in zip(
+            boards, policies, transform_ids, out_boards, out_policies, strict=True
+        ):
+            assert np.array_equal(out_board, functions[t](board))
+            assert np.array_equal(out_policy, functions[t](policy.reshape(3, 3)).reshape(9))
+
+    def test_column_policies(self):
+        boards = np.full((2, 6, 7), -1)
+        boards[:, 0, 0] = 0
+        policies = np.tile(np.arange(7, dtype=np.float32), (2, 1))
+        out_boards, out_policies = Connect4Env.simmetries.transform(boards, 1, policies)
+        assert (out_boards[:, 0, 6] == 0).all()
+        np.testing.assert_array_equal(out_policies, policies[:, ::-1])
+
+    def test_permutations_computed_once(self):
+        perms = TrisEnv.simmetries.cell_permutations(3, 3)
+        assert perms is TrisEnv.simmetries.cell_permutations(3, 3)
+        assert not perms.flags.writeable
+
+
+class TestCanonical:
+    def test_equivalent_boards_share_canonical_form(self):
+        board = np.array([[0, -1, -1], [-1, 1, -1], [-1, -1, 0]])
+        canonical, _ = TrisEnv.simmetries.canonical(board)
+        for function_name, function in TrisEnv.simmetries.transforms():
+            other, transform_id = TrisEnv.simmetries.canonical(function(board))
+            assert np.array_equal(other, canonical), function_name
+            assert np.array_equal(TrisEnv.simmetries.transforms()[transform_id][1](function(board)), canonical)
+
+    def test_lexicographically_minimal(self):
+        board = np.full((6, 7), -1)
+        board[0, 0] = 0
+        canonical, transform_id = Connect4Env.simmetries.canonical(board)
+        # the empty cell (-1) sorts before the piece
+        assert transform_id == 1
+        assert canonical[0, 6] == 0
+        equivalent = Connect4Env.simmetries.get_equivalent_boards(board)
+        assert min(tuple(b.flat) for b in equivalent) == tuple(canonical.flat)
@@ -0,0 +1,100 @@
+"""Tests for the tic tac toe perfect-play table."""
+
+import numpy as np
+import pytest
+
+from giotto.agents.algorithms.tris_table import TrisTable, load_tris_table
+from giotto.agents.minimax import MinimaxAgent
+from giotto.agents.tris_table import TrisTableAgent
+from giotto.envs.connect4 import Connect4Env
+from giotto.envs.tris import TrisEnv
+
+
+@pytest.fixture(scope="module")
+def table():
+    return TrisTable.build()
+
+
+class TestTrisTable:
+    def test_empty_board_is_a_draw(self, table):
+        env = TrisEnv()
+        env.reset(0)
+        value, distance, best_moves = table.lookup(env)
+        assert value == 0
+        assert distance == 9
+        assert best_moves == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+    def test_immediate_win(self, table):
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 4, 2, 5]:
+            env.step(action)
+        value, distance, best_moves = table.lookup(env)
+        assert (value, distance, best_moves) == (1, 1, [3])
+
+    def test_terminal_position(self, table):
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 4, 2, 5, 3]:
+            env.step(action)
+        assert table.lookup(env) == (-1, 0, [])
+
+    def test_unreachable_position_raises(self, table):
+        env = TrisEnv()
+        env.reset(0)
+        env.board = np.zeros((3, 3), dtype=int)
+        with pytest.raises(ValueError):
+            table.lookup(env)
+
+    def test_move_scores_match_minimax(self, table):
+        rng = np.random.default_rng(0)
+        agent = MinimaxAgent()
+        for _ in range(100):
+            env = TrisEnv()
+            env.reset(int(rng.integers(2)))
+            for _ in range(rng.integers(0, 8)):
+                if env.done:
+                    break
+                env.step(int(rng.choice(env.get_valid_actions())))
+            if env.done:
+                continue
+            agent.player_id = env.current_player
+            assert table.move_scores(env) == agent.evaluate_all_moves(env)
+
+    def test_save_and_load(self, table, tmp_path):
+        path = tmp_path / "table.npz"
+        table.save(path)
+        loaded = TrisTable.load(path)
+        assert np.array_equal(loaded.value, table.value)
+        assert np.array_equal(loaded.distance, table.distance)
+        assert np.array_equal(loaded.best_moves_mask, table.best_moves_mask)
+
+    def test_load_falls_back_to_build(self, tmp_path):
+        table = load_tris_table(tmp_path / "missing.npz")
+        assert (table.distance >= 0).any()
+
+
+class TestTrisTableAgents:
+    def test_agent_self_play_is_a_draw(self, table):
+        agent = TrisTableAgent(table=table)
+        env = TrisEnv()
+        env.reset(1)
+        while not env.done:
+            env.step(agent.select_action(env))
+        assert env.info["winner"] == -1
+
+    def test_minimax_uses_table_with_player_id_view(self, table):
+        env = TrisEnv()
+        env.reset(0)
+        for action in [1, 5, 9, 3]:
+            env.step(action)
+        with_table = MinimaxAgent(table=table)
+        with_table.player_id = 1
+        search = MinimaxAgent()
+        search.player_id = 1
+        assert with_table.evaluate_all_moves(env) == search.evaluate_all_moves(env)
+        assert not with_table.transposition_table
+
+    def test_table_not_used_for_connect4(self, table):
+        assert not TrisTable.supports(Connect4Env())
+        assert TrisTable.supports(TrisEnv())
@@ -0,0 +1,73 @@
+"""Tests for the symmetry handling of the value network trainer."""
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from giotto.agents.algorithms.value_net.train import ValueNetTrainer
+from giotto.agents.algorithms.value_net.value_net import ValueNet
+from giotto.envs.tris import TrisEnv
+
+
+def _games():
+    board = np.full((3, 3), fill_value=-1)
+    board[0, 0] = 0
+    board[1, 2] = 1
+    return [((function(board), 0), 1) for _, function in TrisEnv.simmetries.transforms()]
+
+
+class TestSampleTimeAugmentation:
+    def test_canonical_games_collapse_equivalent_boards(self):
+        trainer = ValueNetTrainer(TrisEnv())
+        canonical = trainer.canonical_games(_games())
+        assert len(canonical) == len(_games())
+        assert all(np.array_equal(state[0], canonical[0][0][0]) for state, _ in canonical)
+        assert all(state[1] == 0 and result == 1 for state, result in canonical)
+
+    def test_random_symmetry_keeps_equivalent_positions(self):
+        trainer = ValueNetTrainer(TrisEnv())
+        games = _games()
+        equivalent = [state[0] for state, _ in games]
+        for (board, player_id), result in trainer.random_symmetry(games):
+            assert any(np.array_equal(board, other) for other in equivalent)
+            assert (player_id, result) == (0, 1)
+
+    def test_random_symmetry_applies_the_sampled_transforms(self):
+        trainer = ValueNetTrainer(TrisEnv())
+        rng = np.random.default_rng(0)
+        games = [((rng.integers(-1, 2, size=(3, 3)), i % 2), i) for i in range(32)]
+        np.random.seed(0)
+        transformed = trainer.random_symmetry(games)
+        np.random.seed(0)
+        transform_ids = np.random.randint(len(TrisEnv.simmetries.transforms()), size=len(games))
+        for ((board, player_id), result), ((new_board, new_player_id), new_result), transform_id in zip(
+            games, transformed, transform_ids, strict=True
+        ):
+            assert np.array_equal(new_board, TrisEnv.simmetries.transforms()[transform_id][1](board))
+            assert (new_player_id, new_result) == (player_id, result)
+        assert len(set(transform_ids)) > 1
+
+
+class TestBatchedTraining:
+    def test_process_states_matches_single_states(self):
+        states = [(board, 0) for (board, _), _ in _games()] + [(_games()[1][0][0], 1)]
+        batched = ValueNetTrainer(TrisEnv()).net.process_states(states)
+        assert batched.shape == (len(states), 2, 3, 3)
+        for row, state in enumerate(states):
+            assert torch.equal(batched[row : row + 1], ValueNet.process_state(state))
+
+    def test_batched_loss_equals_mean_of_per_sample_losses(self):
+        net = ValueNetTrainer(TrisEnv()).net
+        games = _games()
+        targets = torch.tensor([[float(i % 3 - 1)] for i in range(len(games))])
+        batched = F.mse_loss(net(net.process_states([state for state, _ in games])), targets)
+        per_sample = sum(
+            F.mse_loss(net(net.process_state(state)), target[None]) for (state, _), target in zip(games, targets)
+        ) / len(games)
+        assert torch.allclose(batched, per_sample)
+
+    def test_parallel_self_play(self):
+        trainer = ValueNetTrainer(TrisEnv())
+        games = trainer.self_play_parallel(n_games=3, mcts_sims=5, num_workers=2, seed=0)
+        assert len(games) >= 3 * 5
+        assert all(result in (-1, 0, 1) for _, result in games)
@@ -0,0 +1,102 @@
+"""Tests for the persistent self-play worker pool and the asynchronous training loop."""
+
+from pathlib import Path
+
+import pytest
+import torch
+import torch.multiprocessing as mp
+import yaml
+
+from giotto.agents.algorithms.alphazero.train import AlphaZeroTrainer, SelfPlayPool, SharedWeights
+from giotto.envs.tris import TrisEnv
+
+CONFIG_PATH = Path(__file__).parents[1] / "giotto" / "agents" / "algorithms" / "alphazero" / "config_tris.yaml"
+
+
+def _config():
+    with open(CONFIG_PATH) as f:
+        config = yaml.safe_load(f)
+    config["network"].update({"channels": 8, "residual_blocks": 1})
+    config["mcts"]["n_sims"] = 10
+    return config
+
+
+class TestSharedWeights:
+    def test_pull_only_newer_versions(self, make_alphazero_net):
+        config = _config()
+        source, first, second = (make_alphazero_net(config["network"], seed) for seed in range(3))
+        weights = SharedWeights(source.state_dict())
+
+        assert weights.pull(first, -1) == 0
+        assert torch.equal(first.policy_fc.weight, source.policy_fc.weight)
+
+        weights.publish(second.state_dict())
+        assert weights.pull(first, 0) == 1
+        assert torch.equal(first.policy_fc.weight, second.policy_fc.weight)
+
+        weights.publish(source.state_dict())
+        # an up to date version is not reloaded
+        assert weights.pull(second, 2) == 2
+        assert not torch.equal(second.policy_fc.weight, source.policy_fc.weight)
+
+
+class TestSelfPlayPool:
+    def test_games_and_matches_across_publishes(self, make_alphazero_net):
+        config = _config()
+        net = make_alphazero_net(config["network"], 0)
+        pool = SelfPlayPool(TrisEnv(), config, net, num_workers=2, seed=0)
+        try:
+            records = pool.self_play(3)
+            pool.publish(make_alphazero_net(config["network"], 1))
+            rates = pool.play_vs_mcts(2)
+            more_records = pool.self_play(1)
+        finally:
+            pool.close()
+
+        assert len(records) >= 3 * 5
+        assert len(more_records) >= 5
+        assert all(set(record) == {"state", "policy_target", "value_target"} for record in records)
+        assert set(rates) == {"AlphaZeroAgent", "MCTSAgent", "Draw"}
+        assert abs(sum(rates.values()) - 1.0) < 1e-9
+
+
+class TestAsyncTraining:
+    def test_runs_iterations_with_deferred_evaluation(self, tmp_path):
+        config = _config()
+        config["training"].update(
+            {
+                "iterations": 2,
+                "games_per_iteration": 4,
+                "batch_size": 8,
+                "n_play_workers": 2,
+                "async_mode": True,
+                "sample_to_insert_ratio": 2.0,
+                "publish_interval_steps": 2,
+            }
+        )
+        config["eval"].update({"run_eval": False, "play_vs_mcts": True, "n_matches": 2})
+        trainer = AlphaZeroTrainer(TrisEnv(), config, save_dir=tmp_path)
+        trainer.train()
+
+        iterations = trainer.metrics["iterations"]
+        assert [it["iteration"] for it in iterations] == [1, 2]
+        assert (tmp_path / "checkpoint_iter_2.pt").exists()
+        consumed = sum(it["consumed_per_s"] for it in iterations)
+        assert consumed > 0
+        # every played evaluation lands in the metrics of its iteration
+        assert any(it["match_metrics"] for it in iterations)
+        for it in iterations:
+            if it["match_metrics"]:
+                assert abs(sum(it["match_metrics"].values()) - 1.0) < 1e-9
+
+    def test_dead_evaluation_process_raises(self, tmp_path):
+        trainer = AlphaZeroTrainer(TrisEnv(), _config(), save_dir=tmp_path)
+        # a process exiting without posting the rates, like a killed evaluation
+        process = mp.Process(target=sum, args=([],))
+        process.start()
+        process.join()
+        evaluation = (0, process, mp.SimpleQueue())
+        with pytest.raises(RuntimeError, match="without a result"):
+            trainer._collect_async_evaluation(evaluation, wait=False)
+        with pytest.raises(RuntimeError, match="without a result"):
+            trainer._collect_async_evaluation(evaluation, wait=True)